@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, replace
+from typing import Optional
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.async_base import AsyncBroker
+from trading_bot.broker.base import Fill
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.async_engine import AsyncEngineRunner, iter_ticks_async
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.models import Side
+from trading_bot.data.synthetic import generate, to_ticks
+
+
+class _InstantBroker(AsyncBroker):
+    """Fills at the requested price without a round-trip."""
+
+    def __init__(self, fail_after: Optional[int] = None, ledger: Optional[PaperBroker] = None, latency: float = 0.0):
+        self.ledger = ledger if ledger is not None else PaperBroker()
+        self.fail_after = fail_after
+        self.latency = latency
+        self.calls = 0
+
+    async def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise ConnectionError("venue down")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.ledger.place_order(symbol, side, size, price, ts, owner)
+
+    async def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.ledger.close_position(symbol, ts, price, owner)
+
+
+def _ticks(count=3_000):
+    return list(to_ticks(*generate("random_walk", count, seed=4), "SPY"))
+
+
+@pytest.mark.parametrize("continue_trading", [True, False])
+def test_matches_engine_with_instant_fills(continue_trading):
+    cfg = bench_config()
+    cfg = replace(cfg, shared=replace(cfg.shared, continue_trading=continue_trading))
+    ticks = _ticks()
+    expected = TradingEngine(cfg).run_backtest(ticks)
+    runner = AsyncEngineRunner(cfg, _InstantBroker())
+    actual = asyncio.run(runner.run(iter_ticks_async(ticks)))
+    assert [asdict(c) for c in actual.cycles] == [asdict(c) for c in expected.cycles]
+    if continue_trading:
+        assert runner.engine.ticks_processed == len(ticks)
+    else:
+        assert actual.summary.count == 1
+        assert runner.engine.ticks_processed < len(ticks)
+
+
+def test_broker_error_is_raised_from_drain_instead_of_hanging():
+    runner = AsyncEngineRunner(bench_config(), _InstantBroker(fail_after=3))
+
+    async def run():
+        return await asyncio.wait_for(runner.run(iter_ticks_async(_ticks(500))), timeout=10)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+
+
+def test_late_close_fills_are_reconciled_into_the_cycle_records():
+    cfg = bench_config()
+    # Fills cost the spread and arrive several ticks after the engine booked them.
+    broker = _InstantBroker(ledger=MatchingBroker(model=FillModel(spread_pct=0.001)), latency=0.002)
+    runner = AsyncEngineRunner(cfg, broker)
+    result = asyncio.run(runner.run(iter_ticks_async(_ticks(2_000))))
+
+    cycles = result.cycles
+    assert len(cycles) > 3
+    assert runner.reconciled_pnl < 0
+    total = sum(c.realized_pnl for c in cycles)
+    assert total == pytest.approx(runner.engine.equity - 100_000.0)
+    assert result.summary.total_pnl == pytest.approx(total)
+    assert result.summary.count == len(cycles)
+    for cycle in cycles:
+        assert cycle.end_equity - cycle.start_equity == pytest.approx(cycle.realized_pnl)
+    for before, after in zip(cycles, cycles[1:]):
+        assert after.start_equity == pytest.approx(before.end_equity)
+    assert not runner.sink.held and not runner.sink.pending
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.config import StrategyMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.events import Bar, PriceTick
+
+
+def _bar(start: datetime, open_: float, high: float, low: float, close: float) -> Bar:
+    end = start + timedelta(seconds=59)
+    return Bar("SPY", start, end, open_, high, low, close, high_ts=end, low_ts=start, count=60)
+
+
+def test_wdm_add_fills_at_its_level_not_at_the_bar_high():
+    cfg = bench_config(StrategyMode.WDM_ONLY, legs=2)
+    cfg = replace(
+        cfg,
+        wdm=replace(cfg.wdm, order_distances_pct=[0.0, 0.01], order_tps_pct=[0.5, 0.5], order_sls_pct=[0.5, 0.5]),
+    )
+    engine = TradingEngine(cfg)
+    t0 = datetime(2025, 1, 1, 9, 30)
+    engine.on_tick(PriceTick("SPY", 100.0, t0))
+    wdm = engine.strategies["WDM"]
+    assert wdm.state.next_add_price == 101.0
+
+    emitted = []
+    for tick in engine.bar_ticks(_bar(t0 + timedelta(minutes=1), 100.0, 103.0, 100.0, 103.0)):
+        emitted.append(tick.price)
+        engine.on_tick(tick)
+
+    assert emitted == [100.0, 101.0, 103.0]
+    assert [leg.entry_price for leg in wdm.position.legs] == [100.0, 101.0]
+    assert wdm._peak == 103.0
+    assert wdm.state.stop_loss_price == 103.0 * 0.5
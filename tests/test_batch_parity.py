@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import asdict, replace
+
+import pytest
+
+from trading_bot.benchmarks.suite import MODES, bench_config
+from trading_bot.config import Side, StrategyMode, SubMode
+from trading_bot.core.batch import BatchBacktester
+from trading_bot.core.engine import TradingEngine
+from trading_bot.data.synthetic import generate, to_ticks
+
+
+def _variant(cfg, **changes):
+    """``cfg`` with ``changes`` applied to every strategy config."""
+    return replace(cfg, **{name: replace(getattr(cfg, name), **changes) for name in ("cdm", "wdm", "zrm", "izrm")})
+
+
+def _configs():
+    variants = [
+        {},
+        dict(trailing_enabled=True),
+        dict(initial_side=Side.SELL),
+        dict(hold_previous=False),
+        dict(price_trigger=99.5),
+        dict(initial_side=Side.SELL, price_trigger=100.5, trailing_enabled=True),
+    ]
+    modes = [(mode, submode) for mode, submode in MODES if BatchBacktester.supports(bench_config(mode, submode))]
+    configs = [_variant(bench_config(mode, submode), **changes) for mode, submode in modes for changes in variants]
+    stopped = bench_config()
+    configs.append(replace(stopped, shared=replace(stopped.shared, continue_trading=False)))
+    # Same strategy type with a different ladder depth in one batch.
+    configs.append(bench_config(StrategyMode.CDM_ONLY, legs=3))
+    return configs
+
+
+CONFIGS = _configs()
+
+
+@pytest.mark.parametrize("kind", ["random_walk", "mean_reversion", "gap"])
+def test_each_config_matches_its_own_engine(kind):
+    prices, timestamps = generate(kind, 3_000, seed=11)
+    results = BatchBacktester(CONFIGS).run(prices, timestamps, "SPY")
+    assert len(results) == len(CONFIGS)
+    for cfg, actual in zip(CONFIGS, results):
+        expected = TradingEngine(cfg).run_backtest(to_ticks(prices, timestamps, "SPY"))
+        assert [asdict(c) for c in actual.cycles] == [asdict(c) for c in expected.cycles], (cfg.mode, cfg.cdm)
+        assert actual.summary == expected.summary
+
+
+def test_rejects_sequential_routing_and_foreign_symbols():
+    assert not BatchBacktester.supports(bench_config(submode=SubMode.SEQUENTIAL))
+    with pytest.raises(ValueError):
+        BatchBacktester([bench_config(submode=SubMode.SEQUENTIAL)])
+    prices, timestamps = generate("random_walk", 10, seed=0)
+    with pytest.raises(ValueError):
+        BatchBacktester([bench_config(symbol="QQQ")]).run(prices, timestamps, "SPY")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.config import StrategyMode
+from trading_bot.core.cache import ResultCache, config_key, tick_fingerprint
+from trading_bot.core.vectorized import VectorizedBacktester
+from trading_bot.data.synthetic import generate
+
+PRICES, TIMESTAMPS = generate("random_walk", 2_000, seed=9)
+
+
+def _entries(root):
+    return sorted(
+        name for shard in os.scandir(root) if shard.is_dir() for name in os.listdir(shard.path)
+    )
+
+
+def test_equal_configs_share_a_key():
+    cfg = bench_config()
+    ints = replace(cfg, cdm=replace(cfg.cdm, order_sizes=[int(s) if s == int(s) else s for s in cfg.cdm.order_sizes]))
+    assert isinstance(ints.cdm.order_sizes[0], int)
+    assert ints == cfg
+    assert config_key(ints) == config_key(cfg)
+    assert config_key(replace(cfg, mode=StrategyMode.CDM_ONLY)) != config_key(cfg)
+
+
+def test_hit_after_miss_returns_the_same_result(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cfg = bench_config()
+    first = cache.get_or_run(cfg, PRICES, TIMESTAMPS, "SPY")
+    second = cache.get_or_run(cfg, PRICES, TIMESTAMPS, "SPY")
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "writes": 1, "evictions": 0, "hit_rate": 0.5}
+    assert [asdict(c) for c in second.cycles] == [asdict(c) for c in first.cycles]
+    expected = VectorizedBacktester(cfg).run(PRICES, TIMESTAMPS, "SPY")
+    assert [asdict(c) for c in second.cycles] == [asdict(c) for c in expected.cycles]
+
+    # Another data set or starting equity is a different entry.
+    cache.get_or_run(cfg, PRICES[:-1], TIMESTAMPS[:-1], "SPY")
+    cache.get_or_run(cfg, PRICES, TIMESTAMPS, "SPY", starting_equity=50_000.0)
+    assert cache.stats.misses == 3
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=11_000)
+    payload = b"x" * 3_000
+    keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, payload)
+        os.utime(cache._path(key), (1_000 + i, 1_000 + i))
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.get(keys[0]) == payload
+    cache.put("99" + "0" * 62, payload)
+
+    assert cache.stats.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == payload and cache.get(keys[2]) == payload
+    assert cache._size <= cache.max_bytes
+
+
+def test_sweeps_stale_temp_files(tmp_path):
+    shard = tmp_path / "ab"
+    shard.mkdir()
+    stale, fresh = shard / "ab00.pkl.123.tmp", shard / "ab01.pkl.456.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+
+    ResultCache(str(tmp_path))
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_drops_unreadable_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = "cd" + "0" * 62
+    os.makedirs(os.path.dirname(cache._path(key)))
+    with open(cache._path(key), "wb") as fh:
+        fh.write(pickle.dumps([1, 2, 3])[:-2])
+    assert cache.get(key) is None
+    assert not os.path.exists(cache._path(key))
+
+
+def _run(args):
+    root, mode = args
+    cache = ResultCache(root)
+    result = cache.get_or_run(bench_config(mode), PRICES, TIMESTAMPS, "SPY")
+    return [asdict(c) for c in result.cycles]
+
+
+def test_concurrent_processes_share_the_cache(tmp_path):
+    root = str(tmp_path)
+    modes = [StrategyMode.MULTIPLE, StrategyMode.CDM_ONLY] * 4
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("fork")) as pool:
+        cycles = list(pool.map(_run, [(root, mode) for mode in modes]))
+
+    assert cycles[0] and cycles[1]
+    entries = _entries(root)
+    assert len(entries) == 2
+    assert not [name for name in entries if name.endswith(".tmp")]
+    cache = ResultCache(root)
+    fingerprint = tick_fingerprint(PRICES, TIMESTAMPS, "SPY")
+    for mode, expected in zip(modes, cycles):
+        result = cache.get(cache.key(bench_config(mode), fingerprint))
+        assert result is not None
+        assert [asdict(c) for c in result.cycles] == expected
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import itertools
+import pickle
+from dataclasses import asdict
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.broker.netting import NettingBroker
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.broker.risk import RiskGate, RiskLimits
+from trading_bot.config import Side
+from trading_bot.core.checkpoint import CHECKPOINT_VERSION, Checkpointer, load_checkpoint
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.instrument import Instrumentation
+from trading_bot.data.synthetic import generate, to_ticks
+
+MODEL = FillModel(spread_pct=0.0004, slippage_pct=0.0001, depth=20, level_pct=0.0002)
+
+
+def _matching():
+    broker = MatchingBroker(model=MODEL)
+    # Resting orders far from the market that must survive a resume.
+    broker.submit_limit("SPY", Side.BUY, 5.0, 90.0, "2025-01-01T09:30:00", owner="manual")
+    broker.submit_limit("SPY", Side.SELL, 5.0, 110.0, "2025-01-01T09:30:00", owner="manual")
+    return broker
+
+
+BROKERS = {
+    "paper": PaperBroker,
+    "matching": _matching,
+    "netting": lambda: NettingBroker(venue=MatchingBroker(model=MODEL)),
+    "risk": lambda: RiskGate(
+        MatchingBroker(model=MODEL),
+        RiskLimits(max_position=40, max_loss=2_000, orders_per_sec=0.05, total_orders_per_sec=0.1, burst=3),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(BROKERS))
+@pytest.mark.parametrize("instrumented", [False, True], ids=["plain", "instrumented"])
+def test_resume_matches_uninterrupted_run(tmp_path, name, instrumented):
+    ticks = list(to_ticks(*generate("random_walk", 6_000, seed=6), "SPY"))
+    cfg = bench_config(trailing=True)
+    make = BROKERS[name]
+    full = TradingEngine(cfg, broker=make())
+    expected = full.run_backtest(ticks)
+
+    path = str(tmp_path / "run.ckpt")
+    first = TradingEngine(cfg, broker=make(), instrumentation=Instrumentation() if instrumented else None)
+    first.run_backtest(ticks[:3_001], checkpoint=Checkpointer(path, every_ticks=3_000))
+    resumed = load_checkpoint(path)
+    assert resumed.ticks_processed == 3_000
+    assert type(resumed.broker) is type(full.broker)
+    actual = resumed.run_backtest(itertools.islice(ticks, resumed.ticks_processed, None))
+
+    assert [asdict(c) for c in actual.cycles] == [asdict(c) for c in expected.cycles]
+    assert resumed.broker.realized == full.broker.realized
+    if name == "matching":
+        assert resumed.broker.open_orders() == full.broker.open_orders()
+        assert resumed.broker.positions["SPY"]["manual"].legs == full.broker.positions["SPY"]["manual"].legs
+    if name == "netting":
+        assert resumed.broker.stats == full.broker.stats
+        assert resumed.broker.venue.realized == full.broker.venue.realized
+    if name == "risk":
+        assert resumed.broker.stats == full.broker.stats
+        assert resumed.broker.positions is resumed.broker.broker.positions
+
+
+def test_rejects_older_versions(tmp_path):
+    path = tmp_path / "old.ckpt"
+    path.write_bytes(pickle.dumps({"version": CHECKPOINT_VERSION - 1}))
+    with pytest.raises((ValueError, KeyError)):
+        load_checkpoint(str(path))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.config import StrategyMode
+from trading_bot.data.synthetic import generate
+from trading_bot.evaluate import bootstrap_path, monte_carlo, walk_forward, walk_forward_windows
+from trading_bot.sweep import expand_grid, run_arrays
+
+CFG = bench_config(StrategyMode.CDM_ONLY)
+
+
+@pytest.mark.parametrize("count,train,test", [(1_000, 300, 100), (1_050, 300, 100), (799, 400, 399), (501, 500, 1)])
+def test_walk_forward_test_windows_tile_the_data_after_the_first_train(count, train, test):
+    windows = walk_forward_windows(count, train, test)
+    assert windows
+    for start, mid, end in windows:
+        assert mid - start == train and end - mid == test
+        assert 0 <= start and end <= count
+    # Test windows are back to back and never overlap.
+    assert windows[0][1] == train
+    assert all(prev[2] == cur[1] for prev, cur in zip(windows, windows[1:]))
+    # Only a tail shorter than one test window is left out.
+    assert count - windows[-1][2] < test
+
+    assert walk_forward_windows(train + test - 1, train, test) == []
+    with pytest.raises(ValueError):
+        walk_forward_windows(count, 0, test)
+
+
+def test_walk_forward_scores_each_pick_on_the_ticks_after_its_training_window():
+    prices, timestamps = generate("random_walk", 2_400, seed=4)
+    grid = {"cdm.max_orders": [3, 5], "cdm.hold_previous": [True, False]}
+    windows = walk_forward(CFG, grid, prices, timestamps, "SPY", train=800, test=400, workers=2)
+    assert [(w.train_start, w.train_end, w.test_end) for w in windows] == walk_forward_windows(2_400, 800, 400)
+
+    runs = expand_grid(CFG, grid)
+    for w in windows:
+        trained = [
+            run_arrays(params, cfg, 100_000.0, prices[w.train_start : w.train_end], timestamps[w.train_start : w.train_end], "SPY")
+            for params, cfg in runs
+        ]
+        assert w.train == max(trained, key=lambda r: (r.total_pnl, -r.max_drawdown))
+        [cfg] = [cfg for params, cfg in runs if params == w.params]
+        test = run_arrays(w.params, cfg, 100_000.0, prices[w.train_end : w.test_end], timestamps[w.train_end : w.test_end], "SPY")
+        assert w.test == test
+
+
+def test_bootstrap_path_resamples_the_series_returns():
+    prices, _ = generate("mean_reversion", 500, seed=5)
+    returns = np.diff(np.log(prices))
+    for block in (1, 7, 10_000):
+        path = bootstrap_path(prices, np.random.default_rng(1), block)
+        assert len(path) == len(prices) and path[0] == prices[0]
+        resampled = np.diff(np.log(path))
+        assert np.isin(np.round(resampled, 12), np.round(returns, 12)).all()
+    # A block as long as the series is a rotation of it.
+    rotated = np.diff(np.log(bootstrap_path(prices, np.random.default_rng(1), len(returns))))
+    shift = int(np.flatnonzero(np.isclose(returns, rotated[0]))[0])
+    np.testing.assert_allclose(rotated, np.roll(returns, -shift))
+    np.testing.assert_array_equal(bootstrap_path(prices[:1], np.random.default_rng(1)), prices[:1])
+
+
+def test_monte_carlo_is_deterministic_across_pool_sizes_and_serial_runs():
+    prices, timestamps = generate("random_walk", 1_500, seed=6)
+    pooled = [monte_carlo(CFG, prices, timestamps, "SPY", paths=6, block=20, seed=9, workers=w) for w in (1, 3)]
+
+    serial = []
+    for child in np.random.SeedSequence(9).spawn(6):
+        path = bootstrap_path(prices, np.random.default_rng(child), 20)
+        serial.append(run_arrays({}, CFG, 100_000.0, path, timestamps, "SPY"))
+    for result in pooled:
+        np.testing.assert_array_equal(result.total_pnl, [r.total_pnl for r in serial])
+        np.testing.assert_array_equal(result.max_drawdown, [r.max_drawdown for r in serial])
+        np.testing.assert_array_equal(result.cycles, [r.cycles for r in serial])
+    # The paths really differ from each other and from another seed.
+    assert len(set(pooled[0].total_pnl.tolist())) > 1
+    other = monte_carlo(CFG, prices, timestamps, "SPY", paths=6, block=20, seed=10, workers=2)
+    assert not np.array_equal(other.total_pnl, pooled[0].total_pnl)
+    assert pooled[0].summary()["paths"] == 6
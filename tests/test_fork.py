@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import asdict, replace
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.config import Side, StrategyMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.fork import ForkPoints, divergence_depth, fork_engine
+from trading_bot.data.synthetic import generate, to_ticks
+
+TICKS = list(to_ticks(*generate("random_walk", 6_000, seed=8), "SPY"))
+BASE = bench_config(StrategyMode.MULTIPLE, trailing=True)
+
+
+def _cycles(result):
+    return [asdict(c) for c in result.cycles]
+
+
+def _with(cfg, name, **changes):
+    return replace(cfg, **{name: replace(getattr(cfg, name), **changes)})
+
+
+def test_fork_continues_like_its_parent_and_shares_closed_cycles():
+    parent = TradingEngine(BASE)
+    parent.run_backtest(TICKS[:3_000])
+    closed = list(parent.cycles)
+    assert closed
+
+    child = fork_engine(parent)
+    # The fork reads its parent's closed cycles in place until it closes its own.
+    assert child.sink._parent is parent.sink.records
+    expected = parent.run_backtest(TICKS[3_000:])
+    actual = child.run_backtest(TICKS[3_000:])
+    assert _cycles(actual) == _cycles(expected)
+    assert actual.summary == expected.summary
+    # Running the fork did not touch the parent's records.
+    assert parent.cycles[: len(closed)] == closed
+
+
+def test_fork_with_a_new_config_matches_a_run_that_switched_there():
+    changed = _with(BASE, "cdm", order_tps_pct=[0.006] * 5)
+    parent = TradingEngine(BASE)
+    parent.run_backtest(TICKS[:3_000])
+    forked = fork_engine(parent, changed).run_backtest(TICKS[3_000:])
+
+    # The same switch made by hand on an identical engine.
+    manual = TradingEngine(BASE)
+    manual.run_backtest(TICKS[:3_000])
+    manual.cfg = changed
+    strategy = manual.strategies["CDM"]
+    strategy.cfg = changed.cdm
+    if strategy.state.active:
+        strategy._compile()
+    manual.triggers.invalidate()
+    assert _cycles(forked) == _cycles(manual.run_backtest(TICKS[3_000:]))
+
+    with pytest.raises(ValueError):
+        fork_engine(parent, _with(BASE, "zrm", enabled=False))
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        ("cdm", dict(order_sizes=[10.0, 15.0, 22.5, 40.0, 60.0])),
+        ("wdm", dict(order_tps_pct=[0.004, 0.004, 0.005, 0.004, 0.004])),
+        ("zrm", dict(order_distances_pct=[0.0, 0.003, 0.003, 0.003, 0.002])),
+        ("izrm", dict(max_orders=3)),
+        ("cdm", dict(hold_previous=False)),
+        ("wdm", dict(trailing_step_pct=0.002)),
+    ],
+    ids=["cdm-size4", "wdm-tp3", "zrm-distance5", "izrm-max3", "cdm-no-hold", "wdm-step"],
+)
+def test_rerun_matches_a_full_run(changes):
+    base = TradingEngine(BASE)
+    points = ForkPoints(base, every_ticks=500)
+    expected_base = base.run_backtest(TICKS, checkpoint=points)
+
+    cfg = _with(BASE, changes[0], **changes[1])
+    expected = TradingEngine(cfg).run_backtest(TICKS)
+    assert _cycles(points.rerun(cfg, TICKS)) == _cycles(expected)
+    # Rerunning the base config replays nothing and returns the base result.
+    assert _cycles(points.rerun(BASE, TICKS)) == _cycles(expected_base)
+
+
+def test_divergence_tick_is_the_first_tick_a_change_can_act_on():
+    depth = 3
+    cfg = _with(BASE, "cdm", order_sizes=[10.0, 15.0, 22.5, 40.0, 60.0])
+    assert divergence_depth(BASE.cdm, cfg.cdm) == depth
+    assert divergence_depth(BASE.cdm, BASE.cdm) is None
+    assert divergence_depth(BASE.cdm, replace(BASE.cdm, initial_side=Side.SELL)) == 0
+
+    base = TradingEngine(BASE)
+    points = ForkPoints(base, every_ticks=500)
+    first = None
+    for tick in TICKS:
+        base.run_backtest((tick,), checkpoint=points)
+        if first is None and base.strategies["CDM"].state.current_leg >= depth:
+            first = base.ticks_processed
+    assert first is not None
+    assert points.divergence_tick(cfg) == first
+
+    # Both configs agree on every tick before it, and the change does matter after it.
+    old, new = TradingEngine(BASE), TradingEngine(cfg)
+    for tick in itertools.islice(TICKS, first):
+        old.on_tick(tick)
+        new.on_tick(tick)
+    assert _cycles(old.result()) == _cycles(new.result())
+    assert old.broker.position("SPY", "CDM").legs == new.broker.position("SPY", "CDM").legs
+    assert _cycles(old.run_backtest(TICKS[first:])) != _cycles(new.run_backtest(TICKS[first:]))
+    assert _cycles(points.rerun(cfg, TICKS)) == _cycles(TradingEngine(cfg).run_backtest(TICKS))
+
+    # A config differing outside the strategies diverges at once.
+    assert points.divergence_tick(replace(BASE, second_order_distance_pct=0.01)) == 0
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.broker.netting import NettingBroker
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.config import StrategyMode, SubMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.instrument import Instrumentation
+from trading_bot.data.synthetic import generate, to_ticks
+
+
+@pytest.mark.parametrize("submode", [SubMode.PARALLEL, SubMode.SEQUENTIAL], ids=lambda v: v.value)
+@pytest.mark.parametrize(
+    "make_broker",
+    [PaperBroker, lambda: NettingBroker(venue=MatchingBroker(model=FillModel(spread_pct=0.0004)))],
+    ids=["paper", "netting"],
+)
+def test_instrumented_run_matches_and_nests_stages(submode, make_broker):
+    ticks = list(to_ticks(*generate("random_walk", 3_000, seed=5), "SPY"))
+    cfg = bench_config(StrategyMode.MULTIPLE, submode, trailing=True)
+    expected = TradingEngine(cfg, broker=make_broker()).run_backtest(ticks)
+    instr = Instrumentation()
+    actual = TradingEngine(cfg, broker=make_broker(), instrumentation=instr).run_backtest(ticks)
+    assert [asdict(c) for c in actual.cycles] == [asdict(c) for c in expected.cycles]
+
+    stages = instr.stages
+    assert instr.counters["ticks"] == len(ticks)
+    assert instr.counters["cycles"] == len(expected.cycles)
+    # Every stage runs inside on_tick, and broker calls sit under the strategy that made them.
+    assert all(name == "on_tick" or name.startswith("on_tick;") for name in stages)
+    assert any(name.startswith("on_tick;route;") and name.endswith(";place_order") for name in stages)
+    orders = sum(h.count for name, h in stages.items() if name.endswith(";place_order"))
+    assert orders == instr.counters["orders"]
+
+    # Self times add up to the root total, so nothing is counted twice.
+    self_total = sum(int(line.rsplit(" ", 1)[1]) for line in instr.collapsed_stacks().splitlines())
+    assert self_total == stages["on_tick"].total
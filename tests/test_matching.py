@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.config import MartingaleConfig, Side, StrategyMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.strategies.cdm import CDMStrategy
+
+TS = "2025-01-01T09:30:00"
+
+
+class _Clock:
+    def __init__(self):
+        self.ts = datetime(2025, 1, 1, 9, 30)
+
+    def tick(self, price: float, symbol: str = "SPY") -> PriceTick:
+        self.ts += timedelta(seconds=1)
+        return PriceTick(symbol=symbol, price=price, timestamp=self.ts)
+
+
+def test_market_orders_pay_half_the_spread_plus_slippage():
+    model = FillModel(spread_pct=0.002, slippage_pct=0.001)
+    assert model.quote(100.0) == pytest.approx((99.9, 100.1))
+    assert model.market_price(Side.BUY, 5.0, 100.0) == pytest.approx(100.1 * 1.001)
+    assert model.market_price(Side.SELL, 5.0, 100.0) == pytest.approx(99.9 * 0.999)
+
+    broker = MatchingBroker(model=model)
+    fill = broker.place_order("SPY", Side.BUY, 5.0, 100.0, TS, "a")
+    assert fill.price == pytest.approx(100.1 * 1.001)
+    assert broker.close_position("SPY", TS, 100.0, "a") == pytest.approx((99.9 * 0.999 - 100.1 * 1.001) * 5.0)
+
+
+def test_large_market_orders_walk_the_book():
+    model = FillModel(depth=10.0, level_pct=0.001)
+    # 25 units: 10 at the touch, 10 one level up, 5 two levels up.
+    expected = (10 * 100.0 + 10 * 100.1 + 5 * 100.2) / 25
+    assert model.market_price(Side.BUY, 25.0, 100.0) == pytest.approx(expected)
+    assert model.market_price(Side.BUY, 10.0, 100.0) == pytest.approx(100.0)
+
+
+def test_resting_orders_fill_partially_under_depth():
+    broker = MatchingBroker(model=FillModel(depth=4.0))
+    clock = _Clock()
+    order = broker.submit_limit("SPY", Side.BUY, 10.0, 99.0, TS, "a")
+
+    assert broker.on_price(clock.tick(99.5)) == []
+    sizes = [sum(f.size for f in broker.on_price(clock.tick(98.5))) for _ in range(3)]
+    assert sizes == [4.0, 4.0, 2.0]
+    assert order.remaining == 0.0
+    assert broker.open_orders() == []
+    pos = broker.position("SPY", "a")
+    assert pos.net_size == 10.0 and pos.avg_entry_price() == pytest.approx(99.0)
+
+
+def test_price_then_time_priority():
+    broker = MatchingBroker(model=FillModel(depth=5.0))
+    clock = _Clock()
+    first = broker.submit_limit("SPY", Side.SELL, 5.0, 101.0, TS, "first")
+    second = broker.submit_limit("SPY", Side.SELL, 5.0, 101.0, TS, "second")
+    better = broker.submit_limit("SPY", Side.SELL, 5.0, 100.5, TS, "better")
+
+    fills = broker.on_price(clock.tick(101.5))
+    assert [(f.price, f.size) for f in fills] == [(100.5, 5.0)]
+    assert better.remaining == 0.0 and first.remaining == second.remaining == 5.0
+    broker.on_price(clock.tick(101.5))
+    assert first.remaining == 0.0 and second.remaining == 5.0
+    broker.on_price(clock.tick(101.5))
+    assert second.remaining == 0.0
+
+
+def test_cancelled_orders_never_fill():
+    broker = MatchingBroker()
+    clock = _Clock()
+    order = broker.submit_limit("SPY", Side.BUY, 5.0, 99.0, TS, "a")
+    assert broker.cancel(order.order_id)
+    assert not broker.cancel(order.order_id)
+    assert broker.open_orders() == []
+    assert broker.on_price(clock.tick(95.0)) == []
+    assert broker.position("SPY", "a").net_size == 0.0
+    with pytest.raises(ValueError):
+        broker.submit_limit("SPY", Side.BUY, 0.0, 99.0, TS)
+
+
+def test_flush_reports_resting_fills_once():
+    cfg = MartingaleConfig(
+        enabled=True,
+        symbol="SPY",
+        capital_allocation_pct=0.25,
+        initial_side=Side.BUY,
+        price_trigger=None,
+        max_orders=3,
+        hold_previous=True,
+        order_distances_pct=[0.0, 0.05, 0.05],
+        order_sizes=[10.0, 10.0, 10.0],
+        order_tps_pct=[0.01] * 3,
+        order_sls_pct=[0.05] * 3,
+    )
+    broker = MatchingBroker()
+    strategy = CDMStrategy(cfg, broker)
+    clock = _Clock()
+    strategy.on_price(clock.tick(100.0))
+    assert strategy.state.take_profit_price == pytest.approx(101.0)
+
+    broker.submit_limit("SPY", Side.BUY, 10.0, 98.0, TS, strategy.name)
+    broker.on_price(clock.tick(97.5))
+    [allocation] = broker.flush()
+    assert (allocation.owner, allocation.size, allocation.price, allocation.correction) == ("CDM", 10.0, 98.0, 0.0)
+    assert broker.flush() == []
+
+
+def test_engine_recompiles_a_strategy_on_its_resting_fill():
+    engine = TradingEngine(bench_config(StrategyMode.CDM_ONLY), broker=MatchingBroker())
+    strategy = engine.strategies["CDM"]
+    clock = _Clock()
+    engine.on_tick(clock.tick(100.0))
+    assert strategy.state.take_profit_price == pytest.approx(100.4)
+
+    engine.broker.submit_limit("SPY", Side.BUY, 10.0, 99.9, TS, strategy.name)
+    engine.on_tick(clock.tick(99.85))
+    assert strategy.position.net_size == 20.0
+    assert strategy.state.take_profit_price == pytest.approx(99.95 * 1.004)
+    # The recompiled take-profit is below the old one and closes the cycle.
+    engine.on_tick(clock.tick(100.36))
+    assert len(engine.cycles) == 1
+    assert engine.cycles[0].realized_pnl == pytest.approx((100.36 - 99.95) * 20.0)
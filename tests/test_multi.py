@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import asdict, replace
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.multi import MultiSymbolEngine, configs_for_symbols
+from trading_bot.data.synthetic import generate, to_ticks
+
+
+def _streams(symbols, count=3_000):
+    return {s: list(to_ticks(*generate("random_walk", count, seed=i), s)) for i, s in enumerate(symbols)}
+
+
+def test_matches_one_engine_per_symbol_including_continue_trading():
+    symbols = ["AAA", "BBB", "CCC"]
+    configs = configs_for_symbols(bench_config(), symbols)
+    configs["BBB"] = replace(configs["BBB"], shared=replace(configs["BBB"].shared, continue_trading=False))
+    streams = _streams(symbols)
+    interleaved = [stream[i] for i in range(3_000) for stream in streams.values()]
+
+    multi = MultiSymbolEngine(configs)
+    result = multi.run_backtest(interleaved)
+
+    expected = []
+    for symbol in symbols:
+        single = TradingEngine(configs[symbol])
+        expected.extend(single.run_backtest(streams[symbol]).cycles)
+        assert multi.engines[symbol].ticks_processed == single.ticks_processed
+    assert multi.engines["BBB"].sink.summary.count == 1
+    assert [asdict(c) for c in result.cycles] == [asdict(c) for c in sorted(expected, key=lambda c: (c.symbol, c.cycle_id))]
+    assert result.summary.count == len(expected)
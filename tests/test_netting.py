@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.broker.netting import NettingBroker
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.engine import TradingEngine
+from trading_bot.data.synthetic import generate, to_ticks
+
+MODEL = FillModel(spread_pct=0.0004, slippage_pct=0.0001, depth=20, level_pct=0.0002)
+
+
+def _pnl(realized, positions, price):
+    return sum(realized.values()) + sum(price * pos.net_size - pos.cost for pos in positions.values())
+
+
+@pytest.mark.parametrize("venue", [PaperBroker, lambda: MatchingBroker(model=MODEL)], ids=["paper", "matching"])
+def test_venue_ledger_stays_bounded_and_reconciles(venue):
+    ticks = list(to_ticks(*generate("random_walk", 8_000, seed=3), "SPY"))
+    broker = NettingBroker(venue=venue())
+    engine = TradingEngine(bench_config(), broker=broker)
+    legs = 0
+    for tick in ticks:
+        engine.on_tick(tick)
+        account = broker.venue.positions.get("SPY", {}).get("")
+        if account is not None:
+            legs = max(legs, len(account.legs))
+
+    assert broker.stats.venue_orders > 100
+    assert legs <= 1
+    price = ticks[-1].price
+    strategies = _pnl(broker.realized, broker.positions["SPY"], price)
+    venue_pnl = _pnl(broker.venue.realized, {"": broker.venue.position("SPY")}, price)
+    assert venue_pnl == pytest.approx(strategies, abs=1e-6)
+    assert broker.venue.position("SPY").net_size == pytest.approx(broker.net("SPY")[0], abs=1e-9)
+
+
+def test_paper_venue_matches_paper_broker():
+    ticks = list(to_ticks(*generate("random_walk", 4_000, seed=4), "SPY"))
+    cfg = bench_config()
+    expected = TradingEngine(cfg, broker=PaperBroker()).run_backtest(ticks)
+    actual = TradingEngine(cfg, broker=NettingBroker()).run_backtest(ticks)
+    assert actual.cycles == expected.cycles
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+
+import numpy as np
+import pytest
+
+from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import BinarySink, cycles_to_array
+from trading_bot.report import build_report, format_report, main
+
+HOUR = 3600.0
+
+
+def _cycle(cycle_id, start, end, pnl, drawdown=0.0, symbol="SPY"):
+    return CycleStats(
+        cycle_id=cycle_id,
+        symbol=symbol,
+        start_ts=start,
+        end_ts=end,
+        start_equity=1_000.0,
+        realized_pnl=pnl,
+        max_drawdown=drawdown,
+    )
+
+
+# Three days; realized equity 1000 -> 1100 -> 1050 -> 950 -> 1150.
+CYCLES = [
+    _cycle(1, "2025-01-01T09:00:00", "2025-01-01T10:00:00", 100.0, 10.0),
+    _cycle(2, "2025-01-01T11:00:00", "2025-01-01T12:00:00", -50.0, 20.0),
+    _cycle(3, "2025-01-02T09:00:00", "2025-01-02T09:30:00", -100.0, 30.0),
+    _cycle(4, "2025-01-03T09:00:00", "2025-01-03T11:00:00", 200.0, 40.0),
+]
+
+
+def test_metrics_of_a_hand_computed_run():
+    # Passed out of close order: the report sorts by close time.
+    report = build_report(list(reversed(CYCLES)), starting_equity=1_000.0)
+    m = report.metrics
+
+    assert m["cycles"] == 4
+    assert m["total_pnl"] == 150.0
+    assert m["mean_pnl"] == 37.5
+    assert m["win_rate"] == 0.5
+    assert m["final_equity"] == 1_150.0
+    np.testing.assert_allclose(report.equity, [1_100.0, 1_050.0, 950.0, 1_150.0])
+    np.testing.assert_allclose(report.returns, [0.1, -50 / 1_100, -100 / 1_050, 200 / 950])
+
+    # The 1100 peak after cycle 1 is regained only by cycle 4's close.
+    np.testing.assert_allclose(report.drawdown, [0.0, 50.0, 150.0, 0.0])
+    assert m["max_drawdown"] == 150.0
+    assert m["max_drawdown_duration_s"] == 23.5 * HOUR
+    assert m["max_intracycle_drawdown"] == 40.0
+    assert m["mean_intracycle_drawdown"] == 25.0
+
+    # Daily PnL 50, -100, 200 on start-of-day equity 1000, 1050, 950.
+    daily = np.array([50 / 1_000, -100 / 1_050, 200 / 950])
+    assert m["days"] == 3
+    assert m["sharpe"] == pytest.approx(daily.mean() / daily.std(ddof=1) * math.sqrt(365))
+    downside = math.sqrt((100 / 1_050) ** 2 / 3)
+    assert m["sortino"] == pytest.approx(daily.mean() / downside * math.sqrt(365))
+
+    # 4.5 hours in cycles over the 50 hours from the first start to the last close.
+    assert m["exposure"] == pytest.approx(4.5 / 50)
+    assert report.cycle_length_s == pytest.approx(
+        {"p5": 0.5 * HOUR + 0.15 * 0.5 * HOUR, "p25": 0.875 * HOUR, "p50": HOUR, "p75": 1.25 * HOUR,
+         "p95": 1.25 * HOUR + 0.8 * 0.75 * HOUR, "mean": 1.125 * HOUR, "max": 2 * HOUR}
+    )
+    assert "Cycles: 4" in format_report(report)
+
+
+def test_starting_equity_defaults_to_the_first_cycle():
+    assert build_report(CYCLES).metrics == build_report(CYCLES, starting_equity=1_000.0).metrics
+    assert build_report(cycles_to_array(CYCLES)).metrics == build_report(CYCLES).metrics
+    with pytest.raises(ValueError):
+        build_report(np.zeros(3))
+
+
+def test_exposure_is_per_symbol():
+    both = CYCLES + [_cycle(5, "2025-01-01T09:00:00", "2025-01-03T11:00:00", 0.0, symbol="QQQ")]
+    # QQQ spans the whole 50 hours; SPY is in a cycle for 4.5 of them.
+    assert build_report(both).metrics["exposure"] == pytest.approx((4.5 + 50) / 100)
+
+
+def test_empty_and_open_cycles():
+    for cycles in ([], [_cycle(1, "2025-01-01T09:00:00", None, 0.0)]):
+        report = build_report(cycles)
+        assert report.metrics == {"cycles": 0}
+        assert report.cycle_length_s == {}
+        assert format_report(report) == "No closed cycles."
+
+
+def test_zero_variance_returns_give_zero_ratios():
+    flat = [
+        _cycle(1, "2025-01-01T09:00:00", "2025-01-01T10:00:00", 0.0),
+        _cycle(2, "2025-01-02T09:00:00", "2025-01-02T10:00:00", 0.0),
+    ]
+    m = build_report(flat).metrics
+    assert m["sharpe"] == 0.0 and m["sortino"] == 0.0
+    assert m["win_rate"] == 0.0
+    assert m["max_drawdown"] == 0.0 and m["max_drawdown_duration_s"] == 0.0
+
+    # One day of returns has no deviation either.
+    single = build_report(CYCLES[:1]).metrics
+    assert single["days"] == 1
+    assert single["sharpe"] == 0.0 and single["sortino"] == 0.0
+
+
+def test_csv_and_json_exports(tmp_path):
+    report = build_report(CYCLES, starting_equity=1_000.0)
+    csv_path, json_path = tmp_path / "cycles.csv", tmp_path / "report.json"
+    report.write_csv(str(csv_path), chunk_size=3)
+    report.write_json(str(json_path))
+
+    with open(csv_path) as fh:
+        rows = list(csv.DictReader(fh))
+    assert [int(r["cycle_id"]) for r in rows] == [1, 2, 3, 4]
+    assert rows[0]["symbol"] == "SPY"
+    assert rows[0]["start"] == "2025-01-01T09:00:00.000000"
+    assert rows[2]["end"] == "2025-01-02T09:30:00.000000"
+    assert [float(r["equity"]) for r in rows] == [1_100.0, 1_050.0, 950.0, 1_150.0]
+    assert [float(r["drawdown"]) for r in rows] == [0.0, 50.0, 150.0, 0.0]
+    assert float(rows[1]["return"]) == pytest.approx(-50 / 1_100)
+    assert [float(r["duration_s"]) for r in rows] == [HOUR, HOUR, 0.5 * HOUR, 2 * HOUR]
+
+    with open(json_path) as fh:
+        assert json.load(fh) == report.as_dict()
+
+
+def test_cli_reads_a_binary_sink_file(tmp_path, capsys):
+    path = str(tmp_path / "cycles.bin")
+    sink = BinarySink(path)
+    for cycle in CYCLES:
+        sink.append(cycle)
+    sink.close()
+
+    out = tmp_path / "report.json"
+    assert main([path, "--starting-equity", "1000", "--json", str(out)]) == 0
+    assert "Cycles: 4" in capsys.readouterr().out
+    assert json.loads(out.read_text())["metrics"]["final_equity"] == 1_150.0
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.broker.risk import RiskGate, RiskLimits
+from trading_bot.config import MartingaleConfig, Side
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.data.synthetic import generate, to_ticks
+from trading_bot.strategies.cdm import CDMStrategy
+from trading_bot.strategies.wdm import WDMStrategy
+
+# One order per ten minutes: after the entry, any re-entry inside a test is refused.
+SLOW = RiskLimits(orders_per_sec=1 / 600, burst=1)
+
+_LADDER = MartingaleConfig(
+    enabled=True,
+    symbol="SPY",
+    capital_allocation_pct=0.25,
+    initial_side=Side.BUY,
+    price_trigger=None,
+    max_orders=3,
+    hold_previous=False,
+    order_distances_pct=[0.0, 0.01, 0.01],
+    order_sizes=[10.0, 15.0, 22.5],
+    order_tps_pct=[0.05] * 3,
+    order_sls_pct=[0.05] * 3,
+)
+
+
+@pytest.mark.parametrize("cls, add_price", [(CDMStrategy, 98.9), (WDMStrategy, 101.1)], ids=["CDM", "WDM"])
+def test_rejected_reentry_without_hold_previous_ends_the_cycle(cls, add_price):
+    gate = RiskGate(limits=SLOW)
+    strategy = cls(_LADDER, gate)
+    ts = datetime(2025, 1, 1)
+
+    def send(price):
+        nonlocal ts
+        ts += timedelta(seconds=1)
+        tick = PriceTick(symbol="SPY", price=price, timestamp=ts)
+        gate.on_price(tick)
+        return strategy.on_price(tick)
+
+    assert send(100.0) is None
+    assert strategy.state.active
+    realized = send(add_price)
+    assert realized == pytest.approx((add_price - 100.0) * 10.0)
+    assert gate.stats.rejected == {"rate": 1}
+    assert not strategy.state.active
+    assert not strategy.position.legs
+    assert strategy.state.take_profit_price is None
+
+
+def test_engine_never_holds_an_active_cycle_without_legs():
+    base = bench_config()
+    cfg = replace(
+        base,
+        cdm=replace(base.cdm, hold_previous=False),
+        wdm=replace(base.wdm, hold_previous=False),
+        zrm=replace(base.zrm, hold_previous=False),
+        izrm=replace(base.izrm, hold_previous=False),
+    )
+    gate = RiskGate(limits=RiskLimits(orders_per_sec=1 / 60, burst=1))
+    engine = TradingEngine(cfg, broker=gate)
+    for tick in to_ticks(*generate("random_walk", 6_000, seed=5), "SPY"):
+        engine.on_tick(tick)
+        for strategy in engine.strategies.values():
+            assert not (strategy.state.active and not strategy.position.legs), strategy.name
+    assert gate.stats.rejected.get("rate")
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import pickle
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import BinarySink, CycleSummary, MemorySink, SummarySink, load_cycle_array, read_cycles
+from trading_bot.data.synthetic import generate, to_ticks
+
+ZONES = [None, timezone.utc, timezone(timedelta(hours=5, minutes=30)), timezone(timedelta(hours=-4))]
+
+
+def _cycles(count=10):
+    start = datetime(2025, 3, 9, 6, 59, 58, 123456)
+    cycles = []
+    for i in range(count):
+        tz = ZONES[i % len(ZONES)]
+        begin = (start + timedelta(minutes=i)).replace(tzinfo=tz)
+        cycles.append(
+            CycleStats(
+                cycle_id=i + 1,
+                symbol="SPY",
+                start_ts=begin.isoformat(),
+                # The last cycle is still open.
+                end_ts=None if i == count - 1 else (begin + timedelta(seconds=30)).isoformat(),
+                start_equity=100_000.0 + i,
+                end_equity=100_000.0 + 2 * i,
+                realized_pnl=(-1) ** i * 3.5 * i,
+                max_drawdown=0.25 * i,
+                peak_equity=100_010.0 + i,
+                trough_equity=99_990.0 - i,
+                num_orders=i,
+            )
+        )
+    return cycles
+
+
+def test_binary_sink_round_trips_in_batches(tmp_path):
+    path = str(tmp_path / "cycles.bin")
+    cycles = _cycles()
+    sink = BinarySink(path, batch_size=3)
+    for cycle in cycles:
+        sink.append(cycle)
+    # Three full batches are on disk; the tenth cycle is still pending.
+    assert len(load_cycle_array(path)) == 9
+    assert [asdict(c) for c in sink.cycles()] == [asdict(c) for c in cycles]
+    sink.close()
+    assert [asdict(c) for c in read_cycles(path, chunk_size=4)] == [asdict(c) for c in cycles]
+
+
+def test_binary_sink_resumes_from_its_pickled_length(tmp_path):
+    path = str(tmp_path / "cycles.bin")
+    cycles = _cycles()
+    sink = BinarySink(path, batch_size=2)
+    for cycle in cycles[:5]:
+        sink.append(cycle)
+    state = pickle.dumps(sink)
+    for cycle in cycles[5:]:
+        sink.append(cycle)
+    sink.close()
+
+    resumed = pickle.loads(state)
+    assert resumed.summary.count == 5
+    for cycle in cycles[5:]:
+        resumed.append(cycle)
+    resumed.close()
+    assert [asdict(c) for c in read_cycles(path)] == [asdict(c) for c in cycles]
+
+
+def test_file_backed_run_matches_memory_with_aware_timestamps(tmp_path):
+    eastern = timezone(timedelta(hours=-5))
+    ticks = [
+        replace(t, timestamp=t.timestamp.replace(tzinfo=eastern))
+        for t in to_ticks(*generate("random_walk", 3_000, seed=12), "SPY")
+    ]
+    cfg = bench_config()
+    expected = TradingEngine(cfg, sink=MemorySink()).run_backtest(ticks)
+    assert expected.cycles and expected.cycles[0].start_ts.endswith("-05:00")
+
+    path = str(tmp_path / "run.bin")
+    sink = BinarySink(path, batch_size=7)
+    actual = TradingEngine(cfg, sink=sink).run_backtest(ticks)
+    sink.close()
+    assert actual.cycles == []
+    assert actual.summary == expected.summary
+    assert [asdict(c) for c in read_cycles(path)] == [asdict(c) for c in expected.cycles]
+
+
+def test_online_summary_matches_numpy():
+    ticks = to_ticks(*generate("mean_reversion", 5_000, seed=13), "SPY")
+    cycles = TradingEngine(bench_config()).run_backtest(ticks).cycles
+    pnl = np.array([c.realized_pnl for c in cycles])
+    assert len(pnl) > 10
+
+    sink = SummarySink()
+    for cycle in cycles:
+        sink.append(cycle)
+    summary = sink.summary
+    assert summary.count == len(pnl)
+    assert summary.total_pnl == pytest.approx(pnl.sum())
+    assert summary.mean_pnl == pytest.approx(pnl.mean())
+    assert summary.pnl_std == pytest.approx(pnl.std(ddof=1))
+    assert summary.best_pnl == pnl.max() and summary.worst_pnl == pnl.min()
+    assert summary.win_rate == pytest.approx((pnl > 0).mean())
+    assert summary.max_drawdown == max(c.max_drawdown for c in cycles)
+
+    # Merging summaries of two halves gives the summary of the whole.
+    halves = [CycleSummary(), CycleSummary()]
+    for i, cycle in enumerate(cycles):
+        halves[i * 2 >= len(cycles)].update(cycle)
+    merged = halves[0].merge(halves[1])
+    for key, value in summary.as_dict().items():
+        assert merged.as_dict()[key] == pytest.approx(value)
+
+
+def test_empty_summary():
+    summary = CycleSummary()
+    assert summary.as_dict() == {
+        "count": 0,
+        "total_pnl": 0.0,
+        "mean_pnl": 0.0,
+        "pnl_std": 0.0,
+        "win_rate": 0.0,
+        "best_pnl": 0.0,
+        "worst_pnl": 0.0,
+        "max_drawdown": 0.0,
+    }
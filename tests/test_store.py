@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from trading_bot.data.store import TickStore, TickStoreWriter, iter_store_ticks
+from trading_bot.data.synthetic import generate, to_ticks
+
+
+def _write(path, *blocks):
+    with TickStoreWriter(path) as writer:
+        for prices, timestamps, symbol in blocks:
+            writer.append_arrays(prices, timestamps, symbol)
+    return TickStore(path)
+
+
+def test_write_and_reopen_round_trips_the_columns(tmp_path):
+    prices, timestamps = generate("random_walk", 2_000, seed=3, step_s=0.25)
+    store = _write(str(tmp_path), (prices, timestamps, "SPY"))
+
+    assert len(store) == 2_000 and store.symbols == ["SPY"]
+    assert isinstance(store.prices, np.memmap)
+    np.testing.assert_array_equal(store.prices, prices)
+    np.testing.assert_array_equal(store.timestamps, timestamps.astype("datetime64[ns]"))
+    assert not store.symbol_codes.any()
+    with open(tmp_path / "meta.json") as fh:
+        assert json.load(fh) == {"version": 1, "count": 2_000, "symbols": ["SPY"]}
+    assert not os.path.exists(tmp_path / "meta.json.tmp")
+
+
+def test_store_ticks_match_to_ticks(tmp_path):
+    prices, timestamps = generate("gap", 3_000, seed=4, step_s=0.001)
+    path = str(tmp_path)
+    store = _write(path, (prices, timestamps, "SPY"))
+
+    expected = list(to_ticks(prices, timestamps, "SPY"))
+    assert list(store.range().iter_ticks()) == expected
+    assert list(iter_store_ticks(path)) == expected
+    # Ticks written one by one come back the same way.
+    with TickStoreWriter(str(tmp_path / "ticks")) as writer:
+        writer.append_ticks(expected, chunk_size=512)
+    assert list(iter_store_ticks(str(tmp_path / "ticks"))) == expected
+
+
+def test_range_and_symbol_filters(tmp_path):
+    prices, timestamps = generate("mean_reversion", 100, seed=5)
+    ns = timestamps.astype("datetime64[ns]").view(np.int64)
+    path = str(tmp_path)
+    store = _write(path, (prices[:50], ns[:50], "SPY"), (prices[50:], ns[50:], "QQQ"))
+    assert store.symbols == ["SPY", "QQQ"]
+
+    middle = store.range(timestamps[40], timestamps[60])
+    np.testing.assert_array_equal(middle.prices, prices[40:60])
+    assert [t.symbol for t in middle.iter_ticks()] == ["SPY"] * 10 + ["QQQ"] * 10
+    assert len(store.range(int(ns[40]), datetime.fromisoformat(str(timestamps[60])))) == 20
+
+    qqq = store.range(timestamps[40], symbol="QQQ")
+    assert list(qqq.iter_ticks()) == list(to_ticks(prices[50:], timestamps[50:], "QQQ"))
+    assert list(iter_store_ticks(path, ["QQQ", "IWM"])) == list(to_ticks(prices[50:], timestamps[50:], "QQQ"))
+    with pytest.raises(KeyError):
+        store.range(symbol="IWM")
+
+
+def test_writer_rejects_bad_input_and_reader_bad_versions(tmp_path):
+    prices, timestamps = generate("random_walk", 10, seed=6)
+    with TickStoreWriter(str(tmp_path)) as writer:
+        with pytest.raises(ValueError):
+            writer.append_arrays(prices, timestamps[:5], "SPY")
+        with pytest.raises(ValueError):
+            writer.append_arrays(prices, timestamps[::-1], "SPY")
+        writer.append_arrays(prices, timestamps, "SPY")
+        with pytest.raises(ValueError):
+            writer.append_arrays(prices[:1], timestamps[:1], "SPY")
+
+    with open(tmp_path / "meta.json", "w") as fh:
+        json.dump({"version": 2, "count": 10, "symbols": ["SPY"]}, fh)
+    with pytest.raises(ValueError):
+        TickStore(str(tmp_path))
+
+
+def test_empty_store(tmp_path):
+    store = _write(str(tmp_path))
+    assert len(store) == 0 and store.symbols == []
+    assert len(store.range()) == 0
+    assert list(iter_store_ticks(str(tmp_path))) == []
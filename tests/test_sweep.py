@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from trading_bot.benchmarks.suite import bench_config
+from trading_bot.config import Side, StrategyMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.data.synthetic import generate, to_ticks
+from trading_bot.sweep import _parse_grid, expand_grid
+
+
+def test_grid_enum_strings_become_enums():
+    grid = _parse_grid(['mode=["CDM_ONLY","MULTIPLE"]', 'cdm.initial_side=["SELL"]', "izrm=[null]"])
+    runs = expand_grid(bench_config(), grid)
+    assert [cfg.mode for _, cfg in runs] == [StrategyMode.CDM_ONLY, StrategyMode.MULTIPLE]
+    assert all(cfg.cdm.initial_side is Side.SELL and cfg.izrm is None for _, cfg in runs)
+
+    prices, timestamps = generate("random_walk", 500)
+    for _, cfg in runs:
+        TradingEngine(cfg).run_backtest(to_ticks(prices, timestamps, "SPY"))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.config import MartingaleConfig, Side, ZoneConfig
+from trading_bot.core.events import PriceTick
+from trading_bot.strategies.cdm import CDMStrategy
+from trading_bot.strategies.izrm import IZRMStrategy
+from trading_bot.strategies.wdm import WDMStrategy
+from trading_bot.strategies.zrm import ZRMStrategy
+
+FIRST_MOVE = 0.01
+STEP = 0.005
+SIZE = 10.0
+
+# One leg and take-profit/stop levels far away, so only the trailing stop can exit.
+_LADDER = dict(
+    enabled=True,
+    symbol="SPY",
+    capital_allocation_pct=0.25,
+    price_trigger=None,
+    max_orders=1,
+    hold_previous=True,
+    order_distances_pct=[0.0],
+    order_sizes=[SIZE],
+    order_tps_pct=[0.5],
+    order_sls_pct=[0.5],
+    trailing_enabled=True,
+    trailing_first_move_pct=FIRST_MOVE,
+    trailing_step_pct=STEP,
+)
+
+# (strategy class, config, entry price); IZRM enters on a breakout out of its zone.
+CASES = {
+    "CDM-long": (CDMStrategy, MartingaleConfig(initial_side=Side.BUY, **_LADDER), 100.0),
+    "CDM-short": (CDMStrategy, MartingaleConfig(initial_side=Side.SELL, **_LADDER), 100.0),
+    "WDM-long": (WDMStrategy, MartingaleConfig(initial_side=Side.BUY, **_LADDER), 100.0),
+    "WDM-short": (WDMStrategy, MartingaleConfig(initial_side=Side.SELL, **_LADDER), 100.0),
+    "ZRM-long": (ZRMStrategy, ZoneConfig(initial_side=Side.BUY, zone_center_price=100.0, zone_width_pct=0.5, **_LADDER), 100.0),
+    "ZRM-short": (ZRMStrategy, ZoneConfig(initial_side=Side.SELL, zone_center_price=100.0, zone_width_pct=0.5, **_LADDER), 100.0),
+    "IZRM-long": (IZRMStrategy, ZoneConfig(initial_side=Side.BUY, zone_center_price=100.0, zone_width_pct=0.01, **_LADDER), 90.0),
+    "IZRM-short": (IZRMStrategy, ZoneConfig(initial_side=Side.BUY, zone_center_price=100.0, zone_width_pct=0.01, **_LADDER), 110.0),
+}
+
+
+class _Feed:
+    def __init__(self, strategy, entry: float, long: bool):
+        self.strategy = strategy
+        self.entry = entry
+        self.sign = 1.0 if long else -1.0
+        self.ts = datetime(2025, 1, 1)
+
+    def move(self, favourable: float):
+        """Send a tick ``favourable`` (as a ratio of the entry) in the position's favour."""
+        return self.price(self.entry * (1 + self.sign * favourable))
+
+    def price(self, price: float):
+        self.ts += timedelta(seconds=1)
+        return self.strategy.on_price(PriceTick(symbol="SPY", price=price, timestamp=self.ts))
+
+
+@pytest.fixture(params=sorted(CASES))
+def feed(request):
+    cls, cfg, entry = CASES[request.param]
+    broker = PaperBroker()
+    strategy = cls(cfg, broker)
+    long = not request.param.endswith("short")
+    feed = _Feed(strategy, entry, long)
+    assert feed.price(entry) is None
+    assert strategy.state.active and strategy.position.direction() == (Side.BUY if long else Side.SELL)
+    return feed
+
+
+def test_arms_only_after_first_move(feed):
+    state = feed.strategy.state
+    assert feed.move(FIRST_MOVE * 0.9) is None
+    assert state.trailing_stop is None
+    feed.move(FIRST_MOVE)
+    assert state.trailing_stop == pytest.approx(feed.entry * (1 + feed.sign * FIRST_MOVE) * (1 - feed.sign * STEP))
+
+
+def test_ratchets_only_after_a_full_step(feed):
+    state = feed.strategy.state
+    feed.move(FIRST_MOVE)
+    armed = state.trailing_stop
+    # Less than a full step beyond the last move leaves the stop where it is.
+    feed.move(FIRST_MOVE + STEP * 0.8)
+    assert state.trailing_stop == armed
+    # A full step from the price that last moved it ratchets it.
+    feed.price(state.trailing_next)
+    assert feed.sign * (state.trailing_stop - armed) > 0
+
+
+def test_stop_never_loosens(feed):
+    state = feed.strategy.state
+    feed.move(FIRST_MOVE)
+    peak = state.trailing_next
+    feed.price(peak)
+    stop = state.trailing_stop
+    # Pull back most of the way to the stop without reaching it.
+    for k in (0.9, 0.5, 0.1):
+        assert feed.price(stop + k * (peak - stop)) is None
+        assert state.trailing_stop == stop
+
+
+def test_exit_price_and_realized_pnl(feed):
+    strategy = feed.strategy
+    state = strategy.state
+    feed.move(FIRST_MOVE)
+    feed.price(state.trailing_next)
+    stop = state.trailing_stop
+    # A tick that only touches the stop exits there.
+    realized = feed.price(stop)
+    assert realized == pytest.approx(feed.sign * (stop - feed.entry) * SIZE)
+    assert realized > 0
+    assert strategy.broker.realized[strategy.name] == pytest.approx(realized)
+    assert not strategy.state.active and not strategy.position.legs and strategy.state.trailing_stop is None
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import asdict, replace
+
+import pytest
+
+from trading_bot.benchmarks.suite import MODES, bench_config
+from trading_bot.config import Side, StrategyMode, SubMode
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.vectorized import VectorizedBacktester
+from trading_bot.data.synthetic import generate, to_ticks
+
+ALL_MODES = MODES + [(mode, SubMode.SEQUENTIAL) for mode in StrategyMode if mode != StrategyMode.MULTIPLE]
+
+
+def _variant(cfg, **changes):
+    """``cfg`` with ``changes`` applied to every strategy config."""
+    return replace(cfg, **{name: replace(getattr(cfg, name), **changes) for name in ("cdm", "wdm", "zrm", "izrm")})
+
+
+def _assert_parity(cfg, kind: str, seed: int, count: int = 4_000):
+    prices, timestamps = generate(kind, count, seed=seed)
+    expected = TradingEngine(cfg).run_backtest(to_ticks(prices, timestamps, "SPY"))
+    actual = VectorizedBacktester(cfg).run(prices, timestamps, "SPY")
+    assert [asdict(c) for c in actual.cycles] == [asdict(c) for c in expected.cycles]
+    assert actual.summary == expected.summary
+
+
+@pytest.mark.parametrize("mode,submode", ALL_MODES, ids=lambda v: v.value)
+@pytest.mark.parametrize("trailing", [False, True], ids=["fixed", "trailing"])
+@pytest.mark.parametrize("kind", ["random_walk", "mean_reversion", "gap"])
+def test_matches_engine(mode, submode, trailing, kind):
+    _assert_parity(bench_config(mode, submode, trailing=trailing), kind, seed=1)
+
+
+@pytest.mark.parametrize("mode,submode", ALL_MODES, ids=lambda v: v.value)
+@pytest.mark.parametrize("trailing", [False, True], ids=["fixed", "trailing"])
+def test_matches_engine_stop_after_first_cycle(mode, submode, trailing):
+    cfg = bench_config(mode, submode, trailing=trailing)
+    cfg = replace(cfg, shared=replace(cfg.shared, continue_trading=False))
+    _assert_parity(cfg, "random_walk", seed=2)
+
+
+@pytest.mark.parametrize("mode,submode", ALL_MODES, ids=lambda v: v.value)
+@pytest.mark.parametrize(
+    "changes",
+    [
+        dict(initial_side=Side.SELL),
+        dict(hold_previous=False),
+        dict(price_trigger=99.5),
+        dict(initial_side=Side.SELL, price_trigger=100.5, trailing_enabled=True),
+    ],
+    ids=["sell", "no-hold", "trigger", "sell-trigger-trailing"],
+)
+def test_matches_engine_ladder_variants(mode, submode, changes):
+    _assert_parity(_variant(bench_config(mode, submode), **changes), "random_walk", seed=3)
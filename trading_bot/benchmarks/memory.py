@@ -0,0 +1,64 @@
+"""Peak-RSS benchmark for streaming vs. materialized tick ingestion.
+
+Each measurement runs in a fresh interpreter so ``ru_maxrss`` only reflects that run::
+
+    python -m trading_bot.benchmarks.memory --sizes 100000 400000 1600000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional, Sequence
+
+from trading_bot.core.engine import TradingEngine
+from trading_bot.data.loaders import iter_binary_ticks, write_binary_ticks
+from trading_bot.main import build_demo_config, iter_sine_ticks
+
+
+def _child(path: str, mode: str):
+    ticks = iter_binary_ticks(path, "SPY")
+    if mode == "list":
+        ticks = list(ticks)
+    result = TradingEngine(build_demo_config()).run_backtest(ticks)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{peak_kb} {len(result.cycles)}")
+
+
+def measure(path: str, mode: str) -> List[int]:
+    out = subprocess.run(
+        [sys.executable, "-m", "trading_bot.benchmarks.memory", "--child", path, "--mode", mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return [int(v) for v in out]
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 400_000, 1_600_000])
+    parser.add_argument("--modes", nargs="+", default=["stream", "list"], choices=["stream", "list"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="stream", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child, args.mode)
+        return
+
+    print(f"{'ticks':>10} {'mode':>7} {'peak_rss_mb':>12} {'cycles':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"ticks_{size}.bin")
+            write_binary_ticks(path, iter_sine_ticks("SPY", 100.0, size))
+            for mode in args.modes:
+                peak_kb, cycles = measure(path, mode)
+                print(f"{size:>10} {mode:>7} {peak_kb / 1024:>12.1f} {cycles:>7}")
+
+
+if __name__ == "__main__":
+    main()
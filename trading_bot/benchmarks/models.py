@@ -0,0 +1,81 @@
+"""Micro-benchmark for the hot-path model objects.
+
+Reports memory per tick and per fill, the cost of marking a position with
+``n`` legs, and end-to-end engine time per tick::
+
+    python -m trading_bot.benchmarks.models
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Sequence
+
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Side
+from trading_bot.main import build_demo_config, make_sine_ticks
+
+
+def bytes_per_item(build: Callable[[int], object], count: int) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build(count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def _ticks(count: int):
+    start = datetime(2025, 1, 1)
+    return [PriceTick(symbol="SPY", price=100.0 + i * 1e-4, timestamp=start + timedelta(seconds=i)) for i in range(count)]
+
+
+def _fills(count: int):
+    broker = PaperBroker()
+    for i in range(count):
+        broker.place_order("SPY", Side.BUY, 1.0, 100.0 + i * 1e-4, "2025-01-01T00:00:00")
+    return broker
+
+
+def mark_ns(legs: int, repeat: int) -> float:
+    broker = PaperBroker()
+    for i in range(legs):
+        broker.place_order("SPY", Side.BUY, 1.0 + i, 100.0 - i * 0.01, "2025-01-01T00:00:00")
+    pos = broker.position("SPY")
+    t0 = time.perf_counter_ns()
+    for i in range(repeat):
+        pos.unrealized_pnl(100.0)
+        pos.avg_entry_price()
+        pos.total_size()
+    return (time.perf_counter_ns() - t0) / repeat
+
+
+def engine_ns_per_tick(count: int) -> float:
+    ticks = make_sine_ticks("SPY", 100.0, count)
+    engine = TradingEngine(build_demo_config())
+    t0 = time.perf_counter_ns()
+    engine.run_backtest(ticks)
+    return (time.perf_counter_ns() - t0) / count
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"PriceTick bytes/tick      {bytes_per_item(_ticks, args.count):8.1f}")
+    print(f"PaperBroker bytes/fill    {bytes_per_item(_fills, args.count):8.1f}")
+    for legs in (1, 10, 100):
+        print(f"mark ns ({legs:>3} legs)       {mark_ns(legs, 20_000):8.1f}")
+    print(f"engine ns/tick            {engine_ns_per_tick(args.count):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
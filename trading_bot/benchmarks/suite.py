@@ -0,0 +1,378 @@
+"""Throughput benchmark suite with JSON output for cross-commit comparison.
+
+    python -m trading_bot.benchmarks.suite --out bench.json
+    python -m trading_bot.benchmarks.suite --compare old.json bench.json --threshold 0.10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_bot.broker.matching import FillModel, MatchingBroker
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.broker.risk import RiskGate, RiskLimits
+from trading_bot.config import BotConfig, MartingaleConfig, SharedSettings, Side, StrategyMode, SubMode, ZoneConfig
+from trading_bot.core.batch import BatchBacktester
+from trading_bot.core.cache import ResultCache, tick_fingerprint
+from trading_bot.core.engine import TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.multi import MultiSymbolEngine, configs_for_symbols
+from trading_bot.core.vectorized import VectorizedBacktester
+from trading_bot.data.bars import iter_bars
+from trading_bot.data.synthetic import GENERATORS, generate, to_ticks
+from trading_bot.strategies.cdm import CDMStrategy
+
+MODES: List[Tuple[StrategyMode, SubMode]] = [
+    (StrategyMode.CDM_ONLY, SubMode.PARALLEL),
+    (StrategyMode.WDM_ONLY, SubMode.PARALLEL),
+    (StrategyMode.ZRM_ONLY, SubMode.PARALLEL),
+    (StrategyMode.IZRM_ONLY, SubMode.PARALLEL),
+    (StrategyMode.MULTIPLE, SubMode.PARALLEL),
+    (StrategyMode.MULTIPLE, SubMode.SEQUENTIAL),
+]
+
+Results = Dict[str, Dict[str, float]]
+
+
+def bench_config(
+    mode: StrategyMode = StrategyMode.MULTIPLE,
+    submode: SubMode = SubMode.PARALLEL,
+    legs: int = 5,
+    symbol: str = "SPY",
+    trailing: bool = False,
+) -> BotConfig:
+    """All four strategies on one symbol with a ``legs``-deep ladder around 100.0."""
+    ladder = dict(
+        enabled=True,
+        symbol=symbol,
+        capital_allocation_pct=0.25,
+        initial_side=Side.BUY,
+        price_trigger=None,
+        max_orders=legs,
+        hold_previous=True,
+        order_distances_pct=[0.0] + [0.003] * (legs - 1),
+        order_sizes=[round(10 * 1.5**i, 2) for i in range(legs)],
+        order_tps_pct=[0.004] * legs,
+        order_sls_pct=[0.006] * legs,
+        trailing_enabled=trailing,
+        trailing_first_move_pct=0.002,
+        trailing_step_pct=0.001,
+    )
+    zone = dict(ladder, zone_center_price=100.0, zone_width_pct=0.005)
+    return BotConfig(
+        shared=SharedSettings(),
+        mode=mode,
+        submode=submode,
+        second_order_distance_pct=0.005,
+        cdm=MartingaleConfig(**ladder),
+        wdm=MartingaleConfig(**ladder),
+        zrm=ZoneConfig(**zone),
+        izrm=ZoneConfig(**zone),
+    )
+
+
+def _best(fn: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _ticks(kind: str, count: int, symbol: str = "SPY", seed: int = 0) -> List[PriceTick]:
+    prices, timestamps = generate(kind, count, seed=seed)
+    return list(to_ticks(prices, timestamps, symbol))
+
+
+def _engine_rate(cfg: BotConfig, ticks: List[PriceTick], repeat: int) -> Dict[str, float]:
+    seconds = _best(lambda: TradingEngine(cfg).run_backtest(ticks), repeat)
+    return {"ticks": len(ticks), "seconds": seconds, "ticks_per_sec": len(ticks) / seconds}
+
+
+def bench_modes(count: int, repeat: int) -> Results:
+    results = {}
+    for kind in GENERATORS:
+        ticks = _ticks(kind, count)
+        for mode, submode in MODES:
+            name = mode.value if mode != StrategyMode.MULTIPLE else f"{mode.value}_{submode.value}"
+            results[f"mode/{name}/{kind}"] = _engine_rate(bench_config(mode, submode), ticks, repeat)
+    return results
+
+
+def bench_tick_scaling(counts: Sequence[int], repeat: int) -> Results:
+    cfg = bench_config()
+    return {f"ticks/{n}": _engine_rate(cfg, _ticks("random_walk", n), repeat) for n in counts}
+
+
+def bench_leg_scaling(count: int, legs: Sequence[int], repeat: int) -> Results:
+    ticks = _ticks("mean_reversion", count)
+    return {f"legs/{n}": _engine_rate(bench_config(StrategyMode.CDM_ONLY, legs=n), ticks, repeat) for n in legs}
+
+
+def bench_trailing(count: int, legs: Sequence[int], repeat: int) -> Results:
+    """Armed trailing stop on a CDM position holding ``n`` legs; per-tick cost should stay flat."""
+    prices = 100.0 * np.exp(np.cumsum(np.full(count, 0.0001)))
+    ticks = list(to_ticks(prices, generate("trend", count)[1], "SPY"))
+    results = {}
+    for n in legs:
+        cfg = replace(bench_config(StrategyMode.CDM_ONLY, legs=n, trailing=True).cdm, order_tps_pct=[0.5] * n)
+
+        def run():
+            strategy = CDMStrategy(cfg, PaperBroker())
+            for leg in range(n):
+                strategy.position.add(Side.BUY, cfg.order_sizes[leg], 100.0, "2025-01-01T00:00:00")
+            strategy.state.active = True
+            strategy.state.current_leg = n
+            strategy._compile()
+            for tick in ticks:
+                strategy.on_price(tick)
+
+        seconds = _best(run, repeat)
+        results[f"trailing/legs/{n}"] = {"ticks": count, "seconds": seconds, "ticks_per_sec": count / seconds}
+    return results
+
+
+def bench_bars(count: int, repeat: int) -> Results:
+    """Raw ticks vs 1-minute bars (plain and range-capped) over the same quarter-second path."""
+    ticks = list(to_ticks(*generate("random_walk", count, vol=0.0001, step_s=0.25), "SPY"))
+    cfg = bench_config()
+    results = {"bars/raw": _engine_rate(cfg, ticks, repeat)}
+    for name, max_range in (("bars/1m", None), ("bars/1m_range", 0.001)):
+        bars = list(iter_bars(ticks, timedelta(minutes=1), max_range))
+        seconds = _best(lambda: TradingEngine(cfg).run_bars(bars), repeat)
+        results[name] = {"ticks": count, "bars": len(bars), "seconds": seconds, "ticks_per_sec": count / seconds}
+    return results
+
+
+def bench_symbol_scaling(count: int, symbols: Sequence[int], repeat: int) -> Results:
+    """Constant total tick count spread over ``n`` interleaved symbols."""
+    results = {}
+    for n in symbols:
+        names = [f"S{i:04d}" for i in range(n)]
+        per_symbol = max(1, count // n)
+        streams = [_ticks("random_walk", per_symbol, symbol=s, seed=i) for i, s in enumerate(names)]
+        ticks = [stream[i] for i in range(per_symbol) for stream in streams]
+        configs = configs_for_symbols(bench_config(), names)
+        seconds = _best(lambda: MultiSymbolEngine(configs).run_backtest(ticks), repeat)
+        results[f"symbols/{n}"] = {"ticks": len(ticks), "seconds": seconds, "ticks_per_sec": len(ticks) / seconds}
+    return results
+
+
+def bench_broker(count: int, repeat: int) -> Results:
+    symbols = [f"S{i}" for i in range(10)]
+
+    def orders():
+        broker = PaperBroker()
+        for i in range(count):
+            broker.place_order(symbols[i % 10], Side.BUY, 1.0, 100.0, "2025-01-01T00:00:00")
+
+    def round_trips():
+        broker = PaperBroker()
+        for i in range(count):
+            broker.place_order(symbols[i % 10], Side.BUY, 1.0, 100.0, "2025-01-01T00:00:00")
+            broker.close_position(symbols[i % 10], "2025-01-01T00:00:00", 100.5)
+
+    results = {}
+    for name, fn in (("broker/place_order", orders), ("broker/round_trip", round_trips)):
+        seconds = _best(fn, repeat)
+        results[name] = {"ops": count, "seconds": seconds, "ops_per_sec": count / seconds}
+    return results
+
+
+def bench_risk(count: int, repeat: int) -> Results:
+    """Orders through a ``RiskGate`` with every limit set but none hit, and the ns it adds per order."""
+    symbols = [f"S{i}" for i in range(10)]
+    limits = RiskLimits(
+        max_position=1e12,
+        max_symbol_position=1e12,
+        max_gross_notional=1e15,
+        max_loss=1e15,
+        orders_per_sec=1e12,
+        total_orders_per_sec=1e12,
+        # Tick time stands still during the loop, so the burst must cover every order.
+        burst=float(count),
+    )
+    tick = PriceTick("S0", 100.0, datetime(2025, 1, 1))
+
+    def orders(broker):
+        broker.on_price(tick)
+        for i in range(count):
+            broker.place_order(symbols[i % 10], Side.BUY, 1.0, 100.0, "2025-01-01T00:00:00", "CDM")
+
+    paper_s = _best(lambda: orders(PaperBroker()), repeat)
+    gate_s = _best(lambda: orders(RiskGate(PaperBroker(), limits)), repeat)
+    return {
+        "risk/place_order": {
+            "ops": count,
+            "seconds": gate_s,
+            "ops_per_sec": count / gate_s,
+            "added_ns_per_order": (gate_s - paper_s) / count * 1e9,
+        },
+    }
+
+
+def bench_matching(count: int, resting: Sequence[int], repeat: int) -> Results:
+    """Ticks against ``n`` resting limit orders far from the market; cost should not grow with ``n``."""
+    ticks = _ticks("random_walk", count)
+    results = {}
+    for n in resting:
+        broker = MatchingBroker(model=FillModel(spread_pct=0.0002))
+        for i in range(n):
+            broker.submit_limit("SPY", Side.BUY, 1.0, 50.0 - i * 1e-4, "2025-01-01T00:00:00")
+            broker.submit_limit("SPY", Side.SELL, 1.0, 150.0 + i * 1e-4, "2025-01-01T00:00:00")
+
+        def run():
+            for tick in ticks:
+                broker.on_price(tick)
+
+        seconds = _best(run, repeat)
+        results[f"matching/resting/{n}"] = {"ticks": count, "seconds": seconds, "ticks_per_sec": count / seconds}
+    return results
+
+
+def bench_vectorized(count: int, repeat: int) -> Results:
+    prices, timestamps = generate("random_walk", count)
+    results = {}
+    for mode in (StrategyMode.CDM_ONLY, StrategyMode.WDM_ONLY):
+        cfg = bench_config(mode)
+        seconds = _best(lambda: VectorizedBacktester(cfg).run(prices, timestamps, "SPY"), repeat)
+        results[f"vectorized/{mode.value}"] = {"ticks": count, "seconds": seconds, "ticks_per_sec": count / seconds}
+    return results
+
+
+def bench_batch(count: int, configs: Sequence[int], repeat: int) -> Results:
+    """``n`` CDM take-profit variants in one ``BatchBacktester`` pass; rates are config-ticks per second."""
+    prices, timestamps = generate("random_walk", count)
+    base = bench_config(StrategyMode.CDM_ONLY)
+    results = {}
+    for n in configs:
+        cfgs = [replace(base, cdm=replace(base.cdm, order_tps_pct=[0.002 + i * 1e-6] * 5)) for i in range(n)]
+        seconds = _best(lambda: BatchBacktester(cfgs).run(prices, timestamps, "SPY"), repeat)
+        results[f"batch/configs/{n}"] = {
+            "ticks": count,
+            "configs": n,
+            "seconds": seconds,
+            "ticks_per_sec": count * n / seconds,
+        }
+    return results
+
+
+def bench_cache(count: int, lookups: int, repeat: int) -> Results:
+    """Cache hits for one stored result, and fingerprinting ``count`` ticks."""
+    prices, timestamps = generate("random_walk", count)
+    cfg = bench_config()
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResultCache(root)
+        fingerprint = tick_fingerprint(prices, timestamps, "SPY")
+        cache.get_or_run(cfg, prices, timestamps, "SPY", fingerprint=fingerprint)
+
+        def hits():
+            for _ in range(lookups):
+                cache.get_or_run(cfg, prices, timestamps, "SPY", fingerprint=fingerprint)
+
+        hit_s = _best(hits, repeat)
+        fingerprint_s = _best(lambda: tick_fingerprint(prices, timestamps, "SPY"), repeat)
+    return {
+        "cache/hit": {"ops": lookups, "seconds": hit_s, "ops_per_sec": lookups / hit_s},
+        "cache/fingerprint": {"ticks": count, "seconds": fingerprint_s, "ticks_per_sec": count / fingerprint_s},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_suite(quick: bool = False, repeat: int = 3) -> Dict[str, object]:
+    count = 5_000 if quick else 50_000
+    results: Results = {}
+    results.update(bench_modes(count, repeat))
+    results.update(bench_tick_scaling([count // 2, count * 2] if quick else [25_000, 100_000, 400_000], repeat))
+    results.update(bench_leg_scaling(count, [2, 5, 10, 20], repeat))
+    results.update(bench_trailing(count, [2, 5, 10, 20], repeat))
+    results.update(bench_symbol_scaling(count, [1, 10, 100], repeat))
+    results.update(bench_broker(count * 2, repeat))
+    results.update(bench_risk(count * 2, repeat))
+    results.update(bench_matching(count * 2, [10, 1_000, 100_000], repeat))
+    results.update(bench_vectorized(count * 4, repeat))
+    results.update(bench_batch(count, [1, 100, 1_000] if quick else [1, 100, 1_000, 10_000], repeat))
+    results.update(bench_bars(count * 4, repeat))
+    results.update(bench_cache(count * 4, 100, repeat))
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _rate(entry: Dict[str, float]) -> Optional[float]:
+    return entry.get("ticks_per_sec", entry.get("ops_per_sec"))
+
+
+def compare(old: Dict[str, object], new: Dict[str, object], threshold: float) -> Tuple[str, List[str]]:
+    """Render a per-case ratio table and list the cases slower by more than ``threshold``."""
+    lines = [f"{'case':<40} {'old':>12} {'new':>12} {'ratio':>7}"]
+    regressions = []
+    for name in sorted(set(old["results"]) & set(new["results"])):
+        before, after = _rate(old["results"][name]), _rate(new["results"][name])
+        if not before or after is None:
+            continue
+        ratio = after / before
+        flag = ""
+        if ratio < 1.0 - threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:<40} {before:>12.0f} {after:>12.0f} {ratio:>7.2f}{flag}")
+    return "\n".join(lines), regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="Write results JSON here (default: stdout).")
+    parser.add_argument("--quick", action="store_true", help="Small inputs for a smoke run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before flagging.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as fh:
+            old = json.load(fh)
+        with open(args.compare[1]) as fh:
+            new = json.load(fh)
+        table, regressions = compare(old, new, args.threshold)
+        print(table)
+        return 1 if regressions else 0
+
+    report = run_suite(quick=args.quick, repeat=args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from trading_bot.broker.base import Fill
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Side
+
+
+class AsyncBroker(ABC):
+    """Awaitable counterpart to ``Broker`` for venues with real round-trips."""
+
+    @abstractmethod
+    async def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        ...
+
+    @abstractmethod
+    async def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        """Flatten ``owner``'s position in ``symbol`` and return its realized PnL."""
+        ...
+
+    def on_price(self, tick: PriceTick):
+        """Market data hook, called synchronously on every tick. Live adapters can ignore it."""
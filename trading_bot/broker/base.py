@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
-from trading_bot.core.models import Side
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Position, Side
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Fill:
     symbol: str
     side: Side
@@ -16,12 +17,63 @@ class Fill:
     ts: str
 
 
+@dataclass(frozen=True, slots=True)
+class Allocation:
+    """One owner's share of a fill that a broker priced after the request returned.
+
+    ``size`` is signed (positive buys). ``correction`` is the change in the
+    realized PnL the broker already reported for this request; it is 0.0 when
+    the request left an open leg, which the broker repriced instead.
+    """
+
+    owner: str
+    symbol: str
+    size: float
+    requested: float
+    price: float
+    correction: float = 0.0
+
+
+class OrderRejected(Exception):
+    """Raised by ``place_order`` when a broker refuses an order; nothing was booked."""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
 class Broker(ABC):
     @abstractmethod
-    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str) -> Fill:
+    def position(self, symbol: str, owner: str = "") -> Position:
+        """The ledger entry for ``owner``'s position in ``symbol``."""
+        ...
+
+    @abstractmethod
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        """Fill into ``owner``'s position in ``symbol`` (strategies pass their name).
+
+        Raises ``OrderRejected`` if the order is refused; closes are never refused.
+        """
         ...
 
     @abstractmethod
-    def close_position(self, symbol: str, ts: str, price: float) -> float:
-        """Return realized PnL for the closed position."""
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        """Flatten ``owner``'s position in ``symbol`` and return its realized PnL."""
         ...
+
+    def __getstate__(self):
+        # Instrumentation shadows these with timing wrappers bound to one engine; leave them out of copies.
+        state = dict(vars(self))
+        state.pop("place_order", None)
+        state.pop("close_position", None)
+        return state
+
+    def on_price(self, tick: PriceTick):
+        """Market data hook, called before strategies see each tick. Brokers that fill instantly ignore it."""
+
+    def flush(self) -> List[Allocation]:
+        """Send requests held back during the current tick, called once strategies have handled it.
+
+        Brokers that fill instantly ignore it.
+        """
+        return []
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from trading_bot.broker.base import Allocation, Fill
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Position, Side
+from trading_bot.core.utils import pct
+
+
+@dataclass(frozen=True)
+class FillModel:
+    """How orders meet a simulated book quoted around each tick's price.
+
+    ``spread_pct`` is the full bid/ask spread and ``slippage_pct`` an extra
+    adverse move on every marketable fill. The book shows ``depth`` units per
+    level, ``level_pct`` apart, so large market orders walk it; ``depth=None``
+    means unlimited size at the touch. Resting orders on one side of the book
+    share at most ``depth`` units per tick, which is what makes them fill
+    partially.
+    """
+
+    spread_pct: float = 0.0
+    slippage_pct: float = 0.0
+    depth: Optional[float] = None
+    level_pct: float = 0.0
+
+    def quote(self, price: float) -> Tuple[float, float]:
+        half = price * pct(self.spread_pct) / 2
+        return price - half, price + half
+
+    def market_price(self, side: Side, size: float, price: float) -> float:
+        """Average price of a market order for ``size`` that sweeps the book from the touch."""
+        bid, ask = self.quote(price)
+        depth = self.depth
+        level = 0.0
+        if depth and size > depth:
+            # Size-weighted mean level index: ``full`` complete levels, then the rest.
+            full = int(size // depth)
+            level = (depth * full * (full - 1) / 2 + (size - full * depth) * full) / size
+        move = pct(self.level_pct) * level + pct(self.slippage_pct)
+        return ask * (1 + move) if side == Side.BUY else bid * (1 - move)
+
+
+@dataclass(slots=True)
+class RestingOrder:
+    order_id: int
+    symbol: str
+    side: Side
+    size: float
+    limit: float
+    ts: str
+    owner: str = ""
+    filled: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def remaining(self) -> float:
+        return self.size - self.filled
+
+
+_FLAT = Position(symbol="")
+
+
+class _Book:
+    """Resting orders for one symbol in price-time priority.
+
+    Bids sit in a max-heap on limit price and asks in a min-heap, keyed by
+    ``(price, order_id)``. A tick only looks at the top of each heap, so ticks
+    that cross nothing cost O(1) and each fill O(log n) however many orders
+    rest. Cancelled orders are dropped lazily when they reach the top.
+    """
+
+    __slots__ = ("bids", "asks")
+
+    def __init__(self):
+        self.bids: List[Tuple[float, int, RestingOrder]] = []
+        self.asks: List[Tuple[float, int, RestingOrder]] = []
+
+
+@dataclass
+class MatchingBroker(PaperBroker):
+    """``PaperBroker`` that prices fills off a simulated book.
+
+    ``place_order`` and ``close_position`` are market orders: they fill in
+    full at the average sweep price from ``model``. ``submit_limit`` rests an
+    order that ``on_price`` matches against later ticks, filling at its limit
+    once the opposite quote trades through it, possibly across several ticks.
+
+    Resting fills land in the owner's ledger after its order returned, so
+    ``flush`` reports each as an ``Allocation`` (requested and filled at the
+    limit) and the engine recompiles the owning strategy's ladder.
+    """
+
+    model: FillModel = field(default_factory=FillModel)
+    _books: Dict[str, _Book] = field(default_factory=dict, repr=False)
+    _orders: Dict[int, RestingOrder] = field(default_factory=dict, repr=False)
+    _next_id: int = field(default=0, repr=False)
+    _unsettled: List[Allocation] = field(default_factory=list, repr=False)
+
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        if price is None:
+            raise ValueError("MatchingBroker requires a price for fills (provide tick price).")
+        return super().place_order(symbol, side, size, self.model.market_price(side, size, price), ts, owner)
+
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        net = self.positions.get(symbol, {}).get(owner, _FLAT).net_size
+        if net > 0:
+            price = self.model.market_price(Side.SELL, net, price)
+        elif net < 0:
+            price = self.model.market_price(Side.BUY, -net, price)
+        return super().close_position(symbol, ts, price, owner)
+
+    def submit_limit(self, symbol: str, side: Side, size: float, limit: float, ts: str, owner: str = "") -> RestingOrder:
+        """Rest a limit order; it is first matched on the next ``on_price`` for ``symbol``."""
+        if size <= 0:
+            raise ValueError("Limit order size must be positive.")
+        order = RestingOrder(self._next_id, symbol, side, size, limit, ts, owner)
+        self._next_id += 1
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        if side == Side.BUY:
+            heapq.heappush(book.bids, (-limit, order.order_id, order))
+        else:
+            heapq.heappush(book.asks, (limit, order.order_id, order))
+        self._orders[order.order_id] = order
+        return order
+
+    def cancel(self, order_id: int) -> bool:
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.cancelled = True
+        return True
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[RestingOrder]:
+        return [o for o in self._orders.values() if symbol is None or o.symbol == symbol]
+
+    def flush(self) -> List[Allocation]:
+        """Resting fills booked since the last flush."""
+        if not self._unsettled:
+            return []
+        allocations, self._unsettled = self._unsettled, []
+        return allocations
+
+    def on_price(self, tick: PriceTick) -> List[Fill]:
+        """Match resting orders for ``tick.symbol`` against its quote; return the fills."""
+        book = self._books.get(tick.symbol)
+        if book is None:
+            return []
+        bid, ask = self.model.quote(tick.price)
+        fills: List[Fill] = []
+        # Bids are keyed on -limit, so both sides cross while the quote is >= the key.
+        bids, asks = book.bids, book.asks
+        if bids and -ask >= bids[0][0]:
+            self._match(bids, -ask, tick, fills)
+        if asks and bid >= asks[0][0]:
+            self._match(asks, bid, tick, fills)
+        return fills
+
+    def _match(self, heap: list, quote: float, tick: PriceTick, fills: List[Fill]):
+        budget = self.model.depth if self.model.depth else float("inf")
+        ts = None
+        while heap and budget > 0:
+            key, _, order = heap[0]
+            if order.cancelled:
+                heapq.heappop(heap)
+                continue
+            if quote < key:
+                break
+            take = min(order.remaining, budget)
+            budget -= take
+            order.filled += take
+            if ts is None:
+                ts = tick.timestamp.isoformat()
+            self.position(order.symbol, order.owner).add(order.side, take, order.limit, ts)
+            fills.append(Fill(symbol=order.symbol, side=order.side, size=take, price=order.limit, ts=ts))
+            signed = take if order.side == Side.BUY else -take
+            self._unsettled.append(Allocation(order.owner, order.symbol, signed, order.limit, order.limit))
+            if order.remaining <= 0:
+                heapq.heappop(heap)
+                del self._orders[order.order_id]
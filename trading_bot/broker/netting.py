@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from trading_bot.broker.base import Allocation, Fill
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Leg, Position, Side
+
+# Net sizes below this are treated as flat and never sent.
+_FLAT = 1e-9
+
+
+@dataclass(slots=True)
+class _Intent:
+    owner: str
+    # Signed size: positive buys. A close trades minus the owner's net size.
+    size: float
+    price: float
+    ts: str
+    # The leg an order booked; ``None`` for closes.
+    leg: Optional[Leg] = None
+
+
+@dataclass(slots=True)
+class NettingStats:
+    intents: int = 0
+    venue_orders: int = 0
+    # Sum of |size| over intents, and over the net orders actually sent.
+    gross_size: float = 0.0
+    net_size: float = 0.0
+
+
+@dataclass
+class NettingBroker(PaperBroker):
+    """Trades only the net of each symbol's requests per tick on ``venue``.
+
+    Strategies get instant fills at the requested price in this broker's
+    ledger, as with ``PaperBroker``, and every order or close is kept as an
+    intent. ``flush`` (called by the engine once strategies have handled a
+    tick) sums each symbol's intents and sends the residual as one market
+    order to ``venue``. Opposing intents cross internally at the requested
+    price. Intents on the net side share the venue's price difference pro rata
+    to size. Open legs are repriced to their share, and requests whose legs are
+    already closed report the change to their realized PnL. Intents flushed
+    together are assumed to share one requested price (the tick's).
+
+    The venue account (owner ``""``) is kept as one leg at its average price,
+    so it does not grow with the number of orders; offsetting fills realize
+    against that average into the venue's ``realized``.
+    """
+
+    venue: PaperBroker = field(default_factory=PaperBroker)
+    stats: NettingStats = field(default_factory=NettingStats)
+    _pending: Dict[str, List[_Intent]] = field(default_factory=dict, repr=False)
+
+    def on_price(self, tick: PriceTick):
+        self.venue.on_price(tick)
+
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        fill = super().place_order(symbol, side, size, price, ts, owner)
+        leg = self.positions[symbol][owner].legs[-1]
+        self._hold(symbol, _Intent(owner, size if side == Side.BUY else -size, fill.price, ts, leg))
+        return fill
+
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        pos = self.positions.get(symbol, {}).get(owner)
+        size = -pos.net_size if pos is not None else 0.0
+        realized = super().close_position(symbol, ts, price, owner)
+        if size:
+            self._hold(symbol, _Intent(owner, size, price, ts))
+        return realized
+
+    def _hold(self, symbol: str, intent: _Intent):
+        pending = self._pending.get(symbol)
+        if pending is None:
+            pending = self._pending[symbol] = []
+        pending.append(intent)
+        self.stats.intents += 1
+        self.stats.gross_size += abs(intent.size)
+
+    def _compact(self, pos: Position):
+        """Fold the venue's new fill into its single average-price leg."""
+        if len(pos.legs) < 2:
+            return
+        held, fill = pos.legs
+        if held.side == fill.side:
+            side, size = held.side, held.size + fill.size
+            price = (held.size * held.entry_price + fill.size * fill.entry_price) / size
+        else:
+            matched = min(held.size, fill.size)
+            gain = (fill.entry_price - held.entry_price) * matched
+            self.venue.realized[""] = self.venue.realized.get("", 0.0) + (gain if held.side == Side.BUY else -gain)
+            if held.size > fill.size:
+                side, size, price = held.side, held.size - fill.size, held.entry_price
+            else:
+                side, size, price = fill.side, fill.size - held.size, fill.entry_price
+        pos.clear()
+        if size > _FLAT:
+            pos.add(side, size, price, fill.entry_ts)
+
+    def flush(self) -> List[Allocation]:
+        allocations: List[Allocation] = []
+        for symbol, intents in self._pending.items():
+            net = 0.0
+            for intent in intents:
+                net += intent.size
+            if abs(net) < _FLAT:
+                continue
+            last = intents[-1]
+            side = Side.BUY if net > 0 else Side.SELL
+            fill = self.venue.place_order(symbol, side, abs(net), last.price, last.ts)
+            self._compact(self.venue.position(symbol))
+            self.stats.venue_orders += 1
+            self.stats.net_size += abs(net)
+            slip = fill.price - last.price
+            if slip == 0.0:
+                continue
+
+            same_side = [i for i in intents if (i.size > 0) == (net > 0)]
+            # Price move per unit for the net side: the venue filled |net| of their combined size.
+            per_unit = slip * abs(net) / sum(abs(i.size) for i in same_side)
+            book = self.positions[symbol]
+            for intent in same_side:
+                price = intent.price + per_unit
+                pos = book[intent.owner]
+                correction = 0.0
+                if intent.leg is not None and any(leg is intent.leg for leg in pos.legs):
+                    pos.reprice(intent.leg, price)
+                else:
+                    correction = -(price - intent.price) * intent.size
+                    self.realized[intent.owner] = self.realized.get(intent.owner, 0.0) + correction
+                allocations.append(Allocation(intent.owner, symbol, intent.size, intent.price, price, correction))
+        self._pending.clear()
+        return allocations
@@ -1,33 +1,58 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from trading_bot.broker.base import Broker, Fill
-from trading_bot.core.models import Leg, Position, Side
+from trading_bot.core.models import Exposure, Position, Side
 
 
 @dataclass
 class PaperBroker(Broker):
-    positions: Dict[str, Position] = field(default_factory=dict)
+    """Instant fills at the requested price.
+
+    ``positions`` is the single ledger, ``symbol -> owner -> Position``, so
+    strategies trading the same symbol keep separate legs and a close only
+    flattens its owner's. Strategies hold a reference to their own entry
+    instead of a copy. ``exposures`` nets each symbol across owners.
+    """
+
+    positions: Dict[str, Dict[str, Position]] = field(default_factory=dict)
+    exposures: Dict[str, Exposure] = field(default_factory=dict)
+    # Realized PnL per owner across all closes.
+    realized: Dict[str, float] = field(default_factory=dict)
+
+    def position(self, symbol: str, owner: str = "") -> Position:
+        """``owner``'s ledger entry for ``symbol``, created empty on first use."""
+        book = self.positions.get(symbol)
+        if book is None:
+            book = self.positions[symbol] = {}
+            self.exposures[symbol] = Exposure()
+        pos = book.get(owner)
+        if pos is None:
+            pos = book[owner] = Position(symbol=symbol)
+            pos.exposure = self.exposures[symbol]
+            pos.exposure.positions.append(pos)
+        return pos
+
+    def net(self, symbol: str) -> Tuple[float, float]:
+        """Net size and signed cost of ``symbol`` across owners."""
+        exposure = self.exposures.get(symbol)
+        return (exposure.net_size, exposure.cost) if exposure is not None else (0.0, 0.0)
 
-    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str) -> Fill:
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
         if price is None:
             raise ValueError("PaperBroker requires a price for fills (provide tick price).")
 
-        pos = self.positions.get(symbol)
-        if pos is None:
-            pos = Position(symbol=symbol)
-            self.positions[symbol] = pos
-
-        pos.legs.append(Leg(side=side, size=size, entry_price=price, entry_ts=ts))
+        self.position(symbol, owner).add(side, size, price, ts)
         return Fill(symbol=symbol, side=side, size=size, price=price, ts=ts)
 
-    def close_position(self, symbol: str, ts: str, price: float) -> float:
-        pos = self.positions.get(symbol)
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        pos = self.positions.get(symbol, {}).get(owner)
         if not pos or not pos.legs:
             return 0.0
 
         realized = pos.unrealized_pnl(price)
-        pos.legs.clear()
+        pos.clear()
+        self.realized[owner] = self.realized.get(owner, 0.0) + realized
         return realized
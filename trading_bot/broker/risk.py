@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from trading_bot.broker.base import Allocation, Broker, Fill, OrderRejected
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Position, Side
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """Pre-trade limits enforced by ``RiskGate``; ``None`` disables a check.
+
+    Position limits are in units and bound the size an order would leave:
+    ``max_position`` one owner's position in a symbol, ``max_symbol_position``
+    a symbol netted across owners. ``max_gross_notional`` bounds the sum over
+    symbols of ``|net size| * last price``. Once realized plus unrealized PnL
+    falls to ``-max_loss`` the gate halts until ``resume``. Only orders that
+    grow the exposure a limit measures are checked against it, so unwinding
+    is always allowed.
+
+    Order rates are token buckets refilled in tick time: ``orders_per_sec``
+    for each owner and ``total_orders_per_sec`` across owners, both allowing
+    bursts of up to ``burst`` orders.
+    """
+
+    max_position: Optional[float] = None
+    max_symbol_position: Optional[float] = None
+    max_gross_notional: Optional[float] = None
+    max_loss: Optional[float] = None
+    orders_per_sec: Optional[float] = None
+    total_orders_per_sec: Optional[float] = None
+    burst: float = 10.0
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    rate: float
+    burst: float
+    tokens: float
+    last: float
+
+    def refill(self, now: float) -> float:
+        """Tokens available at ``now``; time going backwards adds none."""
+        if now > self.last:
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+        return self.tokens
+
+
+@dataclass(slots=True)
+class RiskStats:
+    orders: int = 0
+    # Rejections by reason: position, symbol, gross, loss, rate, total_rate.
+    rejected: Dict[str, int] = field(default_factory=dict)
+
+
+class RiskGate(Broker):
+    """Checks every order against ``limits`` before passing it to ``broker``.
+
+    The gate shares ``broker``'s ledger (``positions``, ``exposures`` and
+    ``realized`` are the same objects), so it can be handed to an engine in
+    its place. Closes always go through. A refused order raises
+    ``OrderRejected`` and books nothing.
+
+    Every check is O(1): position sizes come from the ledger's running
+    totals, and gross notional and PnL are kept as totals updated by the
+    change in one symbol's mark on each tick, fill and close, so an order
+    costs the same however many symbols and owners are open. Marks, and with
+    them ``unrealized`` and ``gross_notional``, are only kept when
+    ``max_loss`` or ``max_gross_notional`` is set.
+    """
+
+    def __init__(self, broker: Optional[PaperBroker] = None, limits: RiskLimits = RiskLimits()):
+        self.broker = broker if broker is not None else PaperBroker()
+        self.limits = limits
+        self.stats = RiskStats()
+        self.positions = self.broker.positions
+        self.exposures = self.broker.exposures
+        self.realized = self.broker.realized
+        self.halted = False
+        # Realized PnL across owners, and per-symbol marks folded into running totals.
+        self.realized_total = 0.0
+        self._marked = limits.max_loss is not None or limits.max_gross_notional is not None
+        self.unrealized = 0.0
+        self.gross_notional = 0.0
+        self._marks: Dict[str, Tuple[float, float, float]] = {}
+        # Tick time in epoch seconds, tracked only when rates are limited.
+        self._rated = limits.orders_per_sec is not None or limits.total_orders_per_sec is not None
+        self._now = 0.0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._total_bucket: Optional[TokenBucket] = None
+        self._forward_tick = type(self.broker).on_price is not Broker.on_price
+
+    @property
+    def pnl(self) -> float:
+        return self.realized_total + self.unrealized
+
+    def resume(self):
+        """Lift a max-loss halt."""
+        self.halted = False
+
+    def position(self, symbol: str, owner: str = "") -> Position:
+        return self.broker.position(symbol, owner)
+
+    def net(self, symbol: str) -> Tuple[float, float]:
+        return self.broker.net(symbol)
+
+    def on_price(self, tick: PriceTick) -> Optional[List[Fill]]:
+        if self._rated:
+            self._now = tick.timestamp.timestamp()
+        if self._marked:
+            self._mark(tick.symbol, tick.price)
+        if self._forward_tick:
+            return self.broker.on_price(tick)
+        return None
+
+    def _mark(self, symbol: str, price: float):
+        """Re-mark ``symbol`` at ``price`` and move the totals by its change."""
+        exposure = self.exposures.get(symbol)
+        if exposure is None:
+            return
+        net = exposure.net_size
+        gross = abs(net) * price
+        unrealized = price * net - exposure.cost
+        old = self._marks.get(symbol)
+        if old is not None:
+            self.gross_notional += gross - old[1]
+            self.unrealized += unrealized - old[2]
+        else:
+            self.gross_notional += gross
+            self.unrealized += unrealized
+        self._marks[symbol] = (price, gross, unrealized)
+
+    def _reject(self, reason: str, message: str):
+        rejected = self.stats.rejected
+        rejected[reason] = rejected.get(reason, 0) + 1
+        raise OrderRejected(reason, message)
+
+    def _bucket(self, owner: str, rate: float, now: float) -> TokenBucket:
+        bucket = self._buckets.get(owner)
+        if bucket is None:
+            bucket = self._buckets[owner] = TokenBucket(rate, self.limits.burst, self.limits.burst, now)
+        return bucket
+
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        limits = self.limits
+        self.stats.orders += 1
+        mark = self._marks.get(symbol)
+        if price is not None:
+            mark_price = price
+        else:
+            mark_price = mark[0] if mark is not None else 0.0
+        signed = size if side == Side.BUY else -size
+
+        pos = self.broker.position(symbol, owner)
+        held = abs(pos.net_size)
+        after = abs(pos.net_size + signed)
+        if after > held:
+            if limits.max_position is not None and after > limits.max_position:
+                self._reject("position", f"{owner or 'order'} would hold {after:g} {symbol}, limit {limits.max_position:g}.")
+            if limits.max_loss is not None and (self.halted or self.pnl <= -limits.max_loss):
+                self.halted = True
+                self._reject("loss", f"Halted: PnL {self.pnl:.2f} reached the loss limit {limits.max_loss:g}.")
+        net = pos.exposure.net_size
+        symbol_after = abs(net + signed)
+        if symbol_after > abs(net):
+            if limits.max_symbol_position is not None and symbol_after > limits.max_symbol_position:
+                self._reject("symbol", f"Net {symbol} would be {symbol_after:g}, limit {limits.max_symbol_position:g}.")
+            if limits.max_gross_notional is not None:
+                gross = self.gross_notional - (mark[1] if mark is not None else 0.0) + symbol_after * mark_price
+                if gross > limits.max_gross_notional:
+                    self._reject("gross", f"Gross notional would be {gross:.2f}, limit {limits.max_gross_notional:g}.")
+
+        owner_bucket = total_bucket = None
+        if self._rated:
+            now = self._now
+            if limits.orders_per_sec is not None:
+                owner_bucket = self._bucket(owner, limits.orders_per_sec, now)
+                if owner_bucket.refill(now) < 1.0:
+                    self._reject("rate", f"{owner or 'order'} exceeded {limits.orders_per_sec:g} orders/s.")
+            if limits.total_orders_per_sec is not None:
+                total_bucket = self._total_bucket
+                if total_bucket is None:
+                    total_bucket = self._total_bucket = TokenBucket(
+                        limits.total_orders_per_sec, limits.burst, limits.burst, now
+                    )
+                if total_bucket.refill(now) < 1.0:
+                    self._reject("total_rate", f"Orders exceeded {limits.total_orders_per_sec:g}/s across owners.")
+
+        fill = self.broker.place_order(symbol, side, size, price, ts, owner)
+        # Spend tokens only for orders that went through.
+        if owner_bucket is not None:
+            owner_bucket.tokens -= 1.0
+        if total_bucket is not None:
+            total_bucket.tokens -= 1.0
+        if self._marked:
+            self._mark(symbol, mark_price)
+        return fill
+
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        realized = self.broker.close_position(symbol, ts, price, owner)
+        self.realized_total += realized
+        if self._marked:
+            self._mark(symbol, price)
+        return realized
+
+    def flush(self) -> List[Allocation]:
+        allocations = self.broker.flush()
+        for allocation in allocations:
+            self.realized_total += allocation.correction
+            mark = self._marks.get(allocation.symbol)
+            if mark is not None:
+                self._mark(allocation.symbol, mark[0])
+        return allocations
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Dict, Optional
+
+from trading_bot.broker.async_base import AsyncBroker
+from trading_bot.broker.base import Fill
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import Side
+
+
+class SimulatedAsyncBroker(AsyncBroker):
+    """Offline ``AsyncBroker`` with configurable round-trip latency.
+
+    Each request sleeps ``latency`` seconds (plus up to ``jitter``, seeded) and
+    then fills at the last price seen for the symbol, so fills drift from the
+    requested price the way they would against a live venue.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.ledger = PaperBroker()
+        self._rng = random.Random(seed)
+        self._last: Dict[str, float] = {}
+
+    def on_price(self, tick: PriceTick):
+        self._last[tick.symbol] = tick.price
+
+    async def _round_trip(self):
+        delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        await asyncio.sleep(delay)
+
+    async def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        await self._round_trip()
+        return self.ledger.place_order(symbol, side, size, self._last.get(symbol, price), ts, owner)
+
+    async def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        await self._round_trip()
+        return self.ledger.close_position(symbol, ts, self._last.get(symbol, price), owner)
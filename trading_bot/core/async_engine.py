@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from trading_bot.broker.async_base import AsyncBroker
+from trading_bot.broker.base import Fill
+from trading_bot.broker.paper import PaperBroker
+from trading_bot.config import BotConfig
+from trading_bot.core.checkpoint import Checkpointer
+from trading_bot.core.engine import EngineResult, TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import CycleStats, Leg, Side
+from trading_bot.core.sinks import CycleSink, CycleSummary, MemorySink
+
+
+@dataclass
+class _Request:
+    symbol: str
+    ts: str
+    price: float
+    received: float
+    owner: str = ""
+    # Set for orders: the optimistic leg booked in the gateway ledger.
+    side: Optional[Side] = None
+    size: float = 0.0
+    leg: Optional[Leg] = None
+    # Set for closes: the realized PnL the engine already booked, and the cycle it went to.
+    booked: float = 0.0
+    cycle: Optional[CycleStats] = None
+
+
+class OrderGateway(PaperBroker):
+    """Synchronous ``Broker`` handed to strategies by ``AsyncEngineRunner``.
+
+    Orders are booked optimistically at the requested price so strategies keep
+    running, and queued for the async broker instead of blocking the tick.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.outbox: List[_Request] = []
+        self.tick_received = 0.0
+
+    def place_order(self, symbol: str, side: Side, size: float, price: Optional[float], ts: str, owner: str = "") -> Fill:
+        fill = super().place_order(symbol, side, size, price, ts, owner)
+        leg = self.positions[symbol][owner].legs[-1]
+        self.outbox.append(_Request(symbol, ts, fill.price, self.tick_received, owner, side=side, size=size, leg=leg))
+        return fill
+
+    def close_position(self, symbol: str, ts: str, price: float, owner: str = "") -> float:
+        realized = super().close_position(symbol, ts, price, owner)
+        self.outbox.append(_Request(symbol, ts, price, self.tick_received, owner, booked=realized))
+        return realized
+
+
+class _ReconcilingSink(CycleSink):
+    """Holds closed cycles back from ``sink`` until the broker has answered their closes.
+
+    Cycles are held on ``append`` and passed on by ``release`` in close order,
+    so one waiting on a slow close also holds back the cycles after it.
+    """
+
+    def __init__(self, sink: CycleSink):
+        self.sink = sink
+        self.held: Deque[CycleStats] = deque()
+        # Closes in flight per held or open cycle, keyed by ``id``.
+        self.pending: Dict[int, int] = {}
+        self.closed = 0
+        self.last: Optional[CycleStats] = None
+
+    @property
+    def summary(self) -> CycleSummary:
+        return self.sink.summary
+
+    def append(self, cycle: CycleStats):
+        self.closed += 1
+        self.last = cycle
+        self.held.append(cycle)
+
+    def _write(self, cycle: CycleStats):
+        self.sink.append(cycle)
+
+    def expect(self, cycle: CycleStats):
+        self.pending[id(cycle)] = self.pending.get(id(cycle), 0) + 1
+
+    def answered(self, cycle: CycleStats):
+        key = id(cycle)
+        left = self.pending[key] - 1
+        if left:
+            self.pending[key] = left
+        else:
+            del self.pending[key]
+            self.release()
+
+    def release(self):
+        held = self.held
+        while held and id(held[0]) not in self.pending:
+            self._write(held.popleft())
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.close()
+
+    def cycles(self) -> Iterator[CycleStats]:
+        return self.sink.cycles()
+
+
+@dataclass
+class LatencyLog:
+    """Seconds from tick receipt to the broker call starting, and to the fill returning."""
+
+    tick_to_order: List[float] = field(default_factory=list)
+    tick_to_fill: List[float] = field(default_factory=list)
+
+
+class AsyncEngineRunner:
+    """Drive a ``TradingEngine`` from an async tick source against an ``AsyncBroker``.
+
+    Requests are sent by one worker task per symbol, so each symbol's orders reach
+    the broker in the order strategies issued them while the tick loop never
+    waits on a round-trip. When a fill comes back, the optimistic legs are
+    repriced to the actual fill if still open. When a close comes back, the gap
+    between the broker's realized PnL and the booked amount goes to the owning
+    strategy if its cycle is still open. Otherwise it goes to the closed cycle's
+    record and into equity, and the cycles opened since are shifted by it. Closed
+    cycles reach ``sink`` only once their closes are reconciled.
+    """
+
+    def __init__(
+        self, cfg: BotConfig, broker: AsyncBroker, starting_equity: float = 100_000.0, sink: Optional[CycleSink] = None
+    ):
+        self.broker = broker
+        self.gateway = OrderGateway()
+        target = sink if sink is not None else MemorySink()
+        self.sink = _ReconcilingSink(target)
+        self.engine = TradingEngine(cfg, starting_equity=starting_equity, broker=self.gateway, sink=self.sink)
+        self.latency = LatencyLog()
+        self.reconciled_pnl = 0.0
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        # First exception raised by a broker call since the last drain.
+        self._error: Optional[BaseException] = None
+
+    async def run(self, ticks: AsyncIterable[PriceTick], checkpoint: Optional[Checkpointer] = None) -> EngineResult:
+        """Consume ``ticks`` until exhausted.
+
+        With ``checkpoint`` set, in-flight requests are drained before each
+        snapshot so the saved positions match what the broker has filled.
+        """
+        engine = self.engine
+        try:
+            async for tick in ticks:
+                self.on_tick(tick)
+                engine.ticks_processed += 1
+                if checkpoint is not None and checkpoint.due(engine):
+                    await self.drain()
+                    checkpoint.save(engine)
+                if not engine.cfg.shared.continue_trading and self.sink.closed:
+                    break
+            await self.drain()
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            self._workers.clear()
+            self._queues.clear()
+        return replace(self.engine.result(), cycles=self.cycles)
+
+    @property
+    def cycles(self) -> List[CycleStats]:
+        """Reconciled cycles kept in memory; empty when ``sink`` streams them elsewhere."""
+        target = self.sink.sink
+        return target.records if isinstance(target, MemorySink) else []
+
+    def on_tick(self, tick: PriceTick):
+        self.gateway.tick_received = time.perf_counter()
+        self.broker.on_price(tick)
+        engine = self.engine
+        engine.on_tick(tick)
+        if self.gateway.outbox:
+            # Closes belong to the cycle open on this tick, which may have just closed.
+            cycle = engine._active_cycle if engine._active_cycle is not None else self.sink.last
+            for request in self.gateway.outbox:
+                if request.side is None and cycle is not None:
+                    request.cycle = cycle
+                    self.sink.expect(cycle)
+                self._queue(request.symbol).put_nowait(request)
+            self.gateway.outbox.clear()
+        self.sink.release()
+
+    async def drain(self):
+        """Wait until every queued request has been answered and reconciled.
+
+        Re-raises the first exception a broker call raised since the last drain.
+        """
+        for queue in list(self._queues.values()):
+            await queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _queue(self, symbol: str) -> asyncio.Queue:
+        queue = self._queues.get(symbol)
+        if queue is None:
+            queue = self._queues[symbol] = asyncio.Queue()
+            self._workers.append(asyncio.create_task(self._worker(queue)))
+        return queue
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            request = await queue.get()
+            try:
+                self.latency.tick_to_order.append(time.perf_counter() - request.received)
+                if request.side is not None:
+                    fill = await self.broker.place_order(
+                        request.symbol, request.side, request.size, request.price, request.ts, request.owner
+                    )
+                    self._reconcile_fill(request, fill)
+                else:
+                    realized = await self.broker.close_position(request.symbol, request.ts, request.price, request.owner)
+                    self._reconcile_close(request, realized)
+                self.latency.tick_to_fill.append(time.perf_counter() - request.received)
+            except Exception as exc:
+                # Keep serving the queue so drain() returns; it re-raises the error.
+                if self._error is None:
+                    self._error = exc
+            finally:
+                if request.cycle is not None:
+                    self.sink.answered(request.cycle)
+                queue.task_done()
+
+    def _reconcile_fill(self, request: _Request, fill: Fill):
+        if fill.price == request.price:
+            return
+        # The gateway ledger entry is the owning strategy's own position.
+        shadow = self.gateway.positions.get(request.symbol, {}).get(request.owner)
+        if shadow is None or not any(leg is request.leg for leg in shadow.legs):
+            # Already closed; the close's reconciliation absorbs the difference.
+            return
+        shadow.reprice(request.leg, fill.price)
+        strategy = self.engine.strategies.get(request.owner)
+        if strategy is not None:
+            # The ladder was compiled off the optimistic average.
+            strategy._compile()
+            self.engine.triggers.invalidate()
+
+    def _reconcile_close(self, request: _Request, realized: float):
+        correction = realized - request.booked
+        self.reconciled_pnl += correction
+        if not correction:
+            return
+        engine = self.engine
+        cycle = request.cycle
+        strategy = engine.strategies.get(request.owner)
+        if cycle is not None and cycle is engine._active_cycle and strategy is not None and strategy.state.active:
+            # A close inside a still-open cycle: booked with the strategy's realized PnL when it ends.
+            strategy.state.realized_pnl += correction
+            return
+        engine.equity += correction
+        if cycle is None:
+            return
+        cycle.realized_pnl += correction
+        cycle.end_equity += correction
+        # Cycles opened since started from the unreconciled equity.
+        later = [c for c in self.sink.held if c.cycle_id > cycle.cycle_id]
+        if engine._active_cycle is not None and engine._active_cycle is not cycle:
+            later.append(engine._active_cycle)
+        for c in later:
+            c.start_equity += correction
+            c.end_equity += correction
+            c.peak_equity += correction
+            c.trough_equity += correction
+
+
+async def iter_ticks_async(ticks: Iterable[PriceTick], interval: float = 0.0) -> AsyncIterable[PriceTick]:
+    """Replay a tick iterable as an async source, sleeping ``interval`` seconds between ticks."""
+    for tick in ticks:
+        yield tick
+        await asyncio.sleep(interval)
@@ -0,0 +1,606 @@
+"""Many configs in one pass over the ticks, with strategy state in parallel arrays.
+
+Each enabled strategy type gets one lane per config. A lane holds what the
+strategy object and its ``StrategyState`` would (leg, ladder levels, position
+totals, trailing stop) as one slot in a NumPy array. Every lane also keeps the
+quiet band the strategy reports, so a tick costs one vectorized band test per
+strategy type. Only lanes whose band it leaves are stepped, with masked updates
+that follow the strategies' own code paths, and the results match a
+``TradingEngine`` per config.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_bot.config import BotConfig, MartingaleConfig, StrategyMode, SubMode, ZoneConfig
+from trading_bot.core.engine import EngineResult
+from trading_bot.core.models import CycleStats, Side
+from trading_bot.core.sinks import CycleSink, MemorySink
+from trading_bot.core.utils import pct
+
+_KINDS = ("CDM", "WDM", "ZRM", "IZRM")
+_INF = np.inf
+
+
+def _ladder(rows: List[List[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad ragged per-leg values into a matrix; also return each row's last index."""
+    width = max(1, max(len(r) for r in rows))
+    out = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        out[i, : len(row)] = row
+    return out, np.array([max(0, len(r) - 1) for r in rows], dtype=np.int64)
+
+
+def _outside(price: float, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized ``band_outside``; a ``None`` band is ``(inf, -inf)``."""
+    empty = lo > hi
+    below = price < lo
+    above = price > hi
+    band_lo = np.where(empty | below, -_INF, np.where(above, hi, _INF))
+    band_hi = np.where(empty | above, _INF, np.where(below, lo, -_INF))
+    return band_lo, band_hi
+
+
+class _Lanes(ABC):
+    """One strategy type across configs; lane ``i`` trades for config ``owner[i]``."""
+
+    # Zone strategies size an added leg from the leg count before a non-hold close.
+    prior_leg_size = False
+
+    def __init__(self, cfgs: List[MartingaleConfig], owner: np.ndarray):
+        n = len(cfgs)
+        self.owner = owner
+        self.buy = np.array([c.initial_side == Side.BUY for c in cfgs], dtype=bool)
+        self.trigger = np.array([np.nan if c.price_trigger is None else c.price_trigger for c in cfgs])
+        self.limit = np.array(
+            [min(c.max_orders, len(c.order_distances_pct), len(c.order_sizes)) for c in cfgs], dtype=np.int64
+        )
+        self.hold = np.array([c.hold_previous for c in cfgs], dtype=bool)
+        self.sizes, _ = _ladder([list(c.order_sizes) for c in cfgs])
+        self.distances, self.distance_last = _ladder([[pct(v) for v in c.order_distances_pct] for c in cfgs])
+        self.tps, self.tp_last = _ladder([[pct(v) for v in c.order_tps_pct] for c in cfgs])
+        self.sls, self.sl_last = _ladder([[pct(v) for v in c.order_sls_pct] for c in cfgs])
+        self.trail_on = np.array([c.trailing_enabled for c in cfgs], dtype=bool)
+        self.first_move = np.array([pct(c.trailing_first_move_pct) for c in cfgs])
+        self.step_pct = np.array([pct(c.trailing_step_pct) for c in cfgs])
+
+        self.active = np.zeros(n, dtype=bool)
+        self.leg = np.zeros(n, dtype=np.int64)
+        self.can_add = np.zeros(n, dtype=bool)
+        self.next_add = np.full(n, np.nan)
+        self.tp = np.full(n, np.nan)
+        self.sl = np.full(n, np.nan)
+        self.realized = np.zeros(n)
+        # Position running totals, as on ``Position``.
+        self.net = np.zeros(n)
+        self.cost = np.zeros(n)
+        self.abs_size = np.zeros(n)
+        self.notional = np.zeros(n)
+        # Trailing stop; NaN stands for ``None``.
+        self.t_long = np.ones(n, dtype=bool)
+        self.t_next = np.full(n, np.nan)
+        self.t_stop = np.full(n, np.nan)
+        # Quiet band per lane; starts empty so the first tick is dispatched.
+        self.lo = np.full(n, _INF)
+        self.hi = np.full(n, -_INF)
+
+    def dispatch(self, price: float) -> np.ndarray:
+        """Lanes whose quiet band ``price`` leaves."""
+        return np.flatnonzero(~((self.lo < price) & (price < self.hi)))
+
+    def freeze(self, lanes: np.ndarray):
+        """Never dispatch ``lanes`` again."""
+        self.lo[lanes] = -_INF
+        self.hi[lanes] = _INF
+
+    def step(self, idx: np.ndarray, price: float) -> Tuple[np.ndarray, np.ndarray]:
+        """``on_price`` for lanes ``idx``; return the owners of closed lanes and their realized PnL."""
+        active = self.active[idx]
+        new = idx[~active]
+        if new.size:
+            self._enter(new[self._should_enter(new, price)], price)
+
+        closed = np.empty(0, dtype=np.int64)
+        realized = np.empty(0)
+        live = idx[active]
+        if live.size:
+            self._maybe_add_leg(live, price)
+            exits = self._maybe_exit(live, price)
+            rest = live[~exits]
+            closed = np.concatenate((live[exits], rest[self._trailing_hit(rest, price)]))
+            if closed.size:
+                realized = self._close(closed, price)
+        self._rebuild(idx, price)
+        return self.owner[closed], realized
+
+    # Position bookkeeping, mirroring ``Position.add``/``clear``.
+
+    def _fill(self, j: np.ndarray, buy: np.ndarray, size: np.ndarray, price: float):
+        signed = np.where(buy, size, -size)
+        self.net[j] += signed
+        self.cost[j] += signed * price
+        magnitude = np.abs(size)
+        self.abs_size[j] += magnitude
+        self.notional[j] += magnitude * price
+
+    def _flatten(self, j: np.ndarray, price: float) -> np.ndarray:
+        realized = price * self.net[j] - self.cost[j]
+        self.net[j] = 0.0
+        self.cost[j] = 0.0
+        self.abs_size[j] = 0.0
+        self.notional[j] = 0.0
+        return realized
+
+    def _avg(self, j: np.ndarray) -> np.ndarray:
+        size = self.abs_size[j]
+        return np.divide(self.notional[j], size, out=np.zeros(len(j)), where=size != 0)
+
+    def _level(self, values: np.ndarray, last: np.ndarray, j: np.ndarray) -> np.ndarray:
+        return values[j, np.minimum(np.maximum(self.leg[j] - 1, 0), last[j])]
+
+    def _distance(self, j: np.ndarray) -> np.ndarray:
+        return self.distances[j, np.minimum(self.leg[j], self.distance_last[j])]
+
+    # Strategy flow.
+
+    def _enter(self, j: np.ndarray, price: float):
+        if not j.size:
+            return
+        self._fill(j, self._entry_side(j, price), self.sizes[j, 0], price)
+        self.active[j] = True
+        self.leg[j] = 1
+        self._compile(j)
+
+    def _entry_side(self, j: np.ndarray, price: float) -> np.ndarray:
+        return self.buy[j]
+
+    def _add_side(self, j: np.ndarray) -> np.ndarray:
+        return self.buy[j]
+
+    def _maybe_add_leg(self, live: np.ndarray, price: float):
+        j = live[self.can_add[live] & self._add_hit(live, price)]
+        if not j.size:
+            return
+        prior = self.leg[j]
+        flat = j[~self.hold[j]]
+        if flat.size:
+            self.realized[flat] += self._flatten(flat, price)
+            self.leg[flat] = 0
+        size = self.sizes[j, prior if self.prior_leg_size else self.leg[j]]
+        self._fill(j, self._add_side(j), size, price)
+        self.leg[j] += 1
+        self._compile(j)
+
+    def _close(self, j: np.ndarray, price: float) -> np.ndarray:
+        total = self._flatten(j, price) + self.realized[j]
+        self.active[j] = False
+        self.leg[j] = 0
+        self.can_add[j] = False
+        self.next_add[j] = np.nan
+        self.tp[j] = np.nan
+        self.sl[j] = np.nan
+        self.realized[j] = 0.0
+        self.t_next[j] = np.nan
+        self.t_stop[j] = np.nan
+        return total
+
+    def _compile_can_add(self, j: np.ndarray) -> np.ndarray:
+        can = self.leg[j] < self.limit[j]
+        self.can_add[j] = can
+        return can
+
+    def _arm_trailing(self, j: np.ndarray, long: np.ndarray):
+        arm = self.trail_on[j] & np.isnan(self.t_stop[j])
+        k = j[arm]
+        if not k.size:
+            return
+        long = long[arm]
+        avg = self._avg(k)
+        move = self.first_move[k]
+        self.t_long[k] = long
+        self.t_next[k] = np.where(long, avg * (1 + move), avg * (1 - move))
+
+    def _trailing_hit(self, j: np.ndarray, price: float) -> np.ndarray:
+        hit = np.zeros(len(j), dtype=bool)
+        armed = np.flatnonzero(~np.isnan(self.t_next[j]))
+        if not armed.size:
+            return hit
+        k = j[armed]
+        long = self.t_long[k]
+        ratchet = np.where(long, price >= self.t_next[k], price <= self.t_next[k])
+        stop = self.t_stop[k]
+        hit[armed] = ~ratchet & np.where(long, price <= stop, price >= stop)
+        r = k[ratchet]
+        if r.size:
+            step = self.step_pct[r]
+            up = long[ratchet]
+            self.t_stop[r] = np.where(up, price * (1 - step), price * (1 + step))
+            self.t_next[r] = np.where(up, price * (1 + step), price * (1 - step))
+        return hit
+
+    def _rebuild(self, j: np.ndarray, price: float):
+        """Recompute quiet bands, then narrow them for the trailing stop as ``_trailing_band`` does."""
+        lo, hi = self._ladder_band(j, price)
+        long = self.t_long[j]
+        nxt = self.t_next[j]
+        stop = self.t_stop[j]
+        # fmax/fmin skip the NaN of an unarmed stop.
+        self.lo[j] = np.where(long, np.fmax(lo, stop), np.fmax(lo, nxt))
+        self.hi[j] = np.where(long, np.fmin(hi, nxt), np.fmin(hi, stop))
+
+    @abstractmethod
+    def _should_enter(self, j: np.ndarray, price: float) -> np.ndarray:
+        """Which inactive lanes ``j`` open a cycle at ``price``."""
+
+    @abstractmethod
+    def _compile(self, j: np.ndarray):
+        """Recompute ladder levels for lanes ``j`` after a fill, as the strategy's ``_compile``."""
+
+    @abstractmethod
+    def _add_hit(self, j: np.ndarray, price: float) -> np.ndarray:
+        """Which lanes ``j`` reach their next-leg level at ``price``."""
+
+    @abstractmethod
+    def _maybe_exit(self, j: np.ndarray, price: float) -> np.ndarray:
+        """Which live lanes ``j`` close their cycle at ``price``, before trailing."""
+
+    @abstractmethod
+    def _ladder_band(self, j: np.ndarray, price: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Quiet bands of lanes ``j`` before the trailing stop narrows them."""
+
+
+class _CDMLanes(_Lanes):
+    def _should_enter(self, j, price):
+        trigger = self.trigger[j]
+        return np.isnan(trigger) | np.where(self.buy[j], price <= trigger, price >= trigger)
+
+    def _compile(self, j):
+        avg = self._avg(j)
+        buy = self.buy[j]
+        take_profit = self._level(self.tps, self.tp_last, j)
+        self.tp[j] = np.where(buy, avg * (1 + take_profit), avg * (1 - take_profit))
+        can = self._compile_can_add(j)
+        distance = self._distance(j)
+        self.next_add[j] = np.where(can, np.where(buy, avg * (1 - distance), avg * (1 + distance)), np.nan)
+        self._arm_trailing(j, buy)
+
+    def _add_hit(self, j, price):
+        next_add = self.next_add[j]
+        return np.where(self.buy[j], price <= next_add, price >= next_add)
+
+    def _maybe_exit(self, j, price):
+        tp = self.tp[j]
+        return np.where(self.buy[j], price >= tp, price <= tp)
+
+    def _ladder_band(self, j, price):
+        buy = self.buy[j]
+        trigger = self.trigger[j]
+        no_trigger = np.isnan(trigger)
+        lo = np.where(no_trigger, _INF, np.where(buy, trigger, -_INF))
+        hi = np.where(no_trigger, -_INF, np.where(buy, _INF, trigger))
+        active = self.active[j]
+        can = self.can_add[j]
+        tp = self.tp[j]
+        next_add = self.next_add[j]
+        lo = np.where(active, np.where(buy, np.where(can, next_add, -_INF), tp), lo)
+        hi = np.where(active, np.where(buy, tp, np.where(can, next_add, _INF)), hi)
+        return lo, hi
+
+
+class _WDMLanes(_Lanes):
+    def __init__(self, cfgs, owner):
+        super().__init__(cfgs, owner)
+        # Running peak for long ladders, trough for short ones.
+        self.extreme = np.full(len(cfgs), np.nan)
+        self.stop_factor = np.ones(len(cfgs))
+
+    def _should_enter(self, j, price):
+        trigger = self.trigger[j]
+        return np.isnan(trigger) | np.where(self.buy[j], price >= trigger, price <= trigger)
+
+    def _enter(self, j, price):
+        self.extreme[j] = price
+        super()._enter(j, price)
+
+    def _compile(self, j):
+        buy = self.buy[j]
+        stop_loss = self._level(self.sls, self.sl_last, j)
+        factor = np.where(buy, 1 - stop_loss, 1 + stop_loss)
+        self.stop_factor[j] = factor
+        self.sl[j] = self.extreme[j] * factor
+        can = self._compile_can_add(j)
+        avg = self._avg(j)
+        distance = self._distance(j)
+        self.next_add[j] = np.where(can, np.where(buy, avg * (1 + distance), avg * (1 - distance)), np.nan)
+        self._arm_trailing(j, buy)
+
+    def _add_hit(self, j, price):
+        next_add = self.next_add[j]
+        return np.where(self.buy[j], price >= next_add, price <= next_add)
+
+    def _maybe_exit(self, j, price):
+        buy = self.buy[j]
+        extreme = self.extreme[j]
+        k = j[np.where(buy, price > extreme, price < extreme)]
+        if k.size:
+            self.extreme[k] = price
+            self.sl[k] = price * self.stop_factor[k]
+        sl = self.sl[j]
+        return np.where(buy, price <= sl, price >= sl)
+
+    def _ladder_band(self, j, price):
+        buy = self.buy[j]
+        trigger = self.trigger[j]
+        no_trigger = np.isnan(trigger)
+        lo = np.where(no_trigger, _INF, np.where(buy, -_INF, trigger))
+        hi = np.where(no_trigger, -_INF, np.where(buy, trigger, _INF))
+        active = self.active[j]
+        can = self.can_add[j]
+        extreme = self.extreme[j]
+        next_add = self.next_add[j]
+        sl = self.sl[j]
+        lo = np.where(active, np.where(buy, sl, np.where(can, np.maximum(extreme, next_add), extreme)), lo)
+        hi = np.where(active, np.where(buy, np.where(can, np.minimum(extreme, next_add), extreme), sl), hi)
+        return lo, hi
+
+
+class _ZoneLanes(_Lanes):
+    prior_leg_size = True
+
+    def __init__(self, cfgs: List[ZoneConfig], owner):
+        super().__init__(cfgs, owner)
+        widths = [pct(c.zone_width_pct) for c in cfgs]
+        self.lower = np.array([c.zone_center_price * (1 - w) for c, w in zip(cfgs, widths)])
+        self.upper = np.array([c.zone_center_price * (1 + w) for c, w in zip(cfgs, widths)])
+
+    def _add_hit(self, j, price):
+        return ~((self.lower[j] < price) & (price < self.upper[j]))
+
+    def _inside(self, j, price):
+        return (self.lower[j] <= price) & (price <= self.upper[j])
+
+
+class _ZRMLanes(_ZoneLanes):
+    def _should_enter(self, j, price):
+        return self._inside(j, price)
+
+    def _compile(self, j):
+        avg = self._avg(j)
+        buy = self.buy[j]
+        take_profit = self._level(self.tps, self.tp_last, j)
+        self.tp[j] = np.where(buy, avg * (1 + take_profit), avg * (1 - take_profit))
+        self._compile_can_add(j)
+        self._arm_trailing(j, buy)
+
+    def _maybe_exit(self, j, price):
+        tp = self.tp[j]
+        return self._inside(j, price) & np.where(self.buy[j], price >= tp, price <= tp)
+
+    def _ladder_band(self, j, price):
+        lower, upper = self.lower[j], self.upper[j]
+        buy = self.buy[j]
+        tp = self.tp[j]
+        lo, hi = _outside(price, lower, upper)
+
+        # Touching either edge adds a leg; inside, only the take-profit acts.
+        strictly = (lower < price) & (price < upper)
+        add_lo = np.where(strictly, np.where(buy, lower, np.maximum(lower, tp)), _INF)
+        add_hi = np.where(strictly, np.where(buy, np.minimum(upper, tp), upper), -_INF)
+        full_lo, full_hi = _outside(
+            price, np.where(buy, np.maximum(lower, tp), lower), np.where(buy, upper, np.minimum(upper, tp))
+        )
+
+        active = self.active[j]
+        can = self.can_add[j]
+        lo = np.where(active, np.where(can, add_lo, full_lo), lo)
+        hi = np.where(active, np.where(can, add_hi, full_hi), hi)
+        return lo, hi
+
+
+class _IZRMLanes(_ZoneLanes):
+    def __init__(self, cfgs, owner):
+        super().__init__(cfgs, owner)
+        # Side of the held legs (``Position.direction``).
+        self.long = np.ones(len(cfgs), dtype=bool)
+
+    def _should_enter(self, j, price):
+        return (price > self.upper[j]) | (price < self.lower[j])
+
+    def _entry_side(self, j, price):
+        # Breaking out below the zone buys, above it sells.
+        return price < self.lower[j]
+
+    def _add_side(self, j):
+        # Without hold_previous the ledger is flat when the leg is added, and an
+        # empty position reports BUY.
+        return self.long[j] | ~self.hold[j]
+
+    def _fill(self, j, buy, size, price):
+        super()._fill(j, buy, size, price)
+        self.long[j] = buy
+
+    def _compile(self, j):
+        avg = self._avg(j)
+        long = self.long[j]
+        stop_loss = self._level(self.sls, self.sl_last, j)
+        self.sl[j] = np.where(long, avg * (1 - stop_loss), avg * (1 + stop_loss))
+        self._compile_can_add(j)
+        self._arm_trailing(j, long)
+
+    def _maybe_exit(self, j, price):
+        sl = self.sl[j]
+        return self._inside(j, price) & np.where(self.long[j], price <= sl, price >= sl)
+
+    def _ladder_band(self, j, price):
+        lower, upper = self.lower[j], self.upper[j]
+        long = self.long[j]
+        sl = self.sl[j]
+
+        # Touching either edge adds a leg; inside, only the stop acts.
+        add_lo = np.where(long, np.maximum(lower, sl), lower)
+        add_hi = np.where(long, upper, np.minimum(upper, sl))
+        full_lo, full_hi = _outside(
+            price, np.where(long, lower, np.maximum(lower, sl)), np.where(long, np.minimum(upper, sl), upper)
+        )
+
+        active = self.active[j]
+        can = self.can_add[j]
+        lo = np.where(active, np.where(can, add_lo, full_lo), lower)
+        hi = np.where(active, np.where(can, add_hi, full_hi), upper)
+        return lo, hi
+
+
+_LANES = {"CDM": _CDMLanes, "WDM": _WDMLanes, "ZRM": _ZRMLanes, "IZRM": _IZRMLanes}
+
+
+def routed_strategies(cfg: BotConfig) -> List[str]:
+    """Names of the strategies ``TradingEngine`` dispatches ticks to for ``cfg``, in its order."""
+    enabled = [name for name in _KINDS if getattr(cfg, name.lower()) is not None and getattr(cfg, name.lower()).enabled]
+    if cfg.mode != StrategyMode.MULTIPLE:
+        name = cfg.mode.value.replace("_ONLY", "")
+        return [name] if name in enabled else []
+    if cfg.submode != SubMode.PARALLEL:
+        raise ValueError("BatchBacktester does not support SEQUENTIAL routing.")
+    return enabled
+
+
+class BatchBacktester:
+    """Backtest many ``BotConfig`` on the same ticks in one pass.
+
+    Produces the same ``CycleStats`` per config as ``TradingEngine`` with a
+    ``PaperBroker``. Single-strategy modes and ``MULTIPLE``/``PARALLEL`` are
+    supported (see ``supports``); every routed strategy must trade the
+    backtested symbol.
+    """
+
+    def __init__(
+        self,
+        configs: Sequence[BotConfig],
+        starting_equity: float = 100_000.0,
+        sink_factory: Callable[[], CycleSink] = MemorySink,
+    ):
+        self.configs = list(configs)
+        self.starting_equity = starting_equity
+        self.sinks = [sink_factory() for _ in self.configs]
+        routes = [routed_strategies(cfg) for cfg in self.configs]
+        self.groups: List[_Lanes] = []
+        self._symbols = set()
+        for name in _KINDS:
+            owners = [i for i, route in enumerate(routes) if name in route]
+            if owners:
+                cfgs = [getattr(self.configs[i], name.lower()) for i in owners]
+                self._symbols.update(c.symbol for c in cfgs)
+                self.groups.append(_LANES[name](cfgs, np.array(owners, dtype=np.int64)))
+
+    @staticmethod
+    def supports(cfg: BotConfig) -> bool:
+        return cfg.mode != StrategyMode.MULTIPLE or cfg.submode == SubMode.PARALLEL
+
+    def run(self, prices: np.ndarray, timestamps: np.ndarray, symbol: str) -> List[EngineResult]:
+        """One ``EngineResult`` per config, in the order the configs were given."""
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        timestamps = np.asarray(timestamps).astype("datetime64[us]")
+        if len(prices) != len(timestamps):
+            raise ValueError("prices and timestamps must have the same length.")
+        if self._symbols - {symbol}:
+            raise ValueError(f"Every routed strategy must trade {symbol!r}, got {sorted(self._symbols)}.")
+
+        count = len(self.configs)
+        groups = self.groups
+        sinks = self.sinks
+        continues = np.array([cfg.shared.continue_trading for cfg in self.configs], dtype=bool)
+
+        equity = np.full(count, self.starting_equity)
+        # Symbol exposure summed over each config's lanes, as ``Exposure`` does.
+        net = np.zeros(count)
+        cost = np.zeros(count)
+
+        cycle_id = np.zeros(count, dtype=np.int64)
+        start_tick = np.zeros(count, dtype=np.int64)
+        start_equity = np.zeros(count)
+        cycle_realized = np.zeros(count)
+        peak = np.zeros(count)
+        trough = np.zeros(count)
+        drawdown = np.zeros(count)
+        # Configs whose next tick opens a cycle; cleared for good once a config stops trading.
+        opening = np.ones(count, dtype=bool)
+        pending = True
+
+        for t, price in enumerate(prices.tolist()):
+            if pending:
+                k = np.flatnonzero(opening)
+                cycle_id[k] += 1
+                start_tick[k] = t
+                start_equity[k] = equity[k]
+                cycle_realized[k] = 0.0
+                peak[k] = equity[k]
+                trough[k] = equity[k]
+                drawdown[k] = 0.0
+                opening[:] = False
+                pending = False
+
+            # CycleStats.update_equity over every config.
+            marked = equity + (price * net - cost)
+            unset = peak == 0.0
+            peak = np.where(unset, marked, np.maximum(peak, marked))
+            trough = np.where(unset, marked, np.minimum(trough, marked))
+            drawdown = np.where(unset, 0.0, np.maximum(drawdown, peak - marked))
+
+            total: Optional[np.ndarray] = None
+            dispatched = False
+            for group in groups:
+                idx = group.dispatch(price)
+                if not idx.size:
+                    continue
+                dispatched = True
+                owners, realized = group.step(idx, price)
+                if owners.size:
+                    if total is None:
+                        total = np.zeros(count)
+                        closed = np.zeros(count, dtype=bool)
+                    total[owners] += realized
+                    closed[owners] = True
+
+            if dispatched:
+                net = np.zeros(count)
+                cost = np.zeros(count)
+                for group in groups:
+                    net[group.owner] += group.net
+                    cost[group.owner] += group.cost
+
+            if total is not None:
+                k = np.flatnonzero(closed)
+                equity[k] += total[k]
+                cycle_realized[k] += total[k]
+                end_ts = timestamps[t].item().isoformat()
+                for c in k.tolist():
+                    sinks[c].append(
+                        CycleStats(
+                            cycle_id=int(cycle_id[c]),
+                            symbol=symbol,
+                            start_ts=timestamps[start_tick[c]].item().isoformat(),
+                            end_ts=end_ts,
+                            start_equity=float(start_equity[c]),
+                            end_equity=float(equity[c]),
+                            realized_pnl=float(cycle_realized[c]),
+                            max_drawdown=float(drawdown[c]),
+                            peak_equity=float(peak[c]),
+                            trough_equity=float(trough[c]),
+                        )
+                    )
+                opening[k] = True
+                pending = True
+                stopped = k[~continues[k]]
+                if stopped.size:
+                    opening[stopped] = False
+                    for group in groups:
+                        group.freeze(np.flatnonzero(np.isin(group.owner, stopped)))
+
+        results = []
+        for sink in sinks:
+            sink.flush()
+            results.append(EngineResult(cycles=sink.records if isinstance(sink, MemorySink) else [], summary=sink.summary))
+        return results
@@ -0,0 +1,233 @@
+"""Content-addressed on-disk cache of backtest results.
+
+An entry is keyed by a hash of the canonical config (every dataclass field,
+list fields included), a fingerprint of the tick data and the starting
+equity, so identical requests hit however the config objects were built::
+
+    cache = ResultCache("~/.cache/trading_bot", max_bytes=2 << 30)
+    result = cache.get_or_run(cfg, prices, timestamps, "SPY")
+
+Bump ``CACHE_VERSION`` when a change alters backtest results; older entries
+then stop matching and age out through eviction.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from trading_bot.config import BotConfig
+from trading_bot.core.engine import EngineResult
+from trading_bot.core.vectorized import VectorizedBacktester
+
+CACHE_VERSION = 1
+
+_SUFFIX = ".pkl"
+# Leftover temp files from crashed writers are removed after this many seconds.
+_STALE_TMP_S = 3600.0
+# Evict down to this fraction of ``max_bytes`` so a full cache is not rescanned on every write.
+_LOW_WATER = 0.9
+_HASH_CHUNK = 1 << 20
+
+
+def _canonical(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        out = {f.name: _canonical(getattr(value, f.name)) for f in fields(value)}
+        out["__type__"] = type(value).__name__
+        return out
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, int) and not isinstance(value, bool):
+        # 10 == 10.0, so grids parsed from JSON or the CLI must hash like float configs.
+        return float(value)
+    return value
+
+
+def config_key(cfg: BotConfig) -> str:
+    """SHA-256 of ``cfg`` as sorted-key JSON; equal configs hash equal even though they are unhashable.
+
+    Integers are hashed as floats, so configs differing only in ``10`` versus
+    ``10.0`` share a key just as they compare equal.
+    """
+    text = json.dumps(_canonical(cfg), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _hash_array(h, values: np.ndarray, dtype: str):
+    # Chunked so memory-mapped inputs are streamed instead of converted whole.
+    for start in range(0, len(values), _HASH_CHUNK):
+        h.update(np.ascontiguousarray(values[start : start + _HASH_CHUNK]).astype(dtype, copy=False).data)
+
+
+def tick_fingerprint(prices: np.ndarray, timestamps: np.ndarray, symbol: str) -> str:
+    """SHA-256 of the symbol, prices and epoch-ns timestamps."""
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype.kind == "M":
+        timestamps = timestamps.astype("datetime64[ns]", copy=False).view(np.int64)
+    h = hashlib.sha256()
+    h.update(symbol.encode())
+    h.update(len(prices).to_bytes(8, "little"))
+    _hash_array(h, np.asarray(prices), "<f8")
+    _hash_array(h, timestamps, "<i8")
+    return h.hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ResultCache:
+    """Pickled ``EngineResult`` files under ``root``, evicted least recently used first.
+
+    Entries live at ``<root>/<key[:2]>/<key>.pkl``. Writers pickle to a
+    per-process temp file and rename it into place, so readers in any process
+    see a whole entry or none, and racing writers of one key store the same
+    content. A hit touches the entry's mtime, which is the LRU order.
+
+    Each process counts the bytes it wrote since its last directory scan and
+    rescans once they could push the total past ``max_bytes``, evicting the
+    oldest entries down to 90% of it. With several writers the cache can run
+    over by the writes other processes have not scanned yet.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 1 << 30):
+        self.root = os.path.expanduser(root)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        os.makedirs(self.root, exist_ok=True)
+        self._size = 0
+        self._unscanned = 0
+        self.evict()
+
+    def key(self, cfg: BotConfig, fingerprint: str, starting_equity: float = 100_000.0) -> str:
+        text = f"{CACHE_VERSION}:{config_key(cfg)}:{fingerprint}:{starting_equity!r}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[EngineResult]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                result = pickle.load(fh)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (EOFError, pickle.UnpicklingError):
+            # Unreadable entry (e.g. written by a crashed process); drop it.
+            self._remove(path)
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process after we opened it; the result is still whole.
+            pass
+        self.stats.hits += 1
+        return result
+
+    def put(self, key: str, result: EngineResult):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            size = fh.tell()
+        os.replace(tmp, path)
+        self.stats.writes += 1
+        self._unscanned += size
+        if self._size + self._unscanned > self.max_bytes:
+            self.evict()
+
+    def get_or_run(
+        self,
+        cfg: BotConfig,
+        prices: np.ndarray,
+        timestamps: np.ndarray,
+        symbol: str,
+        starting_equity: float = 100_000.0,
+        fingerprint: Optional[str] = None,
+    ) -> EngineResult:
+        """Cached ``VectorizedBacktester`` result; pass ``fingerprint`` to skip rehashing the ticks."""
+        if fingerprint is None:
+            fingerprint = tick_fingerprint(prices, timestamps, symbol)
+        key = self.key(cfg, fingerprint, starting_equity)
+        result = self.get(key)
+        if result is None:
+            result = VectorizedBacktester(cfg, starting_equity=starting_equity).run(prices, timestamps, symbol)
+            self.put(key, result)
+        return result
+
+    def evict(self) -> int:
+        """Rescan the cache and drop least recently used entries until it fits; return how many went."""
+        now = time.time()
+        entries = []
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(_SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith(".tmp") and now - stat.st_mtime > _STALE_TMP_S:
+                    self._remove(entry.path)
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * _LOW_WATER
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        self._size = total
+        self._unscanned = 0
+        self.stats.evictions += removed
+        return removed
+
+    def clear(self):
+        max_bytes, self.max_bytes = self.max_bytes, 0
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
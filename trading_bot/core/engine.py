@@ -1,38 +1,70 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
 
+from trading_bot.broker.base import Broker
 from trading_bot.broker.paper import PaperBroker
 from trading_bot.config import BotConfig, StrategyMode, SubMode
-from trading_bot.core.events import PriceTick
+from trading_bot.core.equity import EquityTracker
+from trading_bot.core.events import Bar, PriceTick
+from trading_bot.core.instrument import Instrumentation
 from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import CycleSink, CycleSummary, MemorySink
+from trading_bot.core.triggers import TriggerIndex
+from trading_bot.data.bars import BarPath, bar_path
+from trading_bot.strategies.base import QuietBand
 from trading_bot.strategies.cdm import CDMStrategy
 from trading_bot.strategies.wdm import WDMStrategy
 from trading_bot.strategies.zrm import ZRMStrategy
 from trading_bot.strategies.izrm import IZRMStrategy
 
+if TYPE_CHECKING:
+    from trading_bot.core.checkpoint import Checkpointer
+
 
 @dataclass
 class EngineResult:
+    # Cycles kept in memory; empty when the engine streams them to another sink.
     cycles: List[CycleStats]
+    summary: Optional[CycleSummary] = None
 
 
 class TradingEngine:
-    def __init__(self, cfg: BotConfig, starting_equity: float = 100_000.0):
+    def __init__(
+        self,
+        cfg: BotConfig,
+        starting_equity: float = 100_000.0,
+        broker: Optional[PaperBroker] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        sink: Optional[CycleSink] = None,
+    ):
         self.cfg = cfg
-        self.broker = PaperBroker()
+        self.broker = broker if broker is not None else PaperBroker()
         self.starting_equity = starting_equity
         self.equity = starting_equity
+        self.equity_tracker = EquityTracker(self.broker.exposures)
+        # Only brokers that match resting orders need to see every tick.
+        self._broker_tick = self.broker.on_price if type(self.broker).on_price is not Broker.on_price else None
+        # Only brokers that hold requests back (e.g. to net them) need flushing after each tick.
+        self._broker_flush = self.broker.flush if type(self.broker).flush is not Broker.flush else None
 
-        self.cycles: List[CycleStats] = []
+        self.sink = sink if sink is not None else MemorySink()
+        # Ticks consumed by run_backtest; the resume offset for checkpoints.
+        self.ticks_processed = 0
         self._cycle_id = 0
         self._active_cycle: Optional[CycleStats] = None
 
         self.strategies = self._build_strategies()
         self._sequential_chosen: Optional[str] = None
         self._initial_anchor: Optional[float] = None
+        self.triggers = TriggerIndex()
+
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            self._instrument(instrumentation)
 
     def _build_strategies(self) -> Dict[str, object]:
         strategies: Dict[str, object] = {}
@@ -65,29 +97,54 @@ class TradingEngine:
     def _close_cycle(self, tick: PriceTick, realized_pnl: float):
         if self._active_cycle is None:
             return
+        if self._broker_flush is not None:
+            realized_pnl += self._settle()
         self.equity += realized_pnl
         self._active_cycle.realized_pnl += realized_pnl
         self._active_cycle.end_equity = self.equity
         self._active_cycle.end_ts = tick.timestamp.isoformat()
-        self.cycles.append(self._active_cycle)
+        self.sink.append(self._active_cycle)
         self._active_cycle = None
 
-    def _update_drawdown(self, mark_price: float):
-        unrealized = 0.0
-        for pos in self.broker.positions.values():
-            unrealized += pos.unrealized_pnl(mark_price)
+    def _settle(self) -> float:
+        """Flush held-back requests and book the allocated fills back to their strategies.
+
+        Corrections for strategies still in a cycle go to their running realized
+        PnL; the rest belong to cycles closed on this tick and are returned.
+        """
+        closed = 0.0
+        for allocation in self._broker_flush():
+            strategy = self.strategies.get(allocation.owner)
+            active = strategy is not None and strategy.state.active
+            if allocation.correction:
+                if active:
+                    strategy.state.realized_pnl += allocation.correction
+                else:
+                    closed += allocation.correction
+            elif active:
+                # The ladder was compiled before the broker priced (or, for a
+                # resting order, booked) this fill.
+                strategy._compile()
+            self.triggers.invalidate()
+        return closed
+
+    def _update_drawdown(self, tick: PriceTick):
+        unrealized = self.equity_tracker.mark(tick.symbol, tick.price)
         if self._active_cycle:
             self._active_cycle.update_equity(self.equity + unrealized)
 
     def _route_single(self, name: str, tick: PriceTick):
         strategy = self.strategies.get(name)
-        if not strategy:
+        if not strategy or self.triggers.quiet(tick.price):
             return
         realized = strategy.on_price(tick)
+        self.triggers.rebuild((strategy,), tick.price)
         if realized is not None:
             self._close_cycle(tick, realized_pnl=realized)
 
     def _route_parallel(self, tick: PriceTick):
+        if self.triggers.quiet(tick.price):
+            return
         any_closed = False
         total_realized = 0.0
         for strat in self.strategies.values():
@@ -95,6 +152,7 @@ class TradingEngine:
             if realized is not None:
                 any_closed = True
                 total_realized += realized
+        self.triggers.rebuild(self.strategies.values(), tick.price)
         if any_closed:
             self._close_cycle(tick, realized_pnl=total_realized)
 
@@ -126,10 +184,7 @@ class TradingEngine:
             if realized is not None:
                 self._close_cycle(tick, realized_pnl=realized)
 
-    def on_tick(self, tick: PriceTick):
-        self._start_cycle_if_needed(tick)
-        self._update_drawdown(tick.price)
-
+    def _route(self, tick: PriceTick):
         if self.cfg.mode in (
             StrategyMode.CDM_ONLY,
             StrategyMode.WDM_ONLY,
@@ -138,16 +193,135 @@ class TradingEngine:
         ):
             name = self.cfg.mode.value.replace("_ONLY", "")
             self._route_single(name, tick)
-            return
-
-        if self.cfg.submode == SubMode.PARALLEL:
+        elif self.cfg.submode == SubMode.PARALLEL:
             self._route_parallel(tick)
         else:
             self._route_sequential(tick)
 
-    def run_backtest(self, ticks: List[PriceTick]) -> EngineResult:
+    def on_tick(self, tick: PriceTick):
+        if self._broker_tick is not None:
+            # Brokers return the resting orders this tick filled; settle them so
+            # their strategies route it with recompiled ladders.
+            if self._broker_tick(tick) and self._broker_flush is not None:
+                self.equity += self._settle()
+        self._start_cycle_if_needed(tick)
+        self._update_drawdown(tick)
+        self._route(tick)
+        if self._broker_flush is not None:
+            self.equity += self._settle()
+        # Fills and closes may have changed this symbol's exposure; refresh its mark
+        # so other symbols' ticks see the post-trade unrealized PnL.
+        self.equity_tracker.mark(tick.symbol, tick.price)
+
+    def _instrument(self, instr: Instrumentation):
+        """Shadow the hot-path methods with timed wrappers.
+
+        Wrapping happens once here, so an engine built without instrumentation runs
+        the plain methods with no per-tick checks. Each stage is recorded under the
+        stage that called it, e.g. ``on_tick;route;CDM;place_order``.
+        """
+        timed = instr.timed
+        if self._broker_tick is not None:
+            self._broker_tick = timed("broker_tick", self._broker_tick)
+        if self._broker_flush is not None:
+            self._broker_flush = timed("broker_flush", self._broker_flush)
+        self._start_cycle_if_needed = timed("cycle_start", self._start_cycle_if_needed)
+        self._update_drawdown = timed("drawdown", self._update_drawdown)
+        self._route = timed("route", self._route)
+        self._settle = timed("settle", self._settle)
+        self.equity_tracker.mark = timed("mark", self.equity_tracker.mark)
+        for name, strategy in self.strategies.items():
+            strategy.on_price = timed(name, strategy.on_price)
+        self.broker.place_order = timed("place_order", self.broker.place_order, "orders")
+        self.broker.close_position = timed("close_position", self.broker.close_position, "closes")
+
+        close_cycle = self._close_cycle
+
+        def counted_close(tick: PriceTick, realized_pnl: float):
+            if self._active_cycle is not None:
+                instr.count("cycles")
+            close_cycle(tick, realized_pnl)
+
+        self._close_cycle = counted_close
+        self.on_tick = timed("on_tick", self.on_tick, "ticks")
+
+    def run_backtest(self, ticks: Iterable[PriceTick], checkpoint: Optional[Checkpointer] = None) -> EngineResult:
+        """Run over any iterable of ticks; generators are consumed lazily.
+
+        With ``checkpoint`` set, engine state is snapshotted at its interval
+        (see ``trading_bot.core.checkpoint``).
+        """
         for tick in ticks:
             self.on_tick(tick)
-            if not self.cfg.shared.continue_trading and self.cycles:
+            self.ticks_processed += 1
+            if checkpoint is not None:
+                checkpoint.maybe_save(self)
+            if not self.cfg.shared.continue_trading and self.sink.summary.count:
                 break
-        return EngineResult(cycles=self.cycles)
+        return self.result()
+
+    @property
+    def cycles(self) -> List[CycleStats]:
+        """Closed cycles kept in memory; empty when the engine streams them to another sink."""
+        return self.sink.records if isinstance(self.sink, MemorySink) else []
+
+    def result(self) -> EngineResult:
+        self.sink.flush()
+        return EngineResult(cycles=self.cycles, summary=self.sink.summary)
+
+    def _travel_band(self, price: float) -> QuietBand:
+        """Intersection of the routed strategies' ``travel_band``; ``None`` if any may act or under sequential routing."""
+        mode = self.cfg.mode
+        if mode == StrategyMode.MULTIPLE:
+            if self.cfg.submode != SubMode.PARALLEL:
+                return None
+            strategies = self.strategies.values()
+        else:
+            strategy = self.strategies.get(mode.value.replace("_ONLY", ""))
+            if strategy is None:
+                return None
+            strategies = (strategy,)
+        lo, hi = -math.inf, math.inf
+        for strategy in strategies:
+            band = strategy.travel_band(price)
+            if band is None:
+                return None
+            if band[0] > lo:
+                lo = band[0]
+            if band[1] < hi:
+                hi = band[1]
+        return (lo, hi)
+
+    def bar_ticks(self, bar: Bar, path: BarPath = BarPath.TIME) -> Iterator[PriceTick]:
+        """Ticks that replay ``bar`` along ``path`` through this engine.
+
+        Between path points, a tick is emitted at each level the price crosses
+        where a routed strategy orders or exits, so fills happen at the level
+        rather than at the bar extreme. Levels come from the strategies'
+        ``travel_band`` as the engine consumes each tick; prices a strategy only
+        tracks (e.g. WDM's running extreme) are stepped over. Sequential routing
+        sees path points only.
+        """
+        points = bar_path(bar, path)
+        price, ts = points[0]
+        yield PriceTick(symbol=bar.symbol, price=price, timestamp=ts)
+        for target, ts in points[1:]:
+            up = target > price
+            while True:
+                band = self._travel_band(price)
+                if band is None:
+                    break
+                level = band[1] if up else band[0]
+                if (level >= target) if up else (level <= target):
+                    break
+                if (level <= price) if up else (level >= price):
+                    # A level touched without acting; never step on the spot.
+                    break
+                price = level
+                yield PriceTick(symbol=bar.symbol, price=price, timestamp=ts)
+            price = target
+            yield PriceTick(symbol=bar.symbol, price=price, timestamp=ts)
+
+    def run_bars(self, bars: Iterable[Bar], path: BarPath = BarPath.TIME) -> EngineResult:
+        """Backtest on bars instead of raw ticks; see ``bar_ticks`` for the fill convention."""
+        return self.run_backtest(tick for bar in bars for tick in self.bar_ticks(bar, path))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from trading_bot.core.models import Exposure
+
+
+class EquityTracker:
+    """Running unrealized PnL across symbols.
+
+    Each symbol is marked at its own last price. A tick only re-marks its own
+    symbol, using the running ``net_size``/``cost`` netted across owners, so the
+    cost per tick does not depend on the number of symbols, strategies or legs.
+    """
+
+    def __init__(self, exposures: Dict[str, Exposure]):
+        self._exposures = exposures
+        self._marks: Dict[str, float] = {}
+        self.unrealized = 0.0
+
+    def mark(self, symbol: str, price: float) -> float:
+        """Re-mark ``symbol`` at ``price`` and return total unrealized PnL."""
+        exposure = self._exposures.get(symbol)
+        value = exposure.unrealized_pnl(price) if exposure is not None else 0.0
+        # Subtract before adding so a lone symbol's total is exactly its own mark.
+        self.unrealized = (self.unrealized - self._marks.get(symbol, 0.0)) + value
+        self._marks[symbol] = value
+        return self.unrealized
+
+    def symbol_unrealized(self, symbol: str) -> float:
+        return self._marks.get(symbol, 0.0)
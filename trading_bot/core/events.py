@@ -4,8 +4,28 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PriceTick:
     symbol: str
     price: float
     timestamp: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class Bar:
+    """OHLC summary of one symbol's ticks over an interval.
+
+    ``start``/``end`` are the first and last tick timestamps; ``high_ts`` and
+    ``low_ts`` record when the extremes first printed.
+    """
+
+    symbol: str
+    start: datetime
+    end: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    high_ts: datetime
+    low_ts: datetime
+    count: int
@@ -0,0 +1,242 @@
+"""Fork a running engine and re-run only the part of a backtest a config change affects.
+
+``fork_engine`` copies the state ``TradingEngine`` mutates (strategies, their
+``StrategyState``, the broker ledger, the open cycle and routing state). Closed
+cycles are never modified after they reach the sink, so a fork shares them
+with its parent instead of copying. The cost of a fork grows with open legs,
+not with the number of ticks already processed.
+
+A strategy reads its ladder lists one leg at a time, so changing, say, the
+4th entry of ``order_sizes`` cannot matter before the strategy first holds 3
+legs. ``ForkPoints`` records, during a base run, periodic forks and the first
+tick each strategy reached each leg depth. ``rerun`` then resumes from the last
+fork at or before the earliest tick the new config can change::
+
+    points = ForkPoints(engine, every_ticks=5_000)
+    engine.run_backtest(ticks, checkpoint=points)
+    result = points.rerun(replace(cfg, cdm=replace(cfg.cdm, order_sizes=sizes)), ticks)
+"""
+from __future__ import annotations
+
+import copy
+import itertools
+import math
+from dataclasses import fields, replace
+from typing import Dict, Iterable, List, Optional
+
+from trading_bot.config import BotConfig, MartingaleConfig
+from trading_bot.core.checkpoint import _STRATEGY_SKIP
+from trading_bot.core.engine import EngineResult, TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.instrument import Instrumentation
+from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import CycleSink, MemorySink, SummarySink
+from trading_bot.strategies.izrm import IZRMStrategy
+from trading_bot.strategies.zrm import ZRMStrategy
+
+_STRATEGY_FIELDS = {"CDM": "cdm", "WDM": "wdm", "ZRM": "zrm", "IZRM": "izrm"}
+
+
+class _ForkSink(MemorySink):
+    """``MemorySink`` whose first ``shared`` records are its parent's list, read in place.
+
+    Sinks only ever append, so that prefix stays valid while the parent runs on.
+    The list is copied once, when the fork closes its first cycle or its records
+    are read, so forks that are never run cost nothing per closed cycle.
+    """
+
+    def __init__(self, parent: List[CycleStats], shared: int):
+        CycleSink.__init__(self)
+        self._parent: Optional[List[CycleStats]] = parent
+        self._shared = shared
+        self._own: Optional[List[CycleStats]] = None
+
+    @property
+    def records(self) -> List[CycleStats]:
+        if self._own is None:
+            self._own = self._parent[: self._shared]
+            self._parent = None
+        return self._own
+
+    def _write(self, cycle: CycleStats):
+        self.records.append(cycle)
+
+    def __getstate__(self):
+        # Pickle this fork's cycles, not the parent's whole list.
+        self.records
+        return vars(self)
+
+
+def _fork_sink(parent: CycleSink, sink: Optional[CycleSink]) -> CycleSink:
+    """A sink that starts from ``parent``'s summary; memory sinks also share its closed cycles."""
+    if sink is None:
+        if isinstance(parent, _ForkSink) and parent._own is None:
+            sink = _ForkSink(parent._parent, parent._shared)
+        elif isinstance(parent, MemorySink):
+            sink = _ForkSink(parent.records, len(parent.records))
+        else:
+            sink = SummarySink()
+    sink.summary = replace(parent.summary)
+    return sink
+
+
+def fork_engine(
+    engine: TradingEngine,
+    cfg: Optional[BotConfig] = None,
+    sink: Optional[CycleSink] = None,
+    instrumentation: Optional[Instrumentation] = None,
+) -> TradingEngine:
+    """An independent copy of ``engine`` that continues with ``cfg`` (default: the same config).
+
+    ``cfg`` must enable the same strategies. Strategies whose config changed
+    recompile their trigger ladder from the current position. Without ``sink``
+    the fork keeps cycles in memory if the parent does and only the summary
+    otherwise (file sinks cannot be shared).
+    """
+    cfg = engine.cfg if cfg is None else cfg
+    strategies = {
+        name: {k: v for k, v in vars(strategy).items() if k not in _STRATEGY_SKIP}
+        for name, strategy in engine.strategies.items()
+    }
+    # One deepcopy, so the copied strategies still point at the copied ledger entries.
+    # Brokers leave instrumentation wrappers out of copies.
+    broker, strategies, active_cycle = copy.deepcopy((engine.broker, strategies, engine._active_cycle))
+
+    child = TradingEngine(
+        cfg,
+        starting_equity=engine.starting_equity,
+        broker=broker,
+        instrumentation=instrumentation,
+        sink=_fork_sink(engine.sink, sink),
+    )
+    if set(child.strategies) != set(strategies):
+        raise ValueError("A fork must enable the same strategies as its parent.")
+    child.equity = engine.equity
+    child.ticks_processed = engine.ticks_processed
+    child._cycle_id = engine._cycle_id
+    child._active_cycle = active_cycle
+    child._sequential_chosen = engine._sequential_chosen
+    child._initial_anchor = engine._initial_anchor
+    child.equity_tracker._marks = dict(engine.equity_tracker._marks)
+    child.equity_tracker.unrealized = engine.equity_tracker.unrealized
+    for name, attrs in strategies.items():
+        strategy = child.strategies[name]
+        vars(strategy).update(attrs)
+        if strategy.cfg != engine.strategies[name].cfg:
+            if isinstance(strategy, (ZRMStrategy, IZRMStrategy)):
+                strategy._lower, strategy._upper = strategy._bounds()
+            if strategy.state.active:
+                strategy._compile()
+    return child
+
+
+def _first_difference(a: List[float], b: List[float]) -> int:
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def _add_limit(cfg: MartingaleConfig) -> int:
+    return min(cfg.max_orders, len(cfg.order_distances_pct), len(cfg.order_sizes))
+
+
+def divergence_depth(old: Optional[MartingaleConfig], new: Optional[MartingaleConfig]) -> Optional[int]:
+    """Fewest legs a strategy must hold at the start of a tick before ``new`` can act unlike ``old``.
+
+    ``None`` when the change can never matter. Leg ``n``'s size is read when
+    adding it, its take-profit/stop when compiling after it fills, and the
+    distance to leg ``n`` when compiling after leg ``n - 1``. Other fields are
+    read from the first tick, so any change to them gives 0.
+    """
+    if old == new:
+        return None
+    enabled_old = old is not None and old.enabled
+    enabled_new = new is not None and new.enabled
+    if not (enabled_old and enabled_new):
+        return 0 if enabled_old or enabled_new else None
+
+    depth = math.inf
+    for f in fields(old):
+        a, b = getattr(old, f.name), getattr(new, f.name)
+        if a == b or f.name in ("max_orders", "capital_allocation_pct"):
+            # The add limit is checked below; capital allocation is not read by strategies.
+            continue
+        if f.name in ("order_sizes", "order_tps_pct", "order_sls_pct"):
+            depth = min(depth, _first_difference(a, b))
+        elif f.name == "order_distances_pct":
+            depth = min(depth, max(0, _first_difference(a, b) - 1))
+        elif f.name == "hold_previous":
+            depth = min(depth, 1)
+        else:
+            return 0
+    limit_old, limit_new = _add_limit(old), _add_limit(new)
+    if limit_old != limit_new:
+        depth = min(depth, max(0, min(limit_old, limit_new) - 1))
+    return None if depth == math.inf else int(depth)
+
+
+class ForkPoints:
+    """Forks of a base run and the leg depths its strategies reached, for what-if re-runs.
+
+    Build it on a fresh engine and pass it as ``run_backtest``'s ``checkpoint``
+    hook; it forks every ``every_ticks`` ticks.
+    """
+
+    def __init__(self, engine: TradingEngine, every_ticks: int = 10_000):
+        if engine.ticks_processed:
+            raise ValueError("ForkPoints must see the base run from its first tick.")
+        if every_ticks <= 0:
+            raise ValueError("every_ticks must be positive.")
+        self.base = engine
+        self.every_ticks = every_ticks
+        # Sorted by ticks_processed; the first is the engine before any tick.
+        self.forks: List[TradingEngine] = [fork_engine(engine)]
+        # Per strategy, the tick index at which it first started a tick holding ``i`` legs.
+        self._depths: Dict[str, List[int]] = {name: [0] for name in engine.strategies}
+
+    def maybe_save(self, engine: TradingEngine) -> bool:
+        tick = engine.ticks_processed
+        for name, strategy in engine.strategies.items():
+            depths = self._depths[name]
+            while len(depths) <= strategy.state.current_leg:
+                depths.append(tick)
+        if tick % self.every_ticks:
+            return False
+        self.forks.append(fork_engine(engine))
+        return True
+
+    def divergence_tick(self, cfg: BotConfig) -> int:
+        """Earliest tick of the base run on which ``cfg`` could act differently.
+
+        Equal to the number of ticks processed when no recorded tick is affected.
+        """
+        base = self.base
+        strategy_fields = dict.fromkeys(_STRATEGY_FIELDS.values())
+        if replace(base.cfg, **strategy_fields) != replace(cfg, **strategy_fields):
+            return 0
+        tick = base.ticks_processed
+        for name, attr in _STRATEGY_FIELDS.items():
+            depth = divergence_depth(getattr(base.cfg, attr), getattr(cfg, attr))
+            if depth is None:
+                continue
+            depths = self._depths.get(name, [0])
+            if depth < len(depths):
+                tick = min(tick, depths[depth])
+        return tick
+
+    def fork_at(self, tick: int, cfg: Optional[BotConfig] = None) -> TradingEngine:
+        """Fork the latest saved point at or before ``tick``; it resumes at its own ``ticks_processed``."""
+        start = max((f for f in self.forks if f.ticks_processed <= tick), key=lambda f: f.ticks_processed)
+        return fork_engine(start, cfg)
+
+    def rerun(self, cfg: BotConfig, ticks: Iterable[PriceTick]) -> EngineResult:
+        """Result of running ``cfg`` over ``ticks`` (the base run's full stream) from the start.
+
+        Only ticks from the saved fork before the divergence point are processed.
+        """
+        tick = self.divergence_tick(cfg)
+        if tick >= self.base.ticks_processed:
+            return fork_engine(self.base, cfg).result()
+        engine = self.fork_at(tick, cfg)
+        return engine.run_backtest(itertools.islice(ticks, engine.ticks_processed, None))
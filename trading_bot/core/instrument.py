@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+_BUCKETS = _SUB * 64
+
+
+def _bucket(ns: int) -> int:
+    if ns < _SUB:
+        return max(ns, 0)
+    exp = ns.bit_length() - _SUB_BITS - 1
+    return _SUB * (exp + 1) + ((ns >> exp) - _SUB)
+
+
+def _bucket_upper(index: int) -> int:
+    if index < _SUB:
+        return index
+    exp = index // _SUB - 1
+    return ((_SUB + index % _SUB + 1) << exp) - 1
+
+
+class LatencyHistogram:
+    """Log-linear nanosecond histogram: 16 sub-buckets per power of two (<= 6.25% error)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int):
+        self.counts[_bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> int:
+        """Upper edge of the bucket holding the ``q`` quantile (0 < q <= 1), capped at the max."""
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ns": self.total / self.count if self.count else 0.0,
+            "p50_ns": self.percentile(0.50),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self.max,
+            "total_ns": self.total,
+        }
+
+
+class Instrumentation:
+    """Per-stage latency histograms and event counters for ``TradingEngine``.
+
+    Stage names are ``;``-separated call paths (``on_tick;route;CDM``) so a run
+    can be exported in the collapsed-stack format used by flame graph tools.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        # Paths of the timed calls currently running, innermost last.
+        self._stack: List[str] = []
+
+    def timed(self, name: str, fn: Callable, counter: Optional[str] = None) -> Callable:
+        """Wrap ``fn`` so each call is recorded under the running stage's path plus ``name``.
+
+        A call made outside any timed stage is recorded as ``name``. ``counter``
+        is incremented for every call that returns.
+        """
+        clock = time.perf_counter_ns
+        stack = self._stack
+        record = self.record
+        # Path per parent path, built once.
+        paths: Dict[str, str] = {}
+
+        def wrapper(*args, **kwargs):
+            parent = stack[-1] if stack else ""
+            path = paths.get(parent)
+            if path is None:
+                path = paths[parent] = f"{parent};{name}" if parent else name
+            stack.append(path)
+            t0 = clock()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                record(path, clock() - t0)
+                stack.pop()
+            if counter is not None:
+                self.count(counter)
+            return result
+
+        return wrapper
+
+    def record(self, stage: str, ns: int):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = LatencyHistogram()
+        hist.record(ns)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            "stages": {name: hist.summary() for name, hist in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w") as fh:
+            json.dump(self.snapshot(), fh, indent=2)
+
+    def collapsed_stacks(self) -> str:
+        """Self time per stage as ``a;b;c <ns>`` lines (flamegraph.pl / speedscope input)."""
+        totals = {name: hist.total for name, hist in self.stages.items()}
+        lines: List[str] = []
+        for name in sorted(totals):
+            prefix = name + ";"
+            children = sum(t for other, t in totals.items() if other.startswith(prefix) and ";" not in other[len(prefix):])
+            self_ns = max(totals[name] - children, 0)
+            if self_ns:
+                lines.append(f"{name} {self_ns}")
+        return "\n".join(lines)
@@ -10,7 +10,7 @@ class Side(str, Enum):
     SELL = "SELL"
 
 
-@dataclass
+@dataclass(slots=True)
 class Leg:
     side: Side
     size: float
@@ -18,22 +18,61 @@ class Leg:
     entry_ts: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
+    """Legs held in one symbol, with running totals so marks are O(1).
+
+    Mutate through ``add``/``clear`` rather than ``legs`` directly, or the totals go stale.
+    """
+
     symbol: str
     legs: List[Leg] = field(default_factory=list)
 
+    net_size: float = field(default=0.0, init=False)
+    # Signed sum of size * entry_price; unrealized PnL is mark * net_size - cost.
+    cost: float = field(default=0.0, init=False)
+    _abs_size: float = field(default=0.0, init=False, repr=False)
+    _notional: float = field(default=0.0, init=False, repr=False)
+    # Symbol-wide totals this position is part of, kept current on every change.
+    exposure: Optional[Exposure] = field(default=None, init=False, repr=False, compare=False)
+
+    def add(self, side: Side, size: float, price: float, ts: str) -> Leg:
+        leg = Leg(side, size, price, ts)
+        self.legs.append(leg)
+        signed = size if side == Side.BUY else -size
+        self.net_size += signed
+        self.cost += signed * price
+        self._abs_size += abs(size)
+        self._notional += abs(size) * price
+        if self.exposure is not None:
+            self.exposure.refresh()
+        return leg
+
+    def reprice(self, leg: Leg, price: float):
+        """Move ``leg``'s entry to ``price`` (e.g. when the actual fill differs from the intent)."""
+        signed = leg.size if leg.side == Side.BUY else -leg.size
+        self.cost += signed * (price - leg.entry_price)
+        self._notional += abs(leg.size) * (price - leg.entry_price)
+        leg.entry_price = price
+        if self.exposure is not None:
+            self.exposure.refresh()
+
+    def clear(self):
+        self.legs.clear()
+        self.net_size = 0.0
+        self.cost = 0.0
+        self._abs_size = 0.0
+        self._notional = 0.0
+        if self.exposure is not None:
+            self.exposure.refresh()
+
     def total_size(self) -> float:
-        size = 0.0
-        for leg in self.legs:
-            size += leg.size if leg.side == Side.BUY else -leg.size
-        return size
+        return self.net_size
 
     def avg_entry_price(self) -> float:
-        total = sum(abs(l.size) for l in self.legs)
-        if total == 0:
+        if self._abs_size == 0:
             return 0.0
-        return sum(abs(l.size) * l.entry_price for l in self.legs) / total
+        return self._notional / self._abs_size
 
     def direction(self) -> Side:
         if not self.legs:
@@ -41,16 +80,34 @@ class Position:
         return self.legs[0].side
 
     def unrealized_pnl(self, mark_price: float) -> float:
-        pnl = 0.0
-        for leg in self.legs:
-            if leg.side == Side.BUY:
-                pnl += (mark_price - leg.entry_price) * leg.size
-            else:
-                pnl += (leg.entry_price - mark_price) * leg.size
-        return pnl
+        return mark_price * self.net_size - self.cost
+
+
+@dataclass(slots=True)
+class Exposure:
+    """Net size and signed cost of one symbol summed over its owners' positions.
+
+    Member positions refresh it whenever they change, so marking a symbol costs
+    the same however many strategies hold it.
+    """
+
+    positions: List[Position] = field(default_factory=list, repr=False)
+    net_size: float = 0.0
+    cost: float = 0.0
+
+    def refresh(self):
+        net_size = cost = 0.0
+        for pos in self.positions:
+            net_size += pos.net_size
+            cost += pos.cost
+        self.net_size = net_size
+        self.cost = cost
+
+    def unrealized_pnl(self, mark_price: float) -> float:
+        return mark_price * self.net_size - self.cost
 
 
-@dataclass
+@dataclass(slots=True)
 class CycleStats:
     cycle_id: int
     symbol: str
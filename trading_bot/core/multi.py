@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from trading_bot.config import BotConfig
+from trading_bot.core.engine import EngineResult, TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import CycleSummary
+
+# Called with the symbols a shard owns; must yield those symbols' ticks in time order.
+TickSource = Callable[[Sequence[str]], Iterable[PriceTick]]
+
+
+def configs_for_symbols(base: BotConfig, symbols: Iterable[str]) -> Dict[str, BotConfig]:
+    """Clone ``base`` once per symbol with every strategy config pointed at that symbol."""
+    configs = {}
+    for symbol in symbols:
+        overrides = {}
+        for name in ("cdm", "wdm", "zrm", "izrm"):
+            strat_cfg = getattr(base, name)
+            if strat_cfg is not None:
+                overrides[name] = replace(strat_cfg, symbol=symbol)
+        configs[symbol] = replace(base, **overrides)
+    return configs
+
+
+def merge_summaries(summaries: Iterable[CycleSummary]) -> CycleSummary:
+    merged = CycleSummary()
+    for summary in summaries:
+        merged = merged.merge(summary)
+    return merged
+
+
+def merge_cycles(cycles: Iterable[CycleStats]) -> List[CycleStats]:
+    """Order cycles by symbol then cycle id, independent of how symbols were sharded."""
+    return sorted(cycles, key=lambda c: (c.symbol, c.cycle_id))
+
+
+class MultiSymbolEngine:
+    """One ``TradingEngine`` (strategies, broker, cycle state) per symbol behind a dispatch index."""
+
+    def __init__(self, configs: Dict[str, BotConfig], starting_equity: float = 100_000.0):
+        self.engines: Dict[str, TradingEngine] = {
+            symbol: TradingEngine(cfg, starting_equity=starting_equity) for symbol, cfg in configs.items()
+        }
+        self._dispatch = {symbol: engine.on_tick for symbol, engine in self.engines.items()}
+
+    def on_tick(self, tick: PriceTick):
+        handler = self._dispatch.get(tick.symbol)
+        if handler is not None:
+            handler(tick)
+
+    def run_backtest(self, ticks: Iterable[PriceTick]) -> EngineResult:
+        """Feed each symbol's ticks to its engine as ``TradingEngine.run_backtest`` would.
+
+        A symbol whose config has ``continue_trading`` off stops receiving ticks
+        after its first closed cycle; the others carry on.
+        """
+        running = dict(self.engines)
+        for tick in ticks:
+            engine = running.get(tick.symbol)
+            if engine is None:
+                continue
+            engine.on_tick(tick)
+            engine.ticks_processed += 1
+            if not engine.cfg.shared.continue_trading and engine.sink.summary.count:
+                del running[tick.symbol]
+        results = [engine.result() for engine in self.engines.values()]
+        return EngineResult(
+            cycles=merge_cycles(c for r in results for c in r.cycles),
+            summary=merge_summaries(r.summary for r in results),
+        )
+
+
+def shard_symbols(symbols: Iterable[str], shards: int) -> List[List[str]]:
+    """Deal sorted symbols round-robin so the assignment only depends on the symbol set."""
+    buckets: List[List[str]] = [[] for _ in range(shards)]
+    for i, symbol in enumerate(sorted(symbols)):
+        buckets[i % shards].append(symbol)
+    return [b for b in buckets if b]
+
+
+def _run_shard(configs: Dict[str, BotConfig], source: TickSource, starting_equity: float) -> EngineResult:
+    engine = MultiSymbolEngine(configs, starting_equity=starting_equity)
+    return engine.run_backtest(source(list(configs)))
+
+
+def run_sharded(
+    configs: Dict[str, BotConfig],
+    source: TickSource,
+    workers: Optional[int] = None,
+    starting_equity: float = 100_000.0,
+) -> EngineResult:
+    """Backtest ``configs`` with symbols spread over a process pool.
+
+    ``source`` is sent to each worker, so it must be picklable (a module-level
+    function or ``functools.partial``, e.g. ``partial(iter_store_ticks, path)``).
+    Symbols never interact, so the merged result is the same for any worker count.
+    """
+    shards = shard_symbols(configs, workers or os.cpu_count() or 1)
+    if len(shards) <= 1:
+        return _run_shard(configs, source, starting_equity)
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [
+            pool.submit(_run_shard, {s: configs[s] for s in shard}, source, starting_equity) for shard in shards
+        ]
+        results = [f.result() for f in futures]
+    return EngineResult(
+        cycles=merge_cycles(c for r in results for c in r.cycles),
+        summary=merge_summaries(r.summary for r in results),
+    )
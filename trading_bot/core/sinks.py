@@ -0,0 +1,257 @@
+"""Destinations for closed ``CycleStats`` with running summary statistics.
+
+``TradingEngine`` hands every closed cycle to its sink. ``MemorySink`` keeps
+them in a list (the default), ``BinarySink`` streams them to a columnar binary
+file in batches, and ``SummarySink`` keeps only the online summary, so memory
+stays bounded however many cycles a run produces.
+"""
+from __future__ import annotations
+
+import math
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from trading_bot.core.models import CycleStats
+from trading_bot.data.loaders import datetime_to_ns, ns_to_datetime
+
+# One fixed-width record per cycle. Timestamps are epoch ns in UTC, -1 when unset,
+# with the UTC offset they were written in (seconds; _NAIVE for naive timestamps).
+CYCLE_DTYPE = np.dtype(
+    [
+        ("cycle_id", "<i8"),
+        ("symbol", "S32"),
+        ("start_ns", "<i8"),
+        ("end_ns", "<i8"),
+        ("start_equity", "<f8"),
+        ("end_equity", "<f8"),
+        ("realized_pnl", "<f8"),
+        ("max_drawdown", "<f8"),
+        ("peak_equity", "<f8"),
+        ("trough_equity", "<f8"),
+        ("num_orders", "<i8"),
+        ("start_offset", "<i4"),
+        ("end_offset", "<i4"),
+    ]
+)
+_NAIVE = -(1 << 31)
+
+
+@dataclass(slots=True)
+class CycleSummary:
+    """Online cycle statistics (Welford mean/variance of realized PnL)."""
+
+    count: int = 0
+    total_pnl: float = 0.0
+    mean_pnl: float = 0.0
+    m2: float = 0.0
+    wins: int = 0
+    best_pnl: float = -math.inf
+    worst_pnl: float = math.inf
+    max_drawdown: float = 0.0
+
+    def update(self, cycle: CycleStats):
+        pnl = cycle.realized_pnl
+        self.count += 1
+        self.total_pnl += pnl
+        delta = pnl - self.mean_pnl
+        self.mean_pnl += delta / self.count
+        self.m2 += delta * (pnl - self.mean_pnl)
+        if pnl > 0:
+            self.wins += 1
+        if pnl > self.best_pnl:
+            self.best_pnl = pnl
+        if pnl < self.worst_pnl:
+            self.worst_pnl = pnl
+        if cycle.max_drawdown > self.max_drawdown:
+            self.max_drawdown = cycle.max_drawdown
+
+    def merge(self, other: "CycleSummary") -> "CycleSummary":
+        """Combined summary of two disjoint sets of cycles."""
+        if not other.count:
+            return replace(self)
+        if not self.count:
+            return replace(other)
+        count = self.count + other.count
+        delta = other.mean_pnl - self.mean_pnl
+        return CycleSummary(
+            count=count,
+            total_pnl=self.total_pnl + other.total_pnl,
+            mean_pnl=self.mean_pnl + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            wins=self.wins + other.wins,
+            best_pnl=max(self.best_pnl, other.best_pnl),
+            worst_pnl=min(self.worst_pnl, other.worst_pnl),
+            max_drawdown=max(self.max_drawdown, other.max_drawdown),
+        )
+
+    @property
+    def pnl_std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_pnl": self.total_pnl,
+            "mean_pnl": self.mean_pnl,
+            "pnl_std": self.pnl_std,
+            "win_rate": self.win_rate,
+            "best_pnl": self.best_pnl if self.count else 0.0,
+            "worst_pnl": self.worst_pnl if self.count else 0.0,
+            "max_drawdown": self.max_drawdown,
+        }
+
+
+class CycleSink(ABC):
+    def __init__(self):
+        self.summary = CycleSummary()
+
+    def append(self, cycle: CycleStats):
+        self.summary.update(cycle)
+        self._write(cycle)
+
+    @abstractmethod
+    def _write(self, cycle: CycleStats):
+        ...
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def cycles(self) -> Iterator[CycleStats]:
+        """Stored cycles in close order; sinks that keep none yield nothing."""
+        return iter(())
+
+
+class MemorySink(CycleSink):
+    def __init__(self):
+        super().__init__()
+        self.records: List[CycleStats] = []
+
+    def _write(self, cycle: CycleStats):
+        self.records.append(cycle)
+
+    def cycles(self) -> Iterator[CycleStats]:
+        return iter(self.records)
+
+
+class SummarySink(CycleSink):
+    def _write(self, cycle: CycleStats):
+        pass
+
+
+def _encode_ts(ts: Optional[str]) -> Tuple[int, int]:
+    """Epoch ns in UTC and the timestamp's UTC offset in seconds."""
+    if ts is None:
+        return -1, _NAIVE
+    dt = datetime.fromisoformat(ts)
+    offset = dt.utcoffset()
+    return datetime_to_ns(dt), _NAIVE if offset is None else int(offset.total_seconds())
+
+
+def _decode_ts(ns: int, offset: int) -> Optional[str]:
+    if ns < 0:
+        return None
+    dt = ns_to_datetime(ns)
+    if offset != _NAIVE:
+        dt = dt.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(seconds=offset)))
+    return dt.isoformat()
+
+
+def cycles_to_array(cycles: List[CycleStats]) -> np.ndarray:
+    records = np.empty(len(cycles), dtype=CYCLE_DTYPE)
+    for i, c in enumerate(cycles):
+        symbol = c.symbol.encode()
+        if len(symbol) > CYCLE_DTYPE["symbol"].itemsize:
+            raise ValueError(f"Symbol {c.symbol!r} is too long for the cycle file format.")
+        start_ns, start_offset = _encode_ts(c.start_ts)
+        end_ns, end_offset = _encode_ts(c.end_ts)
+        records[i] = (
+            c.cycle_id, symbol, start_ns, end_ns, c.start_equity, c.end_equity, c.realized_pnl,
+            c.max_drawdown, c.peak_equity, c.trough_equity, c.num_orders, start_offset, end_offset,
+        )
+    return records
+
+
+def array_to_cycles(records: np.ndarray) -> Iterator[CycleStats]:
+    for r in records.tolist():
+        yield CycleStats(
+            cycle_id=r[0], symbol=r[1].decode(), start_ts=_decode_ts(r[2], r[11]), end_ts=_decode_ts(r[3], r[12]),
+            start_equity=r[4], end_equity=r[5], realized_pnl=r[6], max_drawdown=r[7],
+            peak_equity=r[8], trough_equity=r[9], num_orders=r[10],
+        )
+
+
+class BinarySink(CycleSink):
+    """Append cycles to ``path`` as ``CYCLE_DTYPE`` records, ``batch_size`` at a time.
+
+    The file is a bare record array, readable with ``load_cycle_array`` (memory
+    mapped) or ``read_cycles``. Pickling the sink (engine checkpoints) flushes
+    it and records its length; unpickling truncates anything written after that.
+    """
+
+    def __init__(self, path: str, batch_size: int = 4096, append: bool = False):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[CycleStats] = []
+        self._fh = open(path, "ab" if append else "wb")
+
+    def _write(self, cycle: CycleStats):
+        self._pending.append(cycle)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            cycles_to_array(self._pending).tofile(self._fh)
+            self._pending.clear()
+        self._fh.flush()
+
+    def close(self):
+        self.flush()
+        self._fh.close()
+
+    def cycles(self) -> Iterator[CycleStats]:
+        self.flush()
+        return read_cycles(self.path)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.flush()
+        return {
+            "path": self.path,
+            "batch_size": self.batch_size,
+            "summary": self.summary,
+            "size": self._fh.tell(),
+        }
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.path = state["path"]
+        self.batch_size = state["batch_size"]
+        self.summary = state["summary"]
+        self._pending = []
+        with open(self.path, "r+b" if os.path.exists(self.path) else "wb") as fh:
+            fh.truncate(state["size"])
+        self._fh = open(self.path, "ab")
+
+
+def load_cycle_array(path: str) -> np.ndarray:
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=CYCLE_DTYPE)
+    return np.memmap(path, dtype=CYCLE_DTYPE, mode="r")
+
+
+def read_cycles(path: str, chunk_size: int = 65_536) -> Iterator[CycleStats]:
+    records = load_cycle_array(path)
+    for start in range(0, len(records), chunk_size):
+        yield from array_to_cycles(records[start : start + chunk_size])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+
+class TriggerIndex:
+    """Price interval on which every routed strategy is idle.
+
+    Each strategy reports the open interval around the last price where its
+    compiled levels say ``on_price`` cannot act; the index keeps their
+    intersection. Ticks strictly inside it skip strategy dispatch. The band is
+    rebuilt after every dispatched tick, which is the only point where strategy
+    state can change.
+    """
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        self.lo = math.inf
+        self.hi = -math.inf
+
+    def quiet(self, price: float) -> bool:
+        return self.lo < price < self.hi
+
+    def rebuild(self, strategies: Iterable[object], price: float):
+        lo, hi = -math.inf, math.inf
+        for strategy in strategies:
+            band = strategy.quiet_band(price)
+            if band is None:
+                self.invalidate()
+                return
+            if band[0] > lo:
+                lo = band[0]
+            if band[1] < hi:
+                hi = band[1]
+        self.lo, self.hi = lo, hi
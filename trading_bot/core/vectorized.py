@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from trading_bot.config import BotConfig, StrategyMode, SubMode
+from trading_bot.core.engine import EngineResult, TradingEngine
+from trading_bot.core.events import PriceTick
+from trading_bot.core.models import CycleStats, Side
+from trading_bot.core.sinks import CycleSink
+from trading_bot.strategies.base import Strategy
+from trading_bot.strategies.cdm import CDMStrategy
+from trading_bot.strategies.izrm import IZRMStrategy
+from trading_bot.strategies.wdm import WDMStrategy
+from trading_bot.strategies.zrm import ZRMStrategy
+
+_MIN_CHUNK = 64
+_MAX_CHUNK = 1 << 16
+_MAX_BACKOFF = 64
+
+
+def _cdm_mask(strategy: CDMStrategy, prices: np.ndarray) -> np.ndarray:
+    cfg = strategy.cfg
+    state = strategy.state
+    buy = cfg.initial_side == Side.BUY
+    if not state.active:
+        if cfg.price_trigger is None:
+            return np.ones(len(prices), dtype=bool)
+        return prices <= cfg.price_trigger if buy else prices >= cfg.price_trigger
+
+    mask = prices >= state.take_profit_price if buy else prices <= state.take_profit_price
+    if state.can_add:
+        mask |= prices <= state.next_add_price if buy else prices >= state.next_add_price
+    return mask
+
+
+def _wdm_mask(strategy: WDMStrategy, prices: np.ndarray) -> np.ndarray:
+    cfg = strategy.cfg
+    state = strategy.state
+    buy = cfg.initial_side == Side.BUY
+    if not state.active:
+        if cfg.price_trigger is None:
+            return np.ones(len(prices), dtype=bool)
+        return prices >= cfg.price_trigger if buy else prices <= cfg.price_trigger
+
+    # The stop trails the running extreme, so rebuild it per tick for this chunk.
+    if buy:
+        running = np.maximum.accumulate(np.maximum(prices, strategy._peak))
+        mask = prices <= running * strategy._stop_factor
+    else:
+        running = np.minimum.accumulate(np.minimum(prices, strategy._trough))
+        mask = prices >= running * strategy._stop_factor
+    if state.can_add:
+        mask |= prices >= state.next_add_price if buy else prices <= state.next_add_price
+    return mask
+
+
+def _zone_mask(strategy: Strategy, prices: np.ndarray) -> np.ndarray:
+    lower, upper = strategy._lower, strategy._upper
+    state = strategy.state
+    inside = (prices >= lower) & (prices <= upper)
+    if not state.active:
+        return inside if isinstance(strategy, ZRMStrategy) else ~inside
+
+    if isinstance(strategy, ZRMStrategy):
+        if strategy.cfg.initial_side == Side.BUY:
+            hit = prices >= state.take_profit_price
+        else:
+            hit = prices <= state.take_profit_price
+    elif strategy._long:
+        hit = prices <= state.stop_loss_price
+    else:
+        hit = prices >= state.stop_loss_price
+    mask = inside & hit
+    if state.can_add:
+        mask |= (prices <= lower) | (prices >= upper)
+    return mask
+
+
+def _trailing_mask(strategy: Strategy, prices: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Add ticks that arm, ratchet or hit the trailing stop."""
+    state = strategy.state
+    if state.trailing_next is None:
+        return mask
+    if strategy._trail_long:
+        mask |= prices >= state.trailing_next
+        if state.trailing_stop is not None:
+            mask |= prices <= state.trailing_stop
+    else:
+        mask |= prices <= state.trailing_next
+        if state.trailing_stop is not None:
+            mask |= prices >= state.trailing_stop
+    return mask
+
+
+def _strategy_mask(strategy: Strategy, prices: np.ndarray) -> np.ndarray:
+    if isinstance(strategy, CDMStrategy):
+        mask = _cdm_mask(strategy, prices)
+    elif isinstance(strategy, WDMStrategy):
+        mask = _wdm_mask(strategy, prices)
+    elif isinstance(strategy, (ZRMStrategy, IZRMStrategy)):
+        mask = _zone_mask(strategy, prices)
+    else:
+        # Unknown strategy types get every tick.
+        return np.ones(len(prices), dtype=bool)
+    return _trailing_mask(strategy, prices, mask)
+
+
+class VectorizedBacktester:
+    """Array-driven backtest that produces the same ``CycleStats`` as ``TradingEngine``.
+
+    Ticks where no routed strategy can enter, add a leg or exit are located with
+    batched NumPy comparisons against the current trigger levels, and their
+    drawdown updates are applied in bulk. Only the remaining ticks are dispatched
+    through ``TradingEngine.on_tick``, so state transitions use the exact same code.
+    """
+
+    def __init__(self, cfg: BotConfig, starting_equity: float = 100_000.0, sink: Optional[CycleSink] = None):
+        self.engine = TradingEngine(cfg, starting_equity=starting_equity, sink=sink)
+
+    def run(self, prices: np.ndarray, timestamps: np.ndarray, symbol: str) -> EngineResult:
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        timestamps = np.asarray(timestamps).astype("datetime64[us]")
+        if len(prices) != len(timestamps):
+            raise ValueError("prices and timestamps must have the same length.")
+
+        engine = self.engine
+        n = len(prices)
+        i = 0
+        # In dense stretches where nearly every tick acts, searching costs more than
+        # dispatching, so back off and feed ticks straight to the engine for a while.
+        resume = 0
+        backoff = 1
+        while i < n:
+            engine.on_tick(PriceTick(symbol=symbol, price=float(prices[i]), timestamp=timestamps[i].item()))
+            if not engine.cfg.shared.continue_trading and engine.sink.summary.count:
+                break
+            i += 1
+            if engine._active_cycle is None or i < resume:
+                continue
+            event = self._next_event(prices, i, symbol)
+            if event == i:
+                resume = i + backoff
+                backoff = min(backoff * 2, _MAX_BACKOFF)
+            else:
+                backoff = 1
+            i = event
+        return engine.result()
+
+    def _routed(self) -> Tuple[List[Strategy], Optional[Tuple[float, float]]]:
+        engine = self.engine
+        cfg = engine.cfg
+        if cfg.mode != StrategyMode.MULTIPLE:
+            strategy = engine.strategies.get(cfg.mode.value.replace("_ONLY", ""))
+            return ([strategy] if strategy else []), None
+        if cfg.submode == SubMode.PARALLEL:
+            return list(engine.strategies.values()), None
+
+        if engine._sequential_chosen is not None:
+            strategy = engine.strategies.get(engine._sequential_chosen)
+            return ([strategy] if strategy else []), None
+        strategy = engine.strategies.get(cfg.primary_strategy)
+        anchor = engine._initial_anchor
+        distance = cfg.second_order_distance_pct
+        return ([strategy] if strategy else []), (anchor * (1 - distance), anchor * (1 + distance))
+
+    def _next_event(self, prices: np.ndarray, start: int, symbol: str) -> int:
+        """Skip ahead to the next tick on which any routed strategy could act."""
+        routed, band = self._routed()
+        n = len(prices)
+        size = _MIN_CHUNK
+        i = start
+        while i < n:
+            stop = min(n, i + size)
+            chunk = prices[i:stop]
+            mask = np.zeros(len(chunk), dtype=bool)
+            for strategy in routed:
+                mask |= _strategy_mask(strategy, chunk)
+            if band is not None:
+                mask |= (chunk <= band[0]) | (chunk >= band[1])
+
+            hits = np.flatnonzero(mask)
+            if hits.size:
+                event = i + int(hits[0])
+                self._skip(routed, prices[i:event], symbol)
+                return event
+            self._skip(routed, chunk, symbol)
+            i = stop
+            size = min(size * 2, _MAX_CHUNK)
+        return n
+
+    def _skip(self, routed: List[Strategy], prices: np.ndarray, symbol: str):
+        """Apply the side effects ``on_tick`` would have had on idle ticks."""
+        if not len(prices):
+            return
+        for strategy in routed:
+            if isinstance(strategy, WDMStrategy) and strategy.state.active:
+                if strategy.cfg.initial_side == Side.BUY:
+                    high = float(prices.max())
+                    if high > strategy._peak:
+                        strategy._peak = high
+                        strategy.state.stop_loss_price = high * strategy._stop_factor
+                else:
+                    low = float(prices.min())
+                    if low < strategy._trough:
+                        strategy._trough = low
+                        strategy.state.stop_loss_price = low * strategy._stop_factor
+                self.engine.triggers.invalidate()
+        self._update_drawdown(prices, symbol)
+
+    def _update_drawdown(self, prices: np.ndarray, symbol: str):
+        engine = self.engine
+        tracker = engine.equity_tracker
+        others = tracker.unrealized - tracker.symbol_unrealized(symbol)
+        net_size, cost = engine.broker.net(symbol)
+        unrealized = others + (prices * net_size - cost)
+        _update_equity(engine._active_cycle, engine.equity + unrealized)
+        tracker.mark(symbol, float(prices[-1]))
+
+
+def _update_equity(stats: CycleStats, equity: np.ndarray):
+    """Vectorized ``CycleStats.update_equity`` over a run of equity marks."""
+    if stats.peak_equity <= 0.0:
+        for value in equity:
+            stats.update_equity(float(value))
+        return
+
+    peaks = np.maximum(np.maximum.accumulate(equity), stats.peak_equity)
+    stats.peak_equity = float(peaks[-1])
+    stats.trough_equity = min(stats.trough_equity, float(equity.min()))
+    stats.max_drawdown = max(stats.max_drawdown, float((peaks - equity).max()))
@@ -0,0 +1 @@
+# Tick data loaders and storage formats.
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import csv
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional
+
+from trading_bot.core.events import PriceTick
+
+# Binary tick files are a flat run of little-endian (epoch-ns int64, price float64) records.
+TICK_RECORD = struct.Struct("<qd")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def datetime_to_ns(ts: datetime) -> int:
+    """Epoch nanoseconds; aware timestamps are converted to UTC, naive ones are taken as UTC."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = ts - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def _parse_timestamp(raw: str) -> datetime:
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return _EPOCH + timedelta(seconds=float(raw))
+
+
+def iter_csv_ticks(path: str, symbol: Optional[str] = None, chunk_size: int = 65_536) -> Iterator[PriceTick]:
+    """Stream ticks from a CSV with a ``timestamp,price[,symbol]`` header.
+
+    Timestamps may be ISO-8601 strings or epoch seconds. ``symbol`` fills in
+    (or filters to) a single symbol. The file is read ``chunk_size`` bytes at a
+    time, so memory use does not depend on file length.
+    """
+    with open(path, newline="", buffering=chunk_size) as fh:
+        reader = csv.DictReader(fh)
+        for row in reader:
+            row_symbol = row.get("symbol") or symbol
+            if row_symbol is None:
+                raise ValueError(f"{path} has no symbol column; pass symbol=...")
+            if symbol is not None and row_symbol != symbol:
+                continue
+            yield PriceTick(symbol=row_symbol, price=float(row["price"]), timestamp=_parse_timestamp(row["timestamp"]))
+
+
+def iter_binary_ticks(path: str, symbol: str, chunk_size: int = 65_536, start: int = 0) -> Iterator[PriceTick]:
+    """Stream ticks from a binary tick file, ``chunk_size`` records at a time.
+
+    ``start`` seeks past that many records without reading them.
+    """
+    record_size = TICK_RECORD.size
+    with open(path, "rb") as fh:
+        fh.seek(start * record_size)
+        while True:
+            block = fh.read(chunk_size * record_size)
+            if not block:
+                return
+            usable = len(block) - len(block) % record_size
+            for ns, price in TICK_RECORD.iter_unpack(block[:usable]):
+                yield PriceTick(symbol=symbol, price=price, timestamp=ns_to_datetime(ns))
+
+
+def write_binary_ticks(path: str, ticks: Iterable[PriceTick], chunk_size: int = 65_536) -> int:
+    """Write ``ticks`` as a binary tick file. Returns the number of records written."""
+    count = 0
+    buf = bytearray()
+    with open(path, "wb") as fh:
+        for tick in ticks:
+            buf += TICK_RECORD.pack(datetime_to_ns(tick.timestamp), tick.price)
+            count += 1
+            if count % chunk_size == 0:
+                fh.write(buf)
+                buf.clear()
+        fh.write(buf)
+    return count
@@ -0,0 +1,194 @@
+"""Memory-mapped columnar tick store.
+
+A store is a directory holding one raw little-endian column per field plus a
+small JSON header::
+
+    prices.f64       float64 prices
+    timestamps.i64   int64 epoch nanoseconds (non-decreasing)
+    symbols.i32      int32 index into the header's symbol dictionary
+    meta.json        {"version": 1, "count": N, "symbols": [...]}
+
+Readers map the columns with ``numpy.memmap`` so opening a store costs a few
+syscalls and slices are views into the page cache.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from trading_bot.core.events import PriceTick
+from trading_bot.data.loaders import datetime_to_ns, ns_to_datetime
+
+_VERSION = 1
+_COLUMNS = {"prices": ("prices.f64", "<f8"), "timestamps": ("timestamps.i64", "<i8"), "symbols": ("symbols.i32", "<i4")}
+
+TimeBound = Union[None, datetime, np.datetime64, int]
+
+
+def _to_ns(bound: TimeBound) -> Optional[int]:
+    if bound is None or isinstance(bound, int):
+        return bound
+    if isinstance(bound, datetime):
+        return datetime_to_ns(bound)
+    return int(np.datetime64(bound, "ns").astype(np.int64))
+
+
+class TickStoreWriter:
+    """Append-only writer. Use as a context manager or call ``close()`` to publish the header."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._files = {name: open(os.path.join(path, fname), "wb") for name, (fname, _) in _COLUMNS.items()}
+        self._symbols: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._count = 0
+        self._last_ns: Optional[int] = None
+
+    def _code(self, symbol: str) -> int:
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return code
+
+    def append_arrays(self, prices: np.ndarray, timestamps: np.ndarray, symbol: str):
+        """Append a block for one symbol. ``timestamps`` are datetime64 or int64 epoch-ns."""
+        prices = np.asarray(prices, dtype="<f8")
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype.kind == "M":
+            timestamps = timestamps.astype("datetime64[ns]").view(np.int64)
+        timestamps = timestamps.astype("<i8", copy=False)
+        if len(prices) != len(timestamps):
+            raise ValueError("prices and timestamps must have the same length.")
+        if not len(prices):
+            return
+        if np.any(np.diff(timestamps) < 0) or (self._last_ns is not None and timestamps[0] < self._last_ns):
+            raise ValueError("TickStore timestamps must be non-decreasing.")
+
+        self._files["prices"].write(prices.tobytes())
+        self._files["timestamps"].write(timestamps.tobytes())
+        self._files["symbols"].write(np.full(len(prices), self._code(symbol), dtype="<i4").tobytes())
+        self._count += len(prices)
+        self._last_ns = int(timestamps[-1])
+
+    def append_ticks(self, ticks: Iterable[PriceTick], chunk_size: int = 65_536):
+        """Append a (possibly multi-symbol) tick stream in bounded-size blocks."""
+        prices: List[float] = []
+        stamps: List[int] = []
+        symbol: Optional[str] = None
+        for tick in ticks:
+            if (tick.symbol != symbol or len(prices) >= chunk_size) and prices:
+                self.append_arrays(np.array(prices), np.array(stamps, dtype=np.int64), symbol)
+                prices.clear()
+                stamps.clear()
+            symbol = tick.symbol
+            prices.append(tick.price)
+            stamps.append(datetime_to_ns(tick.timestamp))
+        if prices:
+            self.append_arrays(np.array(prices), np.array(stamps, dtype=np.int64), symbol)
+
+    def close(self):
+        for fh in self._files.values():
+            fh.close()
+        meta = {"version": _VERSION, "count": self._count, "symbols": self._symbols}
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def __enter__(self) -> "TickStoreWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass(frozen=True)
+class TickSlice:
+    """Arrays for a time range. Views into the store unless a symbol filter forced a copy."""
+
+    prices: np.ndarray
+    timestamps: np.ndarray
+    symbol_codes: np.ndarray
+    symbols: List[str]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def iter_ticks(self) -> Iterator[PriceTick]:
+        symbols = self.symbols
+        for code, ns, price in zip(self.symbol_codes.tolist(), self.timestamps.view(np.int64).tolist(), self.prices.tolist()):
+            yield PriceTick(symbol=symbols[code], price=price, timestamp=ns_to_datetime(ns))
+
+
+class TickStore:
+    """Read-only, memory-mapped view of a store written by ``TickStoreWriter``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as fh:
+            meta = json.load(fh)
+        if meta.get("version") != _VERSION:
+            raise ValueError(f"Unsupported TickStore version {meta.get('version')!r} in {path}.")
+        self.symbols: List[str] = meta["symbols"]
+        self._codes = {s: i for i, s in enumerate(self.symbols)}
+        count = meta["count"]
+
+        columns = {}
+        for name, (fname, dtype) in _COLUMNS.items():
+            if count:
+                columns[name] = np.memmap(os.path.join(path, fname), dtype=dtype, mode="r", shape=(count,))
+            else:
+                columns[name] = np.empty(0, dtype=dtype)
+        self.prices: np.ndarray = columns["prices"]
+        self.timestamps: np.ndarray = columns["timestamps"].view("datetime64[ns]")
+        self.symbol_codes: np.ndarray = columns["symbols"]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def _bounds(self, start: TimeBound, end: TimeBound) -> Tuple[int, int]:
+        ns = self.timestamps.view(np.int64)
+        lo = 0 if start is None else int(np.searchsorted(ns, _to_ns(start), side="left"))
+        hi = len(ns) if end is None else int(np.searchsorted(ns, _to_ns(end), side="left"))
+        return lo, hi
+
+    def range(self, start: TimeBound = None, end: TimeBound = None, symbol: Optional[str] = None) -> TickSlice:
+        """Ticks with ``start <= timestamp < end``, optionally for a single symbol."""
+        lo, hi = self._bounds(start, end)
+        prices = self.prices[lo:hi]
+        timestamps = self.timestamps[lo:hi]
+        codes = self.symbol_codes[lo:hi]
+        if symbol is not None:
+            code = self._codes.get(symbol)
+            if code is None:
+                raise KeyError(f"Symbol {symbol!r} is not in TickStore {self.path}.")
+            if len(self.symbols) > 1:
+                keep = codes == code
+                prices, timestamps, codes = prices[keep], timestamps[keep], codes[keep]
+        return TickSlice(prices=prices, timestamps=timestamps, symbol_codes=codes, symbols=self.symbols)
+
+
+def iter_store_ticks(path: str, symbols: Optional[Sequence[str]] = None) -> Iterator[PriceTick]:
+    """Stream a store's ticks in time order, optionally restricted to ``symbols``.
+
+    Module-level so ``functools.partial(iter_store_ticks, path)`` can be shipped
+    to worker processes as a ``run_sharded`` tick source.
+    """
+    store = TickStore(path)
+    codes = [store._codes[s] for s in symbols if s in store._codes] if symbols is not None else None
+    step = 1 << 16
+    for lo in range(0, len(store), step):
+        prices = store.prices[lo : lo + step]
+        timestamps = store.timestamps[lo : lo + step]
+        sym_codes = store.symbol_codes[lo : lo + step]
+        if codes is not None:
+            keep = np.isin(sym_codes, codes)
+            prices, timestamps, sym_codes = prices[keep], timestamps[keep], sym_codes[keep]
+        yield from TickSlice(prices, timestamps, sym_codes, store.symbols).iter_ticks()
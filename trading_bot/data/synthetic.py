@@ -0,0 +1,72 @@
+"""Seeded synthetic price paths for benchmarks and what-if runs."""
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, Tuple
+
+import numpy as np
+
+from trading_bot.core.events import PriceTick
+from trading_bot.data.loaders import ns_to_datetime
+
+_START_NS = 1_735_723_800 * 1_000_000_000  # 2025-01-01 09:30 UTC
+
+
+def _timestamps(count: int, step_s: float) -> np.ndarray:
+    return (_START_NS + np.arange(count, dtype=np.int64) * int(step_s * 1e9)).astype("datetime64[ns]")
+
+
+def random_walk(count: int, seed: int = 0, start_price: float = 100.0, vol: float = 0.001) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return start_price * np.exp(np.cumsum(rng.normal(0.0, vol, count)))
+
+
+def trend(count: int, seed: int = 0, start_price: float = 100.0, vol: float = 0.001, drift: float = 0.0002) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return start_price * np.exp(np.cumsum(rng.normal(drift, vol, count)))
+
+
+def mean_reversion(
+    count: int, seed: int = 0, start_price: float = 100.0, vol: float = 0.001, speed: float = 0.02
+) -> np.ndarray:
+    """Ornstein-Uhlenbeck log-price around ``start_price``."""
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0.0, vol, count)
+    x = np.empty(count)
+    level = 0.0
+    for i in range(count):
+        level += -speed * level + shocks[i]
+        x[i] = level
+    return start_price * np.exp(x)
+
+
+def gap(
+    count: int, seed: int = 0, start_price: float = 100.0, vol: float = 0.001, gap_every: int = 390, gap_size: float = 0.01
+) -> np.ndarray:
+    """Random walk with a jump of ``+-gap_size`` every ``gap_every`` ticks (session opens)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, vol, count)
+    opens = np.arange(gap_every, count, gap_every)
+    steps[opens] += rng.choice([-gap_size, gap_size], size=len(opens))
+    return start_price * np.exp(np.cumsum(steps))
+
+
+GENERATORS: Dict[str, Callable[..., np.ndarray]] = {
+    "random_walk": random_walk,
+    "trend": trend,
+    "mean_reversion": mean_reversion,
+    "gap": gap,
+}
+
+
+def generate(kind: str, count: int, seed: int = 0, step_s: float = 1.0, **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(prices, timestamps)`` for one of ``GENERATORS``."""
+    try:
+        gen = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown generator {kind!r}; expected one of {sorted(GENERATORS)}.") from None
+    return gen(count, seed=seed, **kwargs), _timestamps(count, step_s)
+
+
+def to_ticks(prices: np.ndarray, timestamps: np.ndarray, symbol: str) -> Iterator[PriceTick]:
+    for price, ns in zip(prices.tolist(), timestamps.astype("datetime64[ns]").view(np.int64).tolist()):
+        yield PriceTick(symbol=symbol, price=price, timestamp=ns_to_datetime(ns))
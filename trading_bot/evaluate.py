@@ -0,0 +1,215 @@
+"""Out-of-sample evaluation: walk-forward windows and Monte Carlo resampled paths.
+
+    python -m trading_bot.evaluate walk-forward --ticks 20000 --train 4000 --test 2000 \\
+        --grid 'cdm.max_orders=[3, 5]'
+    python -m trading_bot.evaluate monte-carlo --ticks 20000 --paths 200 --block 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_bot.config import BotConfig
+from trading_bot.sweep import (
+    SweepResult,
+    _parse_grid,
+    _run_one,
+    expand_grid,
+    run_arrays,
+    shared_tick_pool,
+    worker_ticks,
+)
+
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def describe(values: Sequence[float]) -> Dict[str, float]:
+    """Mean, spread and percentiles of a sample."""
+    arr = np.asarray(values, dtype=np.float64)
+    if not len(arr):
+        return {"n": 0}
+    out = {
+        "n": len(arr),
+        "mean": float(arr.mean()),
+        "std": float(arr.std(ddof=1)) if len(arr) > 1 else 0.0,
+        "min": float(arr.min()),
+        "max": float(arr.max()),
+    }
+    out.update({f"p{q}": float(v) for q, v in zip(_PERCENTILES, np.percentile(arr, _PERCENTILES))})
+    return out
+
+
+def _best(results: Sequence[SweepResult]) -> int:
+    """Index of the best result: highest PnL, then shallowest drawdown, then grid order."""
+    return min(range(len(results)), key=lambda i: (-results[i].total_pnl, results[i].max_drawdown, i))
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    train_start: int
+    train_end: int
+    test_end: int
+    params: Dict[str, Any]
+    train: SweepResult
+    test: SweepResult
+
+
+def walk_forward_windows(count: int, train: int, test: int, step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """``(train_start, train_end, test_end)`` tick indices, rolling forward by ``step`` (default ``test``)."""
+    if train <= 0 or test <= 0:
+        raise ValueError("train and test must be positive.")
+    step = step or test
+    return [(s, s + train, s + train + test) for s in range(0, count - train - test + 1, step)]
+
+
+def walk_forward(
+    base: BotConfig,
+    grid: Dict[str, Sequence[Any]],
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    symbol: str,
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    starting_equity: float = 100_000.0,
+    workers: Optional[int] = None,
+) -> List[WalkForwardWindow]:
+    """Pick the best grid point on each training window and score it on the window after.
+
+    Every (window, grid point) training run and every test run goes to one
+    shared-memory process pool.
+    """
+    windows = walk_forward_windows(len(prices), train, test, step)
+    runs = expand_grid(base, grid)
+    with shared_tick_pool(prices, timestamps, symbol, workers) as pool:
+        train_futures = [
+            [pool.submit(_run_one, params, cfg, starting_equity, start, mid) for params, cfg in runs]
+            for start, mid, _ in windows
+        ]
+        trained = [[f.result() for f in futures] for futures in train_futures]
+        picks = [_best(results) for results in trained]
+        test_futures = [
+            pool.submit(_run_one, runs[k][0], runs[k][1], starting_equity, mid, end)
+            for k, (_, mid, end) in zip(picks, windows)
+        ]
+        return [
+            WalkForwardWindow(start, mid, end, runs[k][0], results[k], future.result())
+            for (start, mid, end), k, results, future in zip(windows, picks, trained, test_futures)
+        ]
+
+
+def walk_forward_summary(windows: Sequence[WalkForwardWindow]) -> Dict[str, Any]:
+    return {
+        "windows": len(windows),
+        "test_total_pnl": float(sum(w.test.total_pnl for w in windows)),
+        "test_pnl": describe([w.test.total_pnl for w in windows]),
+        "test_max_drawdown": describe([w.test.max_drawdown for w in windows]),
+        "train_pnl": describe([w.train.total_pnl for w in windows]),
+    }
+
+
+def bootstrap_path(prices: np.ndarray, rng: np.random.Generator, block: int = 1) -> np.ndarray:
+    """Resample log returns in circular blocks of ``block`` ticks and rebuild prices from the first one.
+
+    ``block=1`` is a plain i.i.d. resample; longer blocks keep short-range
+    autocorrelation such as trends and mean reversion.
+    """
+    returns = np.diff(np.log(prices))
+    n = len(returns)
+    if n == 0:
+        return prices.copy()
+    block = max(1, min(block, n))
+    starts = rng.integers(0, n, size=-(-n // block))
+    index = ((starts[:, None] + np.arange(block)).ravel()[:n]) % n
+    return prices[0] * np.exp(np.concatenate(([0.0], np.cumsum(returns[index]))))
+
+
+def _run_path(cfg: BotConfig, starting_equity: float, seed: np.random.SeedSequence, block: int) -> SweepResult:
+    prices, timestamps, symbol = worker_ticks()
+    path = bootstrap_path(prices, np.random.default_rng(seed), block)
+    return run_arrays({}, cfg, starting_equity, path, timestamps, symbol)
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    # One entry per path, in seed order.
+    total_pnl: np.ndarray
+    max_drawdown: np.ndarray
+    cycles: np.ndarray
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "paths": len(self.total_pnl),
+            "prob_loss": float(np.mean(self.total_pnl < 0)) if len(self.total_pnl) else 0.0,
+            "total_pnl": describe(self.total_pnl),
+            "max_drawdown": describe(self.max_drawdown),
+            "cycles": describe(self.cycles),
+        }
+
+
+def monte_carlo(
+    cfg: BotConfig,
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    symbol: str,
+    paths: int = 100,
+    block: int = 1,
+    seed: int = 0,
+    starting_equity: float = 100_000.0,
+    workers: Optional[int] = None,
+) -> MonteCarloResult:
+    """Backtest ``cfg`` on ``paths`` bootstrapped versions of the price series.
+
+    Path ``i`` is drawn from child ``i`` of ``SeedSequence(seed)``, so results
+    do not depend on the worker count or scheduling.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(paths)
+    with shared_tick_pool(prices, timestamps, symbol, workers) as pool:
+        results = [f.result() for f in [pool.submit(_run_path, cfg, starting_equity, s, block) for s in seeds]]
+    return MonteCarloResult(
+        total_pnl=np.array([r.total_pnl for r in results]),
+        max_drawdown=np.array([r.max_drawdown for r in results]),
+        cycles=np.array([r.cycles for r in results]),
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from trading_bot.data.synthetic import GENERATORS, generate
+    from trading_bot.main import build_demo_config
+
+    parser = argparse.ArgumentParser(description="Walk-forward and Monte Carlo runs of the demo config.")
+    parser.add_argument("kind", choices=["walk-forward", "monte-carlo"])
+    parser.add_argument("--data", choices=sorted(GENERATORS), default="random_walk")
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--train", type=int, default=4_000)
+    parser.add_argument("--test", type=int, default=2_000)
+    parser.add_argument("--grid", action="append", default=[], help="As in trading_bot.sweep.")
+    parser.add_argument("--paths", type=int, default=100)
+    parser.add_argument("--block", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    prices, timestamps = generate(args.data, args.ticks, seed=args.seed)
+    cfg = build_demo_config()
+    if args.kind == "walk-forward":
+        windows = walk_forward(
+            cfg, _parse_grid(args.grid), prices, timestamps, "SPY", args.train, args.test, workers=args.workers
+        )
+        for w in windows:
+            print(
+                f"[{w.train_start}:{w.train_end}] -> [{w.train_end}:{w.test_end}] "
+                f"train {w.train.total_pnl:.2f} test {w.test.total_pnl:.2f} {json.dumps(w.params)}"
+            )
+        print(json.dumps(walk_forward_summary(windows), indent=2))
+    else:
+        result = monte_carlo(cfg, prices, timestamps, "SPY", args.paths, args.block, args.seed, workers=args.workers)
+        print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import math
 from datetime import datetime, timedelta
+from typing import Iterator
 
 from trading_bot.config import (
     BotConfig,
@@ -15,18 +16,21 @@ from trading_bot.config import (
 )
 from trading_bot.core.engine import TradingEngine
 from trading_bot.core.events import PriceTick
+from trading_bot.report import build_report, format_report
 
 
-def make_sine_ticks(symbol: str, start_price: float = 100.0, count: int = 800) -> list[PriceTick]:
+def iter_sine_ticks(symbol: str, start_price: float = 100.0, count: int = 800) -> Iterator[PriceTick]:
     start = datetime(2025, 1, 1, 9, 30)
-    ticks = []
     for i in range(count):
         price = start_price * (1 + 0.02 * math.sin(i / 30.0)) * (1 + 0.00005 * i)
-        ticks.append(PriceTick(symbol=symbol, price=float(price), timestamp=start + timedelta(minutes=i)))
-    return ticks
+        yield PriceTick(symbol=symbol, price=float(price), timestamp=start + timedelta(minutes=i))
 
 
-def main():
+def make_sine_ticks(symbol: str, start_price: float = 100.0, count: int = 800) -> list[PriceTick]:
+    return list(iter_sine_ticks(symbol, start_price, count))
+
+
+def build_demo_config() -> BotConfig:
     shared = SharedSettings(
         continue_trading=True,
         repeat_on_close=True,
@@ -64,7 +68,7 @@ def main():
         trailing_enabled=False,
     )
 
-    cfg = BotConfig(
+    return BotConfig(
         shared=shared,
         mode=StrategyMode.MULTIPLE,
         submode=SubMode.SEQUENTIAL,
@@ -76,16 +80,17 @@ def main():
         izrm=None,
     )
 
-    ticks = make_sine_ticks("SPY", 100.0, 800)
+
+def main():
+    cfg = build_demo_config()
     engine = TradingEngine(cfg, starting_equity=100_000.0)
-    result = engine.run_backtest(ticks)
+    result = engine.run_backtest(iter_sine_ticks("SPY", 100.0, 800))
 
-    print(f"Cycles: {len(result.cycles)}")
+    if cfg.shared.backtest_report:
+        print(format_report(build_report(result.cycles, starting_equity=engine.starting_equity)))
+    else:
+        print(f"Cycles: {result.summary.count} | total PnL {result.summary.total_pnl:.2f}")
     if result.cycles:
-        profits = [c.realized_pnl for c in result.cycles]
-        max_dd = [c.max_drawdown for c in result.cycles]
-        print(f"Avg PnL/cycle: {sum(profits)/len(profits):.2f}")
-        print(f"Max DD (avg): {sum(max_dd)/len(max_dd):.2f}")
         for cycle in result.cycles[:5]:
             print(
                 f"Cycle {cycle.cycle_id} | start {cycle.start_ts} | end {cycle.end_ts} | "
@@ -0,0 +1,191 @@
+"""Backtest analytics over per-cycle arrays.
+
+Works on ``CYCLE_DTYPE`` record arrays, either converted from ``CycleStats``
+or memory-mapped straight from a ``BinarySink`` file, so every metric is a
+handful of NumPy passes regardless of cycle count.
+
+    python -m trading_bot.report cycles.bin --json report.json --csv cycles.csv
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from trading_bot.core.models import CycleStats
+from trading_bot.core.sinks import CYCLE_DTYPE, cycles_to_array, load_cycle_array
+
+_NS_PER_DAY = 86_400 * 1_000_000_000
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class BacktestReport:
+    metrics: Dict[str, float]
+    cycle_length_s: Dict[str, float]
+    # Per cycle, in close order.
+    records: np.ndarray = field(repr=False)
+    equity: np.ndarray = field(repr=False)
+    returns: np.ndarray = field(repr=False)
+    drawdown: np.ndarray = field(repr=False)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {"metrics": self.metrics, "cycle_length_s": self.cycle_length_s}
+
+    def write_json(self, path: str):
+        with open(path, "w") as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+
+    def write_csv(self, path: str, chunk_size: int = 65_536):
+        """One row per cycle with its return and the equity curve after it closed."""
+        r = self.records
+        # Per-row %-formatting is the cheapest float-to-text path without pandas.
+        line = "%d,%s,%s,%s,%.10g,%.10g,%.10g,%.10g,%.10g,%.10g\n"
+        with open(path, "w") as fh:
+            fh.write("cycle_id,symbol,start,end,realized_pnl,return,equity,drawdown,max_drawdown,duration_s\n")
+            for lo in range(0, len(r), chunk_size):
+                hi = lo + chunk_size
+                chunk = r[lo:hi]
+                rows = zip(
+                    chunk["cycle_id"].tolist(),
+                    np.char.decode(chunk["symbol"]).tolist(),
+                    np.datetime_as_string(chunk["start_ns"].astype("datetime64[ns]").astype("datetime64[us]")).tolist(),
+                    np.datetime_as_string(chunk["end_ns"].astype("datetime64[ns]").astype("datetime64[us]")).tolist(),
+                    chunk["realized_pnl"].tolist(),
+                    self.returns[lo:hi].tolist(),
+                    self.equity[lo:hi].tolist(),
+                    self.drawdown[lo:hi].tolist(),
+                    chunk["max_drawdown"].tolist(),
+                    ((chunk["end_ns"] - chunk["start_ns"]) / 1e9).tolist(),
+                )
+                fh.write("".join([line % row for row in rows]))
+
+
+def _as_records(cycles: Union[np.ndarray, Iterable[CycleStats]]) -> np.ndarray:
+    if isinstance(cycles, np.ndarray):
+        if cycles.dtype != CYCLE_DTYPE:
+            raise ValueError("Expected a CYCLE_DTYPE record array.")
+        return cycles
+    return cycles_to_array(list(cycles))
+
+
+def _ratio(mean: float, dev: float, periods_per_year: float) -> float:
+    return mean / dev * math.sqrt(periods_per_year) if dev > 0 else 0.0
+
+
+def build_report(
+    cycles: Union[np.ndarray, Iterable[CycleStats]],
+    starting_equity: Optional[float] = None,
+    periods_per_year: float = 365.0,
+) -> BacktestReport:
+    """Compute the report for closed cycles (any order; sorted by close time here).
+
+    The equity curve is realized equity after each close. Sharpe and Sortino
+    use daily returns over every calendar day from the first cycle start to the
+    last close, annualized with ``periods_per_year``. ``starting_equity``
+    defaults to the first cycle's start equity; pass the total for merged
+    multi-symbol results. Exposure is time inside a cycle over the span, per
+    symbol.
+    """
+    records = _as_records(cycles)
+    records = records[records["end_ns"] >= 0]
+    records = records[np.argsort(records["end_ns"], kind="stable")]
+    n = len(records)
+    empty = np.zeros(0)
+    if n == 0:
+        return BacktestReport({"cycles": 0}, {}, records, empty, empty, empty)
+
+    pnl = records["realized_pnl"]
+    start_ns = records["start_ns"]
+    end_ns = records["end_ns"]
+    if starting_equity is None:
+        starting_equity = float(records["start_equity"][0])
+
+    equity = starting_equity + np.cumsum(pnl)
+    before = np.concatenate(([starting_equity], equity[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(before != 0, pnl / before, 0.0)
+
+    # Drawdown of the realized curve and how long it stayed below its last peak.
+    peak = np.maximum.accumulate(np.concatenate(([starting_equity], equity)))[1:]
+    drawdown = peak - equity
+    t0 = int(start_ns.min())
+    index = np.arange(n)
+    last_peak = np.maximum.accumulate(np.where(drawdown == 0, index, -1))
+    peak_time = np.where(last_peak >= 0, end_ns[np.maximum(last_peak, 0)], t0)
+    underwater_s = np.where(drawdown > 0, (end_ns - peak_time) / 1e9, 0.0)
+
+    # Daily returns, with zeros on days without closes.
+    day = (end_ns - (t0 - t0 % _NS_PER_DAY)) // _NS_PER_DAY
+    daily_pnl = np.bincount(day, weights=pnl)
+    daily_equity = starting_equity + np.concatenate(([0.0], np.cumsum(daily_pnl)[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = np.where(daily_equity != 0, daily_pnl / daily_equity, 0.0)
+    mean = float(daily.mean())
+    std = float(daily.std(ddof=1)) if len(daily) > 1 else 0.0
+    downside = float(np.sqrt(np.mean(np.minimum(daily, 0.0) ** 2)))
+
+    durations = (end_ns - start_ns) / 1e9
+    span_s = (int(end_ns.max()) - t0) / 1e9
+    symbols = len(np.unique(records["symbol"]))
+    metrics = {
+        "cycles": n,
+        "total_pnl": float(pnl.sum()),
+        "mean_pnl": float(pnl.mean()),
+        "win_rate": float(np.count_nonzero(pnl > 0) / n),
+        "sharpe": _ratio(mean, std, periods_per_year),
+        "sortino": _ratio(mean, downside, periods_per_year),
+        "days": len(daily),
+        "max_drawdown": float(drawdown.max()),
+        "max_drawdown_duration_s": float(underwater_s.max()),
+        "max_intracycle_drawdown": float(records["max_drawdown"].max()),
+        "mean_intracycle_drawdown": float(records["max_drawdown"].mean()),
+        "exposure": float(durations.sum() / (span_s * symbols)) if span_s > 0 else 0.0,
+        "final_equity": float(equity[-1]),
+    }
+    cycle_length = {f"p{q}": float(v) for q, v in zip(_PERCENTILES, np.percentile(durations, _PERCENTILES))}
+    cycle_length.update(mean=float(durations.mean()), max=float(durations.max()))
+    return BacktestReport(metrics, cycle_length, records, equity, returns, drawdown)
+
+
+def format_report(report: BacktestReport) -> str:
+    m = report.metrics
+    if not m["cycles"]:
+        return "No closed cycles."
+    lengths = report.cycle_length_s
+    return "\n".join(
+        [
+            f"Cycles: {m['cycles']} | total PnL {m['total_pnl']:.2f} | mean {m['mean_pnl']:.2f} | win rate {m['win_rate']:.1%}",
+            f"Sharpe {m['sharpe']:.2f} | Sortino {m['sortino']:.2f} over {m['days']} days",
+            f"Max DD {m['max_drawdown']:.2f} (underwater {m['max_drawdown_duration_s'] / 3600:.1f}h) | "
+            f"intra-cycle DD max {m['max_intracycle_drawdown']:.2f} avg {m['mean_intracycle_drawdown']:.2f} | "
+            f"exposure {m['exposure']:.1%}",
+            f"Cycle length p50 {lengths['p50']:.0f}s p95 {lengths['p95']:.0f}s max {lengths['max']:.0f}s",
+        ]
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report on a BinarySink cycle file.")
+    parser.add_argument("path")
+    parser.add_argument("--starting-equity", type=float)
+    parser.add_argument("--json", help="Write metrics JSON here.")
+    parser.add_argument("--csv", help="Write the per-cycle table here.")
+    args = parser.parse_args(argv)
+
+    report = build_report(load_cycle_array(args.path), starting_equity=args.starting_equity)
+    print(format_report(report))
+    if args.json:
+        report.write_json(args.json)
+    if args.csv:
+        report.write_csv(args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,32 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+import math
+from typing import List, Optional, Tuple
 
-from trading_bot.broker.base import Broker
+from trading_bot.broker.base import Broker, OrderRejected
 from trading_bot.config import MartingaleConfig
 from trading_bot.core.events import PriceTick
-from trading_bot.core.models import Position
+from trading_bot.core.models import Side
+from trading_bot.core.utils import pct
 
 
-@dataclass
+# Open price interval on which ``on_price`` is a no-op; ``None`` when the next tick may act.
+QuietBand = Optional[Tuple[float, float]]
+
+
+def band_outside(price: float, lo: float, hi: float) -> QuietBand:
+    """Quiet interval around ``price`` when only prices in ``[lo, hi]`` can trigger."""
+    if lo > hi:
+        return (-math.inf, math.inf)
+    if price < lo:
+        return (-math.inf, lo)
+    if price > hi:
+        return (hi, math.inf)
+    return None
+
+
+@dataclass(slots=True)
 class StrategyState:
     active: bool = False
     current_leg: int = 0
@@ -18,6 +35,15 @@ class StrategyState:
     trailing_stop: Optional[float] = None
     realized_pnl: float = 0.0
 
+    # Trigger ladder compiled by the strategy at entry and after every fill, so
+    # idle ticks only compare against these instead of re-deriving them.
+    can_add: bool = False
+    next_add_price: Optional[float] = None
+    take_profit_price: Optional[float] = None
+    stop_loss_price: Optional[float] = None
+    # Price at which the trailing stop arms, then the price it next ratchets at.
+    trailing_next: Optional[float] = None
+
 
 class Strategy(ABC):
     name: str
@@ -26,16 +52,110 @@ class Strategy(ABC):
         self.cfg = cfg
         self.broker = broker
         self.state = StrategyState()
-        self.position = Position(symbol=cfg.symbol)
+        # The broker's ledger entry for this strategy; fills land in it directly.
+        self.position = broker.position(cfg.symbol, self.name)
+        self._trail_long = True
 
     @abstractmethod
     def on_price(self, tick: PriceTick) -> Optional[float]:
         """Handle a price tick. Return realized PnL when a cycle closes."""
         ...
 
+    def _place(self, side: Side, size: float, tick: PriceTick) -> bool:
+        """Order ``size`` at the tick price into this strategy's position; False if the broker rejected it.
+
+        A rejected entry leaves the strategy flat and a rejected add leaves the
+        ladder as it was, so the order is retried on the next tick that triggers it.
+        Without ``hold_previous`` an add first closes the ladder, so a rejected
+        re-entry ends the cycle flat instead.
+        """
+        try:
+            self.broker.place_order(self.cfg.symbol, side, size, tick.price, tick.timestamp.isoformat(), self.name)
+        except OrderRejected:
+            return False
+        return True
+
+    def _can_add(self) -> bool:
+        leg = self.state.current_leg
+        return leg < self.cfg.max_orders and leg < len(self.cfg.order_distances_pct) and leg < len(self.cfg.order_sizes)
+
+    def _level(self, values: List[float]) -> float:
+        """Ratio from ``values`` for the most recently filled leg."""
+        last_idx = max(0, self.state.current_leg - 1)
+        return pct(values[min(last_idx, len(values) - 1)])
+
+    def _arm_trailing(self, long: bool):
+        """Set the activation price off the average entry unless the stop is already trailing."""
+        state = self.state
+        if not self.cfg.trailing_enabled or state.trailing_stop is not None:
+            return
+        self._trail_long = long
+        first_move = pct(self.cfg.trailing_first_move_pct)
+        avg = self.position.avg_entry_price()
+        state.trailing_next = avg * (1 + first_move) if long else avg * (1 - first_move)
+
+    def _trailing_hit(self, price: float) -> bool:
+        """Ratchet the trailing stop when price clears ``trailing_next``; True once the stop is hit.
+
+        The stop moves only after price advances a full step past the last move,
+        so ticks in between cost two comparisons however many legs are open.
+        """
+        state = self.state
+        if state.trailing_next is None:
+            return False
+        step = pct(self.cfg.trailing_step_pct)
+        if self._trail_long:
+            if price >= state.trailing_next:
+                state.trailing_stop = price * (1 - step)
+                state.trailing_next = price * (1 + step)
+                return False
+            return state.trailing_stop is not None and price <= state.trailing_stop
+        if price <= state.trailing_next:
+            state.trailing_stop = price * (1 + step)
+            state.trailing_next = price * (1 - step)
+            return False
+        return state.trailing_stop is not None and price >= state.trailing_stop
+
+    def _trailing_band(self, band: QuietBand) -> QuietBand:
+        """Narrow ``band`` so the next trailing ratchet or stop hit is dispatched."""
+        state = self.state
+        if band is None or state.trailing_next is None:
+            return band
+        lo, hi = band
+        stop = state.trailing_stop
+        if self._trail_long:
+            hi = min(hi, state.trailing_next)
+            if stop is not None:
+                lo = max(lo, stop)
+        else:
+            lo = max(lo, state.trailing_next)
+            if stop is not None:
+                hi = min(hi, stop)
+        return (lo, hi)
+
+    def quiet_band(self, price: float) -> QuietBand:
+        """Interval around ``price`` where ``on_price`` cannot change state.
+
+        Derived from the compiled ladder, so it is only valid until the next
+        state change.
+        """
+        return self._trailing_band(self._ladder_band(price))
+
+    def _ladder_band(self, price: float) -> QuietBand:
+        """Quiet interval from entry, add and exit levels; ``None`` when unknown."""
+        return None
+
+    def travel_band(self, price: float) -> QuietBand:
+        """Interval around ``price`` that a steady move can cross without an order or exit.
+
+        Equal to ``quiet_band`` unless the strategy also updates state at prices
+        in between, where only the final price of the move matters.
+        """
+        return self.quiet_band(price)
+
     def is_enabled(self) -> bool:
         return bool(self.cfg and self.cfg.enabled)
 
     def _reset(self):
-        self.position.legs.clear()
+        self.position.clear()
         self.state = StrategyState()
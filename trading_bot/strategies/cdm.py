@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+import math
 from typing import Optional
 
 from trading_bot.core.events import PriceTick
-from trading_bot.core.models import Leg, Side
+from trading_bot.core.models import Side
 from trading_bot.core.utils import pct
-from trading_bot.strategies.base import Strategy
+from trading_bot.strategies.base import QuietBand, Strategy
 
 
 class CDMStrategy(Strategy):
@@ -23,54 +23,69 @@ class CDMStrategy(Strategy):
 
     def _enter(self, tick: PriceTick):
         size0 = self.cfg.order_sizes[0]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size0, tick):
+            return
         self.state.active = True
         self.state.current_leg = 1
         self.state.anchor_price = tick.price
+        self._compile()
 
-    def _maybe_add_leg(self, tick: PriceTick):
-        if not self.state.active:
-            return
-        if self.state.current_leg >= self.cfg.max_orders:
-            return
-        if self.state.current_leg >= len(self.cfg.order_distances_pct):
-            return
-        if self.state.current_leg >= len(self.cfg.order_sizes):
-            return
-
+    def _compile(self):
+        """Precompute the next-leg and take-profit prices from the current average entry."""
+        state = self.state
         avg = self.position.avg_entry_price()
-        distance = pct(self.cfg.order_distances_pct[self.state.current_leg])
-        trigger_price = avg * (1 - distance) if self.cfg.initial_side == Side.BUY else avg * (1 + distance)
+        buy = self.cfg.initial_side == Side.BUY
+        take_profit = self._level(self.cfg.order_tps_pct)
+        state.take_profit_price = avg * (1 + take_profit) if buy else avg * (1 - take_profit)
+        state.can_add = self._can_add()
+        if state.can_add:
+            distance = pct(self.cfg.order_distances_pct[state.current_leg])
+            state.next_add_price = avg * (1 - distance) if buy else avg * (1 + distance)
+        else:
+            state.next_add_price = None
+        self._arm_trailing(buy)
 
-        should_add = tick.price <= trigger_price if self.cfg.initial_side == Side.BUY else tick.price >= trigger_price
-        if not should_add:
+    def _maybe_add_leg(self, tick: PriceTick):
+        if not self.state.can_add:
+            return
+        if self.cfg.initial_side == Side.BUY:
+            if tick.price > self.state.next_add_price:
+                return
+        elif tick.price < self.state.next_add_price:
             return
 
         if not self.cfg.hold_previous and self.position.legs:
-            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
             self.state.realized_pnl += realized
-            self.position.legs.clear()
             self.state.current_leg = 0
 
         size = self.cfg.order_sizes[self.state.current_leg]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size, tick):
+            return
         self.state.current_leg += 1
+        self._compile()
 
     def _maybe_exit(self, tick: PriceTick) -> bool:
         if not self.position.legs:
             return False
-        last_idx = max(0, self.state.current_leg - 1)
-        take_profit = pct(self.cfg.order_tps_pct[min(last_idx, len(self.cfg.order_tps_pct) - 1)])
-        avg = self.position.avg_entry_price()
-
         if self.cfg.initial_side == Side.BUY:
-            return tick.price >= avg * (1 + take_profit)
-        return tick.price <= avg * (1 - take_profit)
+            return tick.price >= self.state.take_profit_price
+        return tick.price <= self.state.take_profit_price
+
+    def _ladder_band(self, price: float) -> QuietBand:
+        state = self.state
+        buy = self.cfg.initial_side == Side.BUY
+        if not state.active:
+            trigger = self.cfg.price_trigger
+            if trigger is None:
+                return None
+            return (trigger, math.inf) if buy else (-math.inf, trigger)
+        if buy:
+            return (state.next_add_price if state.can_add else -math.inf, state.take_profit_price)
+        return (state.take_profit_price, state.next_add_price if state.can_add else math.inf)
 
     def _close_cycle(self, tick: PriceTick) -> float:
-        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
         total_realized = realized + self.state.realized_pnl
         self._reset()
         return total_realized
@@ -82,8 +97,12 @@ class CDMStrategy(Strategy):
             return None
 
         self._maybe_add_leg(tick)
+        if not self.position.legs:
+            # Without hold_previous the add closed the ladder first; its
+            # re-entry was rejected, so the cycle ends flat.
+            return self._close_cycle(tick)
 
-        if self._maybe_exit(tick):
+        if self._maybe_exit(tick) or self._trailing_hit(tick.price):
             return self._close_cycle(tick)
 
         return None
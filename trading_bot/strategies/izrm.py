@@ -4,9 +4,9 @@ from typing import Optional
 
 from trading_bot.config import ZoneConfig
 from trading_bot.core.events import PriceTick
-from trading_bot.core.models import Leg, Side
+from trading_bot.core.models import Side
 from trading_bot.core.utils import pct
-from trading_bot.strategies.base import Strategy
+from trading_bot.strategies.base import QuietBand, Strategy, band_outside
 
 
 class IZRMStrategy(Strategy):
@@ -15,6 +15,7 @@ class IZRMStrategy(Strategy):
     def __init__(self, cfg: ZoneConfig, broker):
         super().__init__(cfg, broker)
         self.cfg: ZoneConfig = cfg
+        self._lower, self._upper = self._bounds()
         self._breakout_side: Optional[Side] = None
 
     def _bounds(self):
@@ -25,11 +26,10 @@ class IZRMStrategy(Strategy):
     def _should_enter(self, tick: PriceTick) -> bool:
         if self.state.active:
             return False
-        lower, upper = self._bounds()
-        if tick.price > upper:
+        if tick.price > self._upper:
             self._breakout_side = Side.SELL
             return True
-        if tick.price < lower:
+        if tick.price < self._lower:
             self._breakout_side = Side.BUY
             return True
         return False
@@ -37,55 +37,65 @@ class IZRMStrategy(Strategy):
     def _enter(self, tick: PriceTick):
         side = self._breakout_side or self.cfg.initial_side
         size0 = self.cfg.order_sizes[0]
-        self.broker.place_order(self.cfg.symbol, side, size0, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(side, size0, tick.price, tick.timestamp.isoformat()))
+        if not self._place(side, size0, tick):
+            return
         self.state.active = True
         self.state.current_leg = 1
+        self._compile()
+
+    def _compile(self):
+        """Precompute the stop price for the held direction and whether another leg is allowed."""
+        state = self.state
+        avg = self.position.avg_entry_price()
+        stop_loss = self._level(self.cfg.order_sls_pct)
+        self._long = self.position.direction() == Side.BUY
+        state.stop_loss_price = avg * (1 - stop_loss) if self._long else avg * (1 + stop_loss)
+        state.can_add = self._can_add()
+        self._arm_trailing(self._long)
 
     def _maybe_add_leg(self, tick: PriceTick):
-        if not self.state.active:
+        if not self.state.can_add:
             return
-        if self.state.current_leg >= self.cfg.max_orders:
-            return
-        leg_index = self.state.current_leg
-        if leg_index >= len(self.cfg.order_distances_pct) or leg_index >= len(self.cfg.order_sizes):
-            return
-
-        lower, upper = self._bounds()
-        touched_zone = tick.price <= lower or tick.price >= upper
-        if not touched_zone:
+        if self._lower < tick.price < self._upper:
             return
 
+        leg_index = self.state.current_leg
         if not self.cfg.hold_previous and self.position.legs:
-            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
             self.state.realized_pnl += realized
-            self.position.legs.clear()
             self.state.current_leg = 0
 
         side = self.position.direction()
         size = self.cfg.order_sizes[leg_index]
-        self.broker.place_order(self.cfg.symbol, side, size, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(side, size, tick.price, tick.timestamp.isoformat()))
+        if not self._place(side, size, tick):
+            return
         self.state.current_leg += 1
+        self._compile()
 
     def _maybe_exit(self, tick: PriceTick) -> bool:
-        lower, upper = self._bounds()
-        if not (lower <= tick.price <= upper):
+        if not (self._lower <= tick.price <= self._upper):
             return False
         if not self.position.legs:
             return False
-
-        last_idx = max(0, self.state.current_leg - 1)
-        stop_loss = pct(self.cfg.order_sls_pct[min(last_idx, len(self.cfg.order_sls_pct) - 1)])
-        avg = self.position.avg_entry_price()
-        side = self.position.direction()
-
-        if side == Side.BUY:
-            return tick.price <= avg * (1 - stop_loss)
-        return tick.price >= avg * (1 + stop_loss)
+        if self._long:
+            return tick.price <= self.state.stop_loss_price
+        return tick.price >= self.state.stop_loss_price
+
+    def _ladder_band(self, price: float) -> QuietBand:
+        lower, upper = self._lower, self._upper
+        state = self.state
+        if not state.active:
+            return (lower, upper)
+        stop = state.stop_loss_price
+        if state.can_add:
+            # Touching either edge adds a leg; inside, only the stop acts.
+            return (max(lower, stop), upper) if self._long else (lower, min(upper, stop))
+        if self._long:
+            return band_outside(price, lower, min(upper, stop))
+        return band_outside(price, max(lower, stop), upper)
 
     def _close_cycle(self, tick: PriceTick) -> float:
-        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
         total_realized = realized + self.state.realized_pnl
         self._reset()
         self._breakout_side = None
@@ -98,8 +108,12 @@ class IZRMStrategy(Strategy):
             return None
 
         self._maybe_add_leg(tick)
+        if not self.position.legs:
+            # Without hold_previous the add closed the ladder first; its
+            # re-entry was rejected, so the cycle ends flat.
+            return self._close_cycle(tick)
 
-        if self._maybe_exit(tick):
+        if self._maybe_exit(tick) or self._trailing_hit(tick.price):
             return self._close_cycle(tick)
 
         return None
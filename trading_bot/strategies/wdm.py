@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import math
 from typing import Optional
 
 from trading_bot.core.events import PriceTick
-from trading_bot.core.models import Leg, Side
+from trading_bot.core.models import Side
 from trading_bot.core.utils import pct
-from trading_bot.strategies.base import Strategy
+from trading_bot.strategies.base import QuietBand, Strategy
 
 
 class WDMStrategy(Strategy):
@@ -22,8 +23,8 @@ class WDMStrategy(Strategy):
 
     def _enter(self, tick: PriceTick):
         size0 = self.cfg.order_sizes[0]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size0, tick):
+            return
         self.state.active = True
         self.state.current_leg = 1
         self.state.anchor_price = tick.price
@@ -31,51 +32,88 @@ class WDMStrategy(Strategy):
             self._peak = tick.price
         else:
             self._trough = tick.price
+        self._compile()
+
+    def _compile(self):
+        """Precompute the next-leg price and the stop distance off the running extreme."""
+        state = self.state
+        buy = self.cfg.initial_side == Side.BUY
+        stop_loss = self._level(self.cfg.order_sls_pct)
+        self._stop_factor = 1 - stop_loss if buy else 1 + stop_loss
+        state.stop_loss_price = (self._peak if buy else self._trough) * self._stop_factor
+        state.can_add = self._can_add()
+        if state.can_add:
+            avg = self.position.avg_entry_price()
+            distance = pct(self.cfg.order_distances_pct[state.current_leg])
+            state.next_add_price = avg * (1 + distance) if buy else avg * (1 - distance)
+        else:
+            state.next_add_price = None
+        self._arm_trailing(buy)
 
     def _maybe_add_leg(self, tick: PriceTick):
-        if not self.state.active:
-            return
-        if self.state.current_leg >= self.cfg.max_orders:
+        if not self.state.can_add:
             return
-        if self.state.current_leg >= len(self.cfg.order_distances_pct):
-            return
-        if self.state.current_leg >= len(self.cfg.order_sizes):
-            return
-
-        avg = self.position.avg_entry_price()
-        distance = pct(self.cfg.order_distances_pct[self.state.current_leg])
-        trigger_price = avg * (1 + distance) if self.cfg.initial_side == Side.BUY else avg * (1 - distance)
-        should_add = tick.price >= trigger_price if self.cfg.initial_side == Side.BUY else tick.price <= trigger_price
-        if not should_add:
+        if self.cfg.initial_side == Side.BUY:
+            if tick.price < self.state.next_add_price:
+                return
+        elif tick.price > self.state.next_add_price:
             return
 
         if not self.cfg.hold_previous and self.position.legs:
-            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
             self.state.realized_pnl += realized
-            self.position.legs.clear()
             self.state.current_leg = 0
 
         size = self.cfg.order_sizes[self.state.current_leg]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size, tick):
+            return
         self.state.current_leg += 1
+        self._compile()
 
     def _maybe_exit(self, tick: PriceTick) -> bool:
         if not self.position.legs:
             return False
 
-        sl_idx = max(0, self.state.current_leg - 1)
-        stop_loss = pct(self.cfg.order_sls_pct[min(sl_idx, len(self.cfg.order_sls_pct) - 1)])
-
+        # The stop only moves when a new extreme is printed.
         if self.cfg.initial_side == Side.BUY:
-            self._peak = max(getattr(self, "_peak", tick.price), tick.price)
-            return tick.price <= self._peak * (1 - stop_loss)
+            if tick.price > self._peak:
+                self._peak = tick.price
+                self.state.stop_loss_price = tick.price * self._stop_factor
+            return tick.price <= self.state.stop_loss_price
 
-        self._trough = min(getattr(self, "_trough", tick.price), tick.price)
-        return tick.price >= self._trough * (1 + stop_loss)
+        if tick.price < self._trough:
+            self._trough = tick.price
+            self.state.stop_loss_price = tick.price * self._stop_factor
+        return tick.price >= self.state.stop_loss_price
+
+    def _ladder_band(self, price: float) -> QuietBand:
+        state = self.state
+        buy = self.cfg.initial_side == Side.BUY
+        if not state.active:
+            trigger = self.cfg.price_trigger
+            if trigger is None:
+                return None
+            return (-math.inf, trigger) if buy else (trigger, math.inf)
+        # A new extreme moves the stop, so it bounds the band as well.
+        if buy:
+            hi = min(self._peak, state.next_add_price) if state.can_add else self._peak
+            return (state.stop_loss_price, hi)
+        lo = max(self._trough, state.next_add_price) if state.can_add else self._trough
+        return (lo, state.stop_loss_price)
+
+    def travel_band(self, price: float) -> QuietBand:
+        """``quiet_band`` without the running extreme: a new peak or trough only moves the stop behind price."""
+        state = self.state
+        if not state.active:
+            return self.quiet_band(price)
+        if self.cfg.initial_side == Side.BUY:
+            band = (state.stop_loss_price, state.next_add_price if state.can_add else math.inf)
+        else:
+            band = (state.next_add_price if state.can_add else -math.inf, state.stop_loss_price)
+        return self._trailing_band(band)
 
     def _close_cycle(self, tick: PriceTick) -> float:
-        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
         total_realized = realized + self.state.realized_pnl
         self._reset()
         return total_realized
@@ -87,8 +125,12 @@ class WDMStrategy(Strategy):
             return None
 
         self._maybe_add_leg(tick)
+        if not self.position.legs:
+            # Without hold_previous the add closed the ladder first; its
+            # re-entry was rejected, so the cycle ends flat.
+            return self._close_cycle(tick)
 
-        if self._maybe_exit(tick):
+        if self._maybe_exit(tick) or self._trailing_hit(tick.price):
             return self._close_cycle(tick)
 
         return None
@@ -4,9 +4,9 @@ from typing import Optional
 
 from trading_bot.config import ZoneConfig
 from trading_bot.core.events import PriceTick
-from trading_bot.core.models import Leg, Side
+from trading_bot.core.models import Side
 from trading_bot.core.utils import pct
-from trading_bot.strategies.base import Strategy
+from trading_bot.strategies.base import QuietBand, Strategy, band_outside
 
 
 class ZRMStrategy(Strategy):
@@ -15,6 +15,7 @@ class ZRMStrategy(Strategy):
     def __init__(self, cfg: ZoneConfig, broker):
         super().__init__(cfg, broker)
         self.cfg: ZoneConfig = cfg
+        self._lower, self._upper = self._bounds()
 
     def _bounds(self):
         width = pct(self.cfg.zone_width_pct)
@@ -24,59 +25,73 @@ class ZRMStrategy(Strategy):
     def _should_enter(self, tick: PriceTick) -> bool:
         if self.state.active:
             return False
-        lower, upper = self._bounds()
-        return lower <= tick.price <= upper
+        return self._lower <= tick.price <= self._upper
 
     def _enter(self, tick: PriceTick):
         size0 = self.cfg.order_sizes[0]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size0, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size0, tick):
+            return
         self.state.active = True
         self.state.current_leg = 1
+        self._compile()
+
+    def _compile(self):
+        """Precompute the take-profit price and whether another leg is allowed."""
+        state = self.state
+        avg = self.position.avg_entry_price()
+        take_profit = self._level(self.cfg.order_tps_pct)
+        if self.cfg.initial_side == Side.BUY:
+            state.take_profit_price = avg * (1 + take_profit)
+        else:
+            state.take_profit_price = avg * (1 - take_profit)
+        state.can_add = self._can_add()
+        self._arm_trailing(self.cfg.initial_side == Side.BUY)
 
     def _maybe_add_leg(self, tick: PriceTick):
-        if not self.state.active:
-            return
-        if self.state.current_leg >= self.cfg.max_orders:
+        if not self.state.can_add:
             return
-        lower, upper = self._bounds()
-        touched_upper = tick.price >= upper
-        touched_lower = tick.price <= lower
-        if not (touched_upper or touched_lower):
+        if self._lower < tick.price < self._upper:
             return
 
         leg_index = self.state.current_leg
-        if leg_index >= len(self.cfg.order_distances_pct) or leg_index >= len(self.cfg.order_sizes):
-            return
-
         if not self.cfg.hold_previous and self.position.legs:
-            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+            realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
             self.state.realized_pnl += realized
-            self.position.legs.clear()
             self.state.current_leg = 0
 
         size = self.cfg.order_sizes[leg_index]
-        self.broker.place_order(self.cfg.symbol, self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat())
-        self.position.legs.append(Leg(self.cfg.initial_side, size, tick.price, tick.timestamp.isoformat()))
+        if not self._place(self.cfg.initial_side, size, tick):
+            return
         self.state.current_leg += 1
+        self._compile()
 
     def _maybe_exit(self, tick: PriceTick) -> bool:
-        lower, upper = self._bounds()
-        if not (lower <= tick.price <= upper):
+        if not (self._lower <= tick.price <= self._upper):
             return False
         if not self.position.legs:
             return False
-
-        last_idx = max(0, self.state.current_leg - 1)
-        take_profit = pct(self.cfg.order_tps_pct[min(last_idx, len(self.cfg.order_tps_pct) - 1)])
-        avg = self.position.avg_entry_price()
-
         if self.cfg.initial_side == Side.BUY:
-            return tick.price >= avg * (1 + take_profit)
-        return tick.price <= avg * (1 - take_profit)
+            return tick.price >= self.state.take_profit_price
+        return tick.price <= self.state.take_profit_price
+
+    def _ladder_band(self, price: float) -> QuietBand:
+        lower, upper = self._lower, self._upper
+        state = self.state
+        if not state.active:
+            return band_outside(price, lower, upper)
+        take_profit = state.take_profit_price
+        buy = self.cfg.initial_side == Side.BUY
+        if state.can_add:
+            # Touching either edge adds a leg; inside, only the take-profit acts.
+            if not (lower < price < upper):
+                return None
+            return (lower, min(upper, take_profit)) if buy else (max(lower, take_profit), upper)
+        if buy:
+            return band_outside(price, max(lower, take_profit), upper)
+        return band_outside(price, lower, min(upper, take_profit))
 
     def _close_cycle(self, tick: PriceTick) -> float:
-        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price)
+        realized = self.broker.close_position(self.cfg.symbol, tick.timestamp.isoformat(), tick.price, self.name)
         total_realized = realized + self.state.realized_pnl
         self._reset()
         return total_realized
@@ -88,8 +103,12 @@ class ZRMStrategy(Strategy):
             return None
 
         self._maybe_add_leg(tick)
+        if not self.position.legs:
+            # Without hold_previous the add closed the ladder first; its
+            # re-entry was rejected, so the cycle ends flat.
+            return self._close_cycle(tick)
 
-        if self._maybe_exit(tick):
+        if self._maybe_exit(tick) or self._trailing_hit(tick.price):
             return self._close_cycle(tick)
 
         return None
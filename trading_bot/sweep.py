@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from enum import Enum
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, get_args, get_origin, get_type_hints
+
+import numpy as np
+
+from trading_bot.config import BotConfig
+from trading_bot.core.batch import BatchBacktester
+from trading_bot.core.events import PriceTick
+from trading_bot.core.sinks import CycleSummary, SummarySink
+from trading_bot.core.vectorized import VectorizedBacktester
+
+# Tick arrays attached from shared memory in each worker process.
+_SHM: Optional[shared_memory.SharedMemory] = None
+_PRICES: Optional[np.ndarray] = None
+_TIMESTAMPS: Optional[np.ndarray] = None
+_SYMBOL = ""
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    params: Dict[str, Any]
+    cycles: int
+    total_pnl: float
+    avg_pnl: float
+    max_drawdown: float
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> Dict[str, Any]:
+    return get_type_hints(cls)
+
+
+def _coerce(cls: type, name: str, value: Any) -> Any:
+    """``value`` converted to the enum type of field ``name``, so JSON strings work for enum fields."""
+    hint = _field_types(cls).get(name)
+    if get_origin(hint) is Union:
+        # Optional[X]: None stays None, anything else is converted to X.
+        args = [a for a in get_args(hint) if a is not type(None)]
+        hint = args[0] if len(args) == 1 else None
+    if isinstance(hint, type) and issubclass(hint, Enum) and value is not None and not isinstance(value, hint):
+        return hint(value)
+    return value
+
+
+def with_override(cfg: Any, path: str, value: Any) -> Any:
+    """Return a copy of ``cfg`` with the dotted field ``path`` set to ``value``.
+
+    Values for enum fields may be given as their plain values (e.g. ``"SELL"``).
+    """
+    head, _, rest = path.partition(".")
+    if not rest:
+        return replace(cfg, **{head: _coerce(type(cfg), head, value)})
+    child = getattr(cfg, head)
+    if child is None:
+        raise ValueError(f"Cannot override {path!r}: {head!r} is not configured.")
+    return replace(cfg, **{head: with_override(child, rest, value)})
+
+
+def expand_grid(base: BotConfig, grid: Dict[str, Sequence[Any]]) -> List[Tuple[Dict[str, Any], BotConfig]]:
+    """Cartesian product of ``grid`` applied on top of ``base``."""
+    paths = list(grid)
+    runs = []
+    for values in itertools.product(*(grid[p] for p in paths)):
+        cfg = base
+        for path, value in zip(paths, values):
+            cfg = with_override(cfg, path, value)
+        runs.append((dict(zip(paths, values)), cfg))
+    return runs
+
+
+def ticks_to_arrays(ticks: Sequence[PriceTick]) -> Tuple[np.ndarray, np.ndarray]:
+    prices = np.fromiter((t.price for t in ticks), dtype=np.float64, count=len(ticks))
+    timestamps = np.array([t.timestamp for t in ticks], dtype="datetime64[ns]")
+    return prices, timestamps
+
+
+def _attach(name: str, count: int, symbol: str):
+    global _SHM, _PRICES, _TIMESTAMPS, _SYMBOL
+    _SHM = shared_memory.SharedMemory(name=name)
+    _PRICES = np.ndarray((count,), dtype=np.float64, buffer=_SHM.buf)
+    _TIMESTAMPS = np.ndarray((count,), dtype="datetime64[ns]", buffer=_SHM.buf, offset=count * 8)
+    _SYMBOL = symbol
+
+
+def worker_ticks() -> Tuple[np.ndarray, np.ndarray, str]:
+    """The shared tick arrays inside a ``shared_tick_pool`` worker."""
+    return _PRICES, _TIMESTAMPS, _SYMBOL
+
+
+def _sweep_result(params: Dict[str, Any], summary: CycleSummary) -> SweepResult:
+    return SweepResult(
+        params=params,
+        cycles=summary.count,
+        total_pnl=summary.total_pnl,
+        avg_pnl=summary.total_pnl / summary.count if summary.count else 0.0,
+        max_drawdown=summary.max_drawdown,
+    )
+
+
+def run_arrays(
+    params: Dict[str, Any], cfg: BotConfig, starting_equity: float, prices: np.ndarray, timestamps: np.ndarray, symbol: str
+) -> SweepResult:
+    # Only the summary is reported, so cycles are never kept.
+    backtester = VectorizedBacktester(cfg, starting_equity=starting_equity, sink=SummarySink())
+    return _sweep_result(params, backtester.run(prices, timestamps, symbol).summary)
+
+
+def run_batch_arrays(
+    runs: Sequence[Tuple[Dict[str, Any], BotConfig]],
+    starting_equity: float,
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    symbol: str,
+) -> List[SweepResult]:
+    """``run_arrays`` for many configs in one pass over the ticks (see ``BatchBacktester``)."""
+    backtester = BatchBacktester([cfg for _, cfg in runs], starting_equity=starting_equity, sink_factory=SummarySink)
+    results = backtester.run(prices, timestamps, symbol)
+    return [_sweep_result(params, result.summary) for (params, _), result in zip(runs, results)]
+
+
+def _run_one(
+    params: Dict[str, Any], cfg: BotConfig, starting_equity: float, start: int = 0, end: Optional[int] = None
+) -> SweepResult:
+    return run_arrays(params, cfg, starting_equity, _PRICES[start:end], _TIMESTAMPS[start:end], _SYMBOL)
+
+
+def _run_batch(
+    runs: Sequence[Tuple[Dict[str, Any], BotConfig]], starting_equity: float, start: int = 0, end: Optional[int] = None
+) -> List[SweepResult]:
+    return run_batch_arrays(runs, starting_equity, _PRICES[start:end], _TIMESTAMPS[start:end], _SYMBOL)
+
+
+@contextmanager
+def shared_tick_pool(
+    prices: np.ndarray, timestamps: np.ndarray, symbol: str, workers: Optional[int] = None
+) -> Iterator[ProcessPoolExecutor]:
+    """Process pool whose workers see the tick arrays as this module's ``_PRICES``/``_TIMESTAMPS``.
+
+    The arrays are copied once into a shared-memory block that each worker
+    maps on start-up, so tasks only carry configs and index ranges.
+    """
+    count = len(prices)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, count * 16))
+    try:
+        np.ndarray((count,), dtype=np.float64, buffer=shm.buf)[:] = prices
+        np.ndarray((count,), dtype="datetime64[ns]", buffer=shm.buf, offset=count * 8)[:] = timestamps
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_attach,
+            initargs=(shm.name, count, symbol),
+        ) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def iter_sweep(
+    base: BotConfig,
+    grid: Dict[str, Sequence[Any]],
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    symbol: str,
+    starting_equity: float = 100_000.0,
+    workers: Optional[int] = None,
+    batch: int = 1,
+) -> Iterator[SweepResult]:
+    """Run every grid point over a process pool, yielding results as they finish.
+
+    Workers read the ticks from shared memory (``shared_tick_pool``); tasks only
+    carry the override dict and config. With ``batch > 1``, configs that
+    ``BatchBacktester`` supports are sent in groups of ``batch`` and each group
+    shares one pass over the ticks.
+    """
+    runs = expand_grid(base, grid)
+    singles = runs
+    groups: List[List[Tuple[Dict[str, Any], BotConfig]]] = []
+    if batch > 1:
+        batched = [run for run in runs if BatchBacktester.supports(run[1])]
+        singles = [run for run in runs if not BatchBacktester.supports(run[1])]
+        groups = [batched[i : i + batch] for i in range(0, len(batched), batch)]
+    with shared_tick_pool(prices, timestamps, symbol, workers) as pool:
+        futures = [pool.submit(_run_batch, group, starting_equity) for group in groups]
+        futures += [pool.submit(_run_one, params, cfg, starting_equity) for params, cfg in singles]
+        for future in as_completed(futures):
+            result = future.result()
+            if isinstance(result, list):
+                yield from result
+            else:
+                yield result
+
+
+def rank(results: Sequence[SweepResult]) -> List[SweepResult]:
+    """Best total PnL first, shallower drawdown breaking ties."""
+    return sorted(results, key=lambda r: (-r.total_pnl, r.max_drawdown))
+
+
+def format_table(results: Sequence[SweepResult]) -> str:
+    lines = [f"{'rank':>4} {'pnl':>12} {'cycles':>7} {'max_dd':>10}  params"]
+    for i, r in enumerate(results, start=1):
+        lines.append(f"{i:>4} {r.total_pnl:>12.2f} {r.cycles:>7} {r.max_drawdown:>10.2f}  {json.dumps(r.params)}")
+    return "\n".join(lines)
+
+
+def _parse_grid(items: Sequence[str]) -> Dict[str, List[Any]]:
+    grid = {}
+    for item in items:
+        path, sep, raw = item.partition("=")
+        if not sep:
+            raise ValueError(f"Grid entries look like path=[v1, v2], got {item!r}.")
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            raise ValueError(f"Grid values for {path!r} must be a JSON list.")
+        grid[path] = values
+    return grid
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from trading_bot.main import build_demo_config, make_sine_ticks
+
+    parser = argparse.ArgumentParser(description="Parameter sweep over the demo config and sine-wave ticks.")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        help='Dotted field and JSON list of candidates, e.g. cdm.order_tps_pct=[[0.003,0.003],[0.004,0.004]]',
+    )
+    parser.add_argument("--ticks", type=int, default=800)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1, help="Configs evaluated together in one pass over the ticks.")
+    args = parser.parse_args(argv)
+
+    prices, timestamps = ticks_to_arrays(make_sine_ticks("SPY", 100.0, args.ticks))
+    results = []
+    for result in iter_sweep(
+        build_demo_config(), _parse_grid(args.grid), prices, timestamps, "SPY", workers=args.workers, batch=args.batch
+    ):
+        results.append(result)
+        print(f"[{len(results)}] pnl {result.total_pnl:.2f} dd {result.max_drawdown:.2f} {json.dumps(result.params)}")
+    print(format_table(rank(results)[: args.top]))
+
+
+if __name__ == "__main__":
+    main()